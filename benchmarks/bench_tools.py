@@ -0,0 +1,303 @@
+"""
+Throughput benchmark for the server's tools against the local mock API.
+
+Starts `benchmarks/mock_api.py` in a child process, points the server at it
+with ELEVENLABS_API_BASE_URL and calls each tool through FastMCP, from a pool
+of threads, so every layer of the server (caches, governor, retries,
+metrics) is exercised without network access. For each tool it reports
+throughput, p50/p99 latency, errors and how far the peak RSS of this
+process rose above its level just before the tool started.
+
+    python benchmarks/bench_tools.py --calls 100 --concurrency 8 --save baseline.json
+    python benchmarks/bench_tools.py --compare baseline.json --tolerance 0.25
+
+With --compare it exits non-zero when a tool's throughput drops, or its p50
+latency grows, by more than the tolerance. With --cassette the upstream
+traffic is replayed from a cassette recorded earlier (see
+`elevenlabs_mcp/cassette.py`), for example from the real API:
+
+    ELEVENLABS_API_KEY=... python benchmarks/bench_tools.py --calls 5 \
+        --api-base-url https://api.elevenlabs.io --cassette real.jsonl --record
+    python benchmarks/bench_tools.py --cassette real.jsonl
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+import psutil
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from elevenlabs_mcp.governor import DEFAULT_RATES  # noqa: E402
+
+DEFAULT_TOLERANCE = 0.25
+# Client-side rate limits off: the benchmarks measure the server, not the configured throttle
+UNTHROTTLED_RATES = json.dumps(dict.fromkeys(DEFAULT_RATES, 0))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def cassette_env(path: Path, record: bool, time_scale: float) -> dict[str, str]:
+    """Server environment recording upstream traffic to, or replaying it from, a cassette."""
+    return {
+        "ELEVENLABS_MCP_CASSETTE": str(path.resolve()),
+        "ELEVENLABS_MCP_CASSETTE_MODE": "record" if record else "replay",
+        "ELEVENLABS_MCP_CASSETTE_TIME_SCALE": str(time_scale),
+    }
+
+
+def start_mock_api(port: int, mock_args: list[str]) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / "benchmarks" / "mock_api.py"), "--port", str(port), *mock_args],
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/_mock/config", timeout=1).raise_for_status()
+            return process
+        except httpx.HTTPError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("mock API did not start")
+
+
+def write_sample_audio(path: Path, seconds: float = 2.0) -> Path:
+    import numpy as np
+    import soundfile as sf
+
+    rate = 16000
+    t = np.arange(int(rate * seconds)) / rate
+    sf.write(path, 0.2 * np.sin(2 * np.pi * 220 * t), rate)
+    return path
+
+
+def scenarios(work_dir: Path) -> dict[str, dict]:
+    """Tool name -> arguments for one representative call."""
+    output = str(work_dir / "output")
+    sample = str(write_sample_audio(work_dir / "sample.wav"))
+    return {
+        "text_to_speech": {
+            "text": "The quick brown fox jumps over the lazy dog. " * 4,
+            "voice_id": "cgSgspJ2msm6clMCkdW9",
+            "output_directory": output,
+        },
+        "text_to_dialogue": {
+            "inputs": [
+                {"text": "[excited] Did you hear the news?", "voice_id": "EkK5I93UQWFDigLMpZcX"},
+                {"text": "[curious] No, what happened?", "voice_id": "RILOU7YmBhvwJGDGjNmP"},
+            ],
+            "output_directory": output,
+        },
+        "text_to_sound_effects": {"text": "Rain on a tin roof", "output_directory": output},
+        "speech_to_text": {
+            "input_file_path": sample,
+            "save_transcript_to_file": False,
+            "return_transcript_to_client_directly": True,
+        },
+        "isolate_audio": {"input_file_path": sample, "output_directory": output},
+        "get_voice": {"voice_id": "cgSgspJ2msm6clMCkdW9"},
+        "search_voices": {"search": "Mock"},
+        "list_models": {},
+        "check_subscription": {},
+        "list_agents": {},
+        "get_agent": {"agent_id": "agent_0001"},
+        "list_conversations": {"limit": 20},
+        "get_conversation": {"conversation_id": "conv_000001", "wait_for_completion": False},
+    }
+
+
+class RssSampler:
+    """
+    Peak resident set size of this process, sampled on a background thread.
+
+    `growth` is the peak above the baseline taken on entry, so one tool's
+    figure does not carry the high-water mark of the tools run before it.
+    Memory an earlier tool freed can be reused without raising RSS, so
+    growth is a lower bound on what the tool allocated.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    @property
+    def growth(self) -> int:
+        return self.peak - self.baseline
+
+    def __enter__(self) -> "RssSampler":
+        gc.collect()
+        self.baseline = self.peak = self._process.memory_info().rss
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def bench_tool(mcp, name: str, arguments: dict, calls: int, concurrency: int) -> dict:
+    """Run `calls` calls of one tool, `concurrency` at a time, after one untimed warm-up call."""
+
+    def call() -> tuple[float, str | None]:
+        started = time.perf_counter()
+        try:
+            asyncio.run(mcp.call_tool(name, arguments))
+            error = None
+        except Exception as e:
+            error = type(e).__name__
+        return time.perf_counter() - started, error
+
+    with RssSampler() as rss:
+        call()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            started = time.perf_counter()
+            results = list(pool.map(lambda _: call(), range(calls)))
+            elapsed = time.perf_counter() - started
+
+    latencies = [secs for secs, _ in results]
+    errors: dict[str, int] = {}
+    for _, error in results:
+        if error:
+            errors[error] = errors.get(error, 0) + 1
+    return {
+        "calls": calls,
+        "throughput_per_sec": round(calls / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "errors": errors,
+        "rss_growth_mb": round(rss.growth / 2**20, 1),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Regressions of `results` against `baseline` beyond `tolerance`, as messages."""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["throughput_per_sec"] < previous["throughput_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {current['throughput_per_sec']}/s vs {previous['throughput_per_sec']}/s"
+            )
+        if current["p50_ms"] > previous["p50_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {current['p50_ms']} ms vs {previous['p50_ms']} ms")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50, help="Timed calls per tool (50 default)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight at once (8 default)")
+    parser.add_argument("--tools", help="Comma-separated tools to run (all default)")
+    parser.add_argument("--save", type=Path, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON from an earlier --save")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"Allowed relative regression against --compare ({DEFAULT_TOLERANCE} default)",
+    )
+    parser.add_argument("--api-base-url", help="API to call instead of the mock, e.g. https://api.elevenlabs.io")
+    parser.add_argument("--cassette", type=Path, help="Replay upstream traffic from this cassette")
+    parser.add_argument("--record", action="store_true", help="Record upstream traffic to --cassette instead")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Cassette replay timing factor (1 default)")
+    parser.add_argument(
+        "mock_args",
+        nargs=argparse.REMAINDER,
+        help="Options after -- are passed to mock_api.py, e.g. -- --latency-ms 100",
+    )
+    args = parser.parse_args(argv)
+    if args.record and not args.cassette:
+        parser.error("--record needs --cassette")
+    mock_args = [arg for arg in args.mock_args if arg != "--"]
+
+    # Replay needs no API at all
+    mock = None
+    api_base_url = args.api_base_url
+    if not api_base_url and not (args.cassette and not args.record):
+        port = free_port()
+        mock = start_mock_api(port, mock_args)
+        api_base_url = f"http://127.0.0.1:{port}"
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            if api_base_url:
+                os.environ["ELEVENLABS_API_BASE_URL"] = api_base_url
+            if args.cassette:
+                os.environ.update(cassette_env(args.cassette, args.record, args.time_scale))
+            os.environ.setdefault("ELEVENLABS_API_KEY", "benchmark")
+            os.environ["ELEVENLABS_MCP_DATA_DIR"] = work_dir
+            os.environ.setdefault("ELEVENLABS_MCP_RATE_LIMITS", UNTHROTTLED_RATES)
+            from elevenlabs_mcp.server import mcp
+
+            # INFO lines for every upstream request would drown the table
+            logging.getLogger().setLevel(logging.WARNING)
+            logging.getLogger("httpx").setLevel(logging.WARNING)
+
+            tools = scenarios(Path(work_dir))
+            if args.tools:
+                tools = {name: tools[name] for name in args.tools.split(",")}
+            results = {}
+            print(f"{'tool':24} {'calls/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7} {'RSS +MB':>8}")
+            for name, arguments in tools.items():
+                result = bench_tool(mcp, name, arguments, args.calls, args.concurrency)
+                results[name] = result
+                print(
+                    f"{name:24} {result['throughput_per_sec']:9.1f} {result['p50_ms']:9.1f} "
+                    f"{result['p99_ms']:9.1f} {sum(result['errors'].values()):7d} {result['rss_growth_mb']:8.1f}"
+                )
+    finally:
+        if mock is not None:
+            mock.terminate()
+            mock.wait()
+
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2))
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print(f"OK: no regression beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Load generator speaking MCP over stdio to one server process.
+
+Spawns `python -m elevenlabs_mcp.server` (the `elevenlabs-mcp` entry point),
+initializes a session and replays a mix of tool calls with a given number
+of requests in flight and an optional overall rate cap. After one untimed
+call of each tool, every concurrency level runs for a fixed time, so the
+report shows where throughput stops growing; per level it gives per-tool
+latency percentiles and error rates, and the server's CPU and RSS are
+sampled throughout.
+
+The API is the local mock from `mock_api.py`, started in this process
+(options after `--` configure it), unless --api-base-url points elsewhere
+or --cassette replays recorded traffic.
+The mix is either the benchmark scenarios of `bench_tools.py` or a recorded
+JSONL file with one call per line, as {"name": ..., "arguments": ...} or as
+a captured `tools/call` JSON-RPC request.
+
+    python benchmarks/loadgen.py --concurrency 1,4,16,64 --duration 20
+    python benchmarks/loadgen.py --mix session.jsonl --rate 50 -- --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from bench_tools import UNTHROTTLED_RATES, cassette_env, percentile, scenarios
+from mock_api import MockServer, parse_args as parse_mock_args
+from startup import INITIALIZE, server_env
+
+# Throughput gain below which a higher concurrency level counts as saturated
+SATURATION_GAIN = 0.1
+
+
+def load_mix(path: Path) -> list[dict]:
+    """Tool calls from a JSONL file of {"name", "arguments"} objects or tools/call requests."""
+    calls = []
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if item.get("method") == "tools/call":
+                item = item["params"]
+            elif "method" in item:
+                continue
+            calls.append({"name": item["name"], "arguments": item.get("arguments", {})})
+    if not calls:
+        raise ValueError(f"no tool calls in {path}")
+    return calls
+
+
+class ResourceSampler:
+    """CPU and RSS of a process, sampled on a background thread."""
+
+    def __init__(self, pid: int, interval: float):
+        self.interval = interval
+        self.samples: list[tuple[float, float, int]] = []
+        self._process = psutil.Process(pid)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        started = time.monotonic()
+        self._process.cpu_percent()
+        while not self._stop.wait(self.interval):
+            try:
+                self.samples.append(
+                    (time.monotonic() - started, self._process.cpu_percent(), self._process.memory_info().rss)
+                )
+            except psutil.NoSuchProcess:
+                return
+
+    def start(self) -> "ResourceSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def between(self, start: float, end: float) -> list[tuple[float, float, int]]:
+        return [sample for sample in self.samples if start <= sample[0] <= end]
+
+
+class StdioSession:
+    """JSON-RPC client over a server process's stdin and stdout."""
+
+    def __init__(self, process: asyncio.subprocess.Process):
+        self.process = process
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while line := await self.process.stdout.readline():
+            try:
+                message = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            future = self._pending.pop(message.get("id"), None)
+            if future is not None and not future.done():
+                future.set_result(message)
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("server closed stdout"))
+
+    async def send(self, message: dict) -> None:
+        self.process.stdin.write((json.dumps(message) + "\n").encode())
+        await self.process.stdin.drain()
+
+    async def request(self, method: str, params: dict) -> dict:
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self.send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        return await future
+
+    async def initialize(self) -> None:
+        response = await self.request("initialize", INITIALIZE["params"])
+        if "result" not in response:
+            raise RuntimeError(f"initialize failed: {response}")
+        await self.send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+
+class Pacer:
+    """Spaces request starts `1 / rate` seconds apart across all workers; no limit without a rate."""
+
+    def __init__(self, rate: float | None):
+        self.interval = 1 / rate if rate else 0.0
+        self._next = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._next = max(self._next, now)
+            delay = self._next - now
+            self._next += self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def run_level(session: StdioSession, mix: list[dict], concurrency: int, duration: float, rate: float | None) -> list[dict]:
+    """Replay `mix` with `concurrency` calls in flight for `duration` seconds; one record per call."""
+    records = []
+    pacer = Pacer(rate)
+    deadline = time.monotonic() + duration
+
+    async def worker(offset: int) -> None:
+        calls = itertools.islice(itertools.cycle(mix), offset, None)
+        for call in calls:
+            await pacer.wait()
+            if time.monotonic() >= deadline:
+                return
+            started = time.monotonic()
+            response = await session.request("tools/call", call)
+            if "error" in response:
+                error = response["error"].get("message", "JSON-RPC error")
+            elif response.get("result", {}).get("isError"):
+                content = response["result"].get("content") or [{}]
+                error = content[0].get("text", "tool error")
+            else:
+                error = None
+            records.append({"tool": call["name"], "secs": time.monotonic() - started, "error": error})
+
+    # Start workers at different points of the mix so they do not all call the same tool at once
+    await asyncio.gather(*(worker(random.randrange(len(mix))) for _ in range(concurrency)))
+    return records
+
+
+def summarize(records: list[dict], elapsed: float, resources: list[tuple[float, float, int]]) -> dict:
+    by_tool: dict[str, list[dict]] = {}
+    for record in records:
+        by_tool.setdefault(record["tool"], []).append(record)
+    tools = {}
+    for tool, items in sorted(by_tool.items()):
+        latencies = [item["secs"] for item in items]
+        errors = [item["error"] for item in items if item["error"]]
+        tools[tool] = {
+            "calls": len(items),
+            "p50_ms": round(statistics.median(latencies) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+            "error_rate": round(len(errors) / len(items), 3),
+            "sample_error": errors[0][:120] if errors else None,
+        }
+    return {
+        "calls": len(records),
+        "throughput_per_sec": round(len(records) / elapsed, 1) if elapsed else 0.0,
+        "error_rate": round(sum(1 for r in records if r["error"]) / len(records), 3) if records else 0.0,
+        "avg_cpu_percent": round(statistics.mean(s[1] for s in resources), 1) if resources else None,
+        "peak_rss_mb": round(max(s[2] for s in resources) / 2**20, 1) if resources else None,
+        "tools": tools,
+    }
+
+
+def print_level(concurrency: int, summary: dict) -> None:
+    print(
+        f"\nconcurrency {concurrency}: {summary['calls']} calls, {summary['throughput_per_sec']}/s, "
+        f"errors {summary['error_rate']:.1%}, server CPU {summary['avg_cpu_percent']}%, "
+        f"peak RSS {summary['peak_rss_mb']} MB"
+    )
+    print(f"  {'tool':26} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for tool, stats in summary["tools"].items():
+        print(
+            f"  {tool:26} {stats['calls']:6d} {stats['p50_ms']:9.1f} {stats['p95_ms']:9.1f} "
+            f"{stats['p99_ms']:9.1f} {stats['error_rate']:7.1%}"
+        )
+        if stats["sample_error"]:
+            print(f"    e.g. {stats['sample_error']}")
+
+
+def saturation_level(levels: list[tuple[int, dict]]) -> int | None:
+    """First concurrency level whose throughput grew less than SATURATION_GAIN over the previous one."""
+    for (_, previous), (concurrency, current) in zip(levels, levels[1:]):
+        if current["throughput_per_sec"] < previous["throughput_per_sec"] * (1 + SATURATION_GAIN):
+            return concurrency
+    return None
+
+
+async def run(args: argparse.Namespace, api_base_url: str | None, work_dir: str) -> dict:
+    mix = load_mix(args.mix) if args.mix else [
+        {"name": name, "arguments": arguments} for name, arguments in scenarios(Path(work_dir)).items()
+    ]
+    env = server_env(work_dir)
+    if api_base_url:
+        env["ELEVENLABS_API_BASE_URL"] = api_base_url
+    if args.cassette:
+        env.update(cassette_env(args.cassette, False, args.time_scale))
+    if args.no_rate_limits:
+        env.setdefault("ELEVENLABS_MCP_RATE_LIMITS", UNTHROTTLED_RATES)
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "elevenlabs_mcp.server",
+        env=env,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=64 * 2**20,
+    )
+    sampler = ResourceSampler(process.pid, args.sample_interval).start()
+    session = StdioSession(process)
+    try:
+        await session.initialize()
+        # One untimed call per tool, so lazy imports and first-use caches are not measured
+        for call in {call["name"]: call for call in mix}.values():
+            await session.request("tools/call", call)
+        started = time.monotonic()
+        levels = []
+        for concurrency in args.concurrency:
+            level_start = time.monotonic() - started
+            records = await run_level(session, mix, concurrency, args.duration, args.rate)
+            level_end = time.monotonic() - started
+            summary = summarize(records, level_end - level_start, sampler.between(level_start, level_end))
+            levels.append((concurrency, summary))
+            print_level(concurrency, summary)
+    finally:
+        sampler.stop()
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), 5)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+    print("\nserver resources over time:")
+    print(f"  {'t (s)':>7} {'CPU %':>7} {'RSS MB':>8}")
+    step = max(1, len(sampler.samples) // 40)
+    for elapsed, cpu, rss in sampler.samples[::step]:
+        print(f"  {elapsed:7.1f} {cpu:7.1f} {rss / 2**20:8.1f}")
+
+    saturated = saturation_level(levels)
+    if saturated is not None:
+        print(f"\nthroughput stops growing at concurrency {saturated}")
+    return {
+        "levels": {str(concurrency): summary for concurrency, summary in levels},
+        "saturated_at": saturated,
+        "resources": [
+            {"t": round(elapsed, 2), "cpu_percent": cpu, "rss_mb": round(rss / 2**20, 1)}
+            for elapsed, cpu, rss in sampler.samples
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 4, 16],
+        help="Comma-separated calls in flight per level (1,4,16 default)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level (10 default)")
+    parser.add_argument("--rate", type=float, help="Cap on calls started per second, across all in flight")
+    parser.add_argument("--mix", type=Path, help="Recorded JSONL of tool calls (benchmark scenarios default)")
+    parser.add_argument("--api-base-url", help="API to point the server at instead of the built-in mock")
+    parser.add_argument("--cassette", type=Path, help="Have the server replay upstream traffic from this cassette")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Cassette replay timing factor (1 default)")
+    parser.add_argument(
+        "--keep-rate-limits",
+        dest="no_rate_limits",
+        action="store_false",
+        help="Keep the server's client-side rate limits (disabled by default to find the server's own limit)",
+    )
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="Seconds between CPU/RSS samples")
+    parser.add_argument("--save", type=Path, help="Write the report as JSON to this file")
+    parser.add_argument(
+        "mock_args",
+        nargs=argparse.REMAINDER,
+        help="Options after -- configure the mock, e.g. -- --latency-ms 200 --error-rate 0.05",
+    )
+    args = parser.parse_args(argv)
+
+    mock = None
+    if not args.api_base_url and not args.cassette:
+        _, config = parse_mock_args([arg for arg in args.mock_args if arg != "--"])
+        mock = MockServer(config).start()
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = asyncio.run(run(args, mock.url if mock else args.api_base_url, work_dir))
+    finally:
+        if mock is not None:
+            mock.stop()
+    if args.save:
+        args.save.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
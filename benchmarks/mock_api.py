@@ -0,0 +1,501 @@
+"""
+Local stand-in for the ElevenLabs API endpoints the server calls.
+
+Serves text to speech, text to dialogue, sound effects, speech to text,
+audio isolation, voices, models, the subscription and Conversational AI
+agents and conversations, with responses shaped like the real API so the
+SDK parses them. Latency, response chunking and error injection are
+configurable, on the command line or at runtime through `/_mock/config`;
+`/_mock/stats` counts requests and injected errors per route.
+
+    python benchmarks/mock_api.py --port 8765 --latency-ms 50 --error-rate 0.02
+    ELEVENLABS_API_BASE_URL=http://127.0.0.1:8765 elevenlabs-mcp
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, fields
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CREATED_AT = 1_700_000_000
+V3_VOICES = {
+    "EkK5I93UQWFDigLMpZcX": "James",
+    "RILOU7YmBhvwJGDGjNmP": "Jane",
+    "aMSt68OGf4xUZAnLpTU8": "Juniper",
+    "1SM7GgM6IMuvQlz2BwM3": "Mark",
+}
+PREMADE_VOICES = {
+    "cgSgspJ2msm6clMCkdW9": "Jessica",
+    "21m00Tcm4TlvDq8ikWAM": "Rachel",
+    "pNInz6obpgDQGcFmaJgB": "Adam",
+    "nPczCjzI2devNBz1zQrb": "Brian",
+}
+
+
+@dataclass
+class MockConfig:
+    # Time to first byte of every response: latency plus up to jitter, both in milliseconds
+    latency_ms: float = 20.0
+    jitter_ms: float = 10.0
+    # Generated audio is streamed in chunks of chunk_bytes, chunk_delay_ms apart
+    audio_bytes: int = 64 * 1024
+    chunk_bytes: int = 8 * 1024
+    chunk_delay_ms: float = 0.0
+    # Share of requests answered with a random status from error_statuses instead
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (429, 500, 503)
+    retry_after_secs: float = 0.2
+    # The next fail_next requests (to paths starting with fail_path, if set) are all answered
+    # with an error, whatever error_rate is
+    fail_next: int = 0
+    fail_path: str = ""
+    voices: int = 40
+    agents: int = 10
+    conversations: int = 200
+
+    def update(self, values: dict) -> None:
+        """Set the given fields, coerced to their current types."""
+        for item in fields(self):
+            if item.name not in values:
+                continue
+            value = values[item.name]
+            if item.name == "error_statuses":
+                value = tuple(int(status) for status in value)
+            else:
+                value = type(getattr(self, item.name))(value)
+            setattr(self, item.name, value)
+
+
+def voice(voice_id: str, name: str, category: str = "premade") -> dict:
+    return {
+        "voice_id": voice_id,
+        "name": name,
+        "category": category,
+        "labels": {"accent": "american", "gender": "female" if name in ("Jane", "Juniper", "Jessica", "Rachel") else "male"},
+        "description": f"Mock voice {name}",
+        "preview_url": None,
+        "fine_tuning": {"is_allowed_to_fine_tune": category == "cloned", "state": {}},
+        "high_quality_base_model_ids": ["eleven_v3"] if voice_id in V3_VOICES else ["eleven_multilingual_v2"],
+        "created_at_unix": CREATED_AT,
+    }
+
+
+def build_voices(count: int) -> list[dict]:
+    voices = [voice(voice_id, name) for voice_id, name in {**V3_VOICES, **PREMADE_VOICES}.items()]
+    voices += [voice(f"mockvoice{index:04d}", f"Mock Voice {index}", "cloned") for index in range(count)]
+    return voices
+
+
+def agent(index: int) -> dict:
+    return {
+        "agent_id": f"agent_{index:04d}",
+        "name": f"Mock Agent {index}",
+        "voice_id": "cgSgspJ2msm6clMCkdW9",
+        "tags": [],
+        "created_at_unix_secs": CREATED_AT + index,
+        "access_info": {"is_creator": True, "creator_name": "mock", "creator_email": "mock@example.com", "role": "admin"},
+    }
+
+
+def agent_summary(stored: dict) -> dict:
+    return {
+        "agent_id": stored["agent_id"],
+        "name": stored["name"],
+        "tags": [],
+        "created_at_unix_secs": stored["metadata"]["created_at_unix_secs"],
+        "access_info": {"is_creator": True, "creator_name": "mock", "creator_email": "mock@example.com", "role": "admin"},
+    }
+
+
+def merge(target: dict, changes: dict) -> dict:
+    """Apply a PATCH body: nested objects are merged, everything else replaced."""
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge(target[key], value)
+        else:
+            target[key] = value
+    return target
+
+
+def normalize_agent(stored: dict) -> dict:
+    """Fill unset fields the way the API reports them, so clients must not compare naively."""
+    config = stored.setdefault("conversation_config", {})
+    agent_config = config.setdefault("agent", {})
+    agent_config.setdefault("first_message", "")
+    agent_config.setdefault("prompt", {}).setdefault("max_tokens", -1)
+    config.setdefault("tts", {}).setdefault("voice_id", "cgSgspJ2msm6clMCkdW9")
+    stored.setdefault("platform_settings", {})
+    return stored
+
+
+def conversation(index: int, detail: bool = False) -> dict:
+    summary = {
+        "agent_id": f"agent_{index % 10:04d}",
+        "agent_name": f"Mock Agent {index % 10}",
+        "conversation_id": f"conv_{index:06d}",
+        "start_time_unix_secs": CREATED_AT + index * 60,
+        "call_duration_secs": 30 + index % 90,
+        "message_count": 6,
+        "status": "done",
+        "call_successful": "success",
+    }
+    if not detail:
+        return summary
+    roles = ("agent", "user")
+    return {
+        **summary,
+        "transcript": [
+            {"role": roles[turn % 2], "message": f"Mock turn {turn} of conversation {index}.", "time_in_call_secs": turn * 5}
+            for turn in range(6)
+        ],
+        "metadata": {
+            "start_time_unix_secs": summary["start_time_unix_secs"],
+            "call_duration_secs": summary["call_duration_secs"],
+            "termination_reason": "Client disconnected" if index % 4 == 0 else "end_call tool was called.",
+        },
+        "analysis": {"call_successful": "success", "transcript_summary": "A mock conversation."},
+    }
+
+
+def subscription() -> dict:
+    return {
+        "tier": "creator",
+        "character_count": 1000,
+        "character_limit": 100_000,
+        "max_credit_limit_extension": 0,
+        "can_extend_character_limit": False,
+        "allowed_to_extend_character_limit": False,
+        "voice_slots_used": 0,
+        "professional_voice_slots_used": 0,
+        "professional_voice_slots_used_in_workspace": 0,
+        "voice_limit": 30,
+        "voice_add_edit_counter": 0,
+        "professional_voice_limit": 1,
+        "can_extend_voice_limit": False,
+        "can_use_instant_voice_cloning": True,
+        "can_use_professional_voice_cloning": True,
+        "current_overage": {"amount": "0.00", "currency": "usd"},
+        "status": "active",
+        "open_invoices": [],
+        "has_open_invoices": False,
+    }
+
+
+def create_app(config: MockConfig | None = None) -> FastAPI:
+    config = config or MockConfig()
+    app = FastAPI(title="Mock ElevenLabs API")
+    app.state.config = config
+    stats: Counter = Counter()
+    voices = build_voices(config.voices)
+    # Agents created or changed through the API; the generated ones are listed after them
+    agents: dict[str, dict] = {}
+
+    @app.middleware("http")
+    async def simulate(request: Request, call_next):
+        if request.url.path.startswith("/_mock"):
+            return await call_next(request)
+        route = f"{request.method} {request.url.path}"
+        stats[route] += 1
+        await asyncio.sleep((config.latency_ms + random.uniform(0, config.jitter_ms)) / 1000)
+        failing = config.fail_next > 0 and request.url.path.startswith(config.fail_path)
+        if failing:
+            config.fail_next -= 1
+        if failing or (config.error_rate and random.random() < config.error_rate):
+            status = random.choice(config.error_statuses)
+            stats[f"injected {status}"] += 1
+            headers = {"retry-after": str(config.retry_after_secs)} if status in (429, 503) else {}
+            return JSONResponse({"detail": {"status": "mock_error", "message": f"Injected {status}"}}, status, headers)
+        return await call_next(request)
+
+    async def audio_chunks():
+        remaining = config.audio_bytes
+        header = b"ID3\x04\x00\x00\x00\x00\x00\x00"
+        while remaining > 0:
+            size = min(config.chunk_bytes, remaining)
+            yield (header + bytes(size))[:size]
+            header = b""
+            remaining -= size
+            if remaining and config.chunk_delay_ms:
+                await asyncio.sleep(config.chunk_delay_ms / 1000)
+
+    def audio(characters: int = 0) -> StreamingResponse:
+        return StreamingResponse(
+            audio_chunks(), media_type="audio/mpeg", headers={"character-cost": str(characters)}
+        )
+
+    async def json_body(request: Request) -> dict:
+        try:
+            return json.loads(await request.body() or b"{}")
+        except json.JSONDecodeError:
+            return {}
+
+    @app.get("/_mock/config")
+    async def get_config():
+        return asdict(config)
+
+    @app.post("/_mock/config")
+    async def set_config(request: Request):
+        config.update(await json_body(request))
+        return asdict(config)
+
+    @app.get("/_mock/stats")
+    async def get_stats():
+        return dict(stats)
+
+    @app.post("/_mock/reset")
+    async def reset_stats():
+        stats.clear()
+        return {}
+
+    @app.post("/v1/text-to-speech/{voice_id}")
+    @app.post("/v1/text-to-speech/{voice_id}/stream")
+    async def text_to_speech(voice_id: str, request: Request):
+        body = await json_body(request)
+        return audio(len(body.get("text", "")))
+
+    @app.post("/v1/text-to-dialogue")
+    @app.post("/v1/text-to-dialogue/stream")
+    async def text_to_dialogue(request: Request):
+        body = await json_body(request)
+        return audio(sum(len(item.get("text", "")) for item in body.get("inputs", [])))
+
+    @app.post("/v1/sound-generation")
+    async def sound_generation(request: Request):
+        body = await json_body(request)
+        return audio(len(body.get("text", "")))
+
+    @app.post("/v1/audio-isolation")
+    @app.post("/v1/audio-isolation/stream")
+    async def audio_isolation(request: Request):
+        await request.body()
+        return audio()
+
+    @app.post("/v1/speech-to-text")
+    async def speech_to_text(request: Request):
+        # Multipart is not parsed: only the upload size matters here
+        size = len(await request.body())
+        text = "This is a mock transcription of the uploaded audio."
+        words = []
+        for index, word in enumerate(text.split()):
+            words.append({"text": word, "type": "word", "start": index * 0.4, "end": index * 0.4 + 0.3, "logprob": -0.1})
+            words.append({"text": " ", "type": "spacing", "start": index * 0.4 + 0.3, "end": index * 0.4 + 0.4, "logprob": 0.0})
+        return {
+            "language_code": "eng",
+            "language_probability": 0.99,
+            "text": text,
+            "words": words[:-1],
+            "additional_formats": None,
+            "transcription_id": f"mock_{size}",
+        }
+
+    @app.post("/v1/enhance-dialogue")
+    async def enhance_dialogue(request: Request):
+        body = await json_body(request)
+        return {"enhanced_dialogue": [f"[happy] {block}" for block in body.get("dialogue_blocks", [])]}
+
+    @app.get("/v1/voices")
+    async def list_voices():
+        return {"voices": voices}
+
+    @app.get("/v2/voices")
+    async def search_voices(search: str | None = None, page_size: int = 10, next_page_token: str | None = None):
+        matches = [v for v in voices if not search or search.lower() in v["name"].lower()]
+        start = int(next_page_token or 0)
+        page = matches[start:start + page_size]
+        has_more = start + page_size < len(matches)
+        return {
+            "voices": page,
+            "has_more": has_more,
+            "total_count": len(matches),
+            "next_page_token": str(start + page_size) if has_more else None,
+        }
+
+    @app.get("/v1/voices/{voice_id}")
+    async def get_voice(voice_id: str):
+        found = next((v for v in voices if v["voice_id"] == voice_id), None)
+        if found is None:
+            return JSONResponse({"detail": {"status": "voice_not_found"}}, 404)
+        return found
+
+    @app.get("/v1/models")
+    async def list_models():
+        return [
+            {"model_id": "eleven_multilingual_v2", "name": "Eleven Multilingual v2", "languages": [{"language_id": "en", "name": "English"}]},
+            {"model_id": "eleven_flash_v2_5", "name": "Eleven Flash v2.5", "languages": [{"language_id": "en", "name": "English"}]},
+            {"model_id": "eleven_v3", "name": "Eleven v3", "languages": [{"language_id": "en", "name": "English"}]},
+        ]
+
+    @app.get("/v1/user/subscription")
+    async def get_subscription():
+        return subscription()
+
+    @app.get("/v1/convai/agents")
+    async def list_agents():
+        listed = [agent_summary(stored) for stored in agents.values()]
+        listed += [agent(index) for index in range(config.agents) if f"agent_{index:04d}" not in agents]
+        return {"agents": listed, "has_more": False, "next_cursor": None}
+
+    @app.get("/v1/convai/agents/{agent_id}")
+    async def get_agent(agent_id: str):
+        if agent_id in agents:
+            return agents[agent_id]
+        return {
+            "agent_id": agent_id,
+            "name": f"Mock Agent {agent_id}",
+            "conversation_config": {"tts": {"voice_id": "cgSgspJ2msm6clMCkdW9"}},
+            "metadata": {"created_at_unix_secs": CREATED_AT, "updated_at_unix_secs": CREATED_AT},
+        }
+
+    @app.post("/v1/convai/agents/create")
+    async def create_agent(request: Request):
+        body = await json_body(request)
+        agent_id = f"agent_{random.randrange(10**8):08d}"
+        now = int(time.time())
+        agents[agent_id] = normalize_agent(
+            {
+                "agent_id": agent_id,
+                "name": body.get("name") or "",
+                "conversation_config": body.get("conversation_config") or {},
+                "platform_settings": body.get("platform_settings") or {},
+                "metadata": {"created_at_unix_secs": now, "updated_at_unix_secs": now},
+            }
+        )
+        return {"agent_id": agent_id}
+
+    @app.patch("/v1/convai/agents/{agent_id}")
+    async def update_agent(agent_id: str, request: Request):
+        if agent_id not in agents:
+            return JSONResponse({"detail": {"status": "agent_not_found"}}, 404)
+        body = await json_body(request)
+        stored = merge(agents[agent_id], {key: body[key] for key in ("name", "conversation_config", "platform_settings") if key in body})
+        stored["metadata"]["updated_at_unix_secs"] = int(time.time())
+        stats["agent updates"] += 1
+        return normalize_agent(stored)
+
+    @app.post("/v1/convai/twilio/outbound-call")
+    async def outbound_call(request: Request):
+        await request.body()
+        stats["calls placed"] += 1
+        # Tracked as one of the listed conversations, all of which are done
+        index = (stats["calls placed"] - 1) % max(1, config.conversations)
+        return {"success": True, "message": "Call initiated", "conversation_id": f"conv_{index:06d}", "callSid": f"CA{index:032d}"}
+
+    @app.get("/v1/convai/conversations")
+    async def list_conversations(
+        page_size: int = 30,
+        limit: int | None = None,
+        offset: int = 0,
+        cursor: str | None = None,
+        agent_id: str | None = None,
+        call_start_after_unix: int | None = None,
+        call_start_before_unix: int | None = None,
+    ):
+        # Newest first, like the API
+        matches = [conversation(index) for index in reversed(range(config.conversations))]
+        if agent_id:
+            matches = [item for item in matches if item["agent_id"] == agent_id]
+        if call_start_after_unix is not None:
+            matches = [item for item in matches if item["start_time_unix_secs"] >= call_start_after_unix]
+        if call_start_before_unix is not None:
+            matches = [item for item in matches if item["start_time_unix_secs"] < call_start_before_unix]
+        size = limit or page_size
+        start = int(cursor) if cursor else offset
+        page = matches[start:start + size]
+        has_more = start + size < len(matches)
+        return {
+            "conversations": page,
+            "has_more": has_more,
+            "next_cursor": str(start + size) if has_more else None,
+            "total": len(matches),
+        }
+
+    @app.get("/v1/convai/conversations/{conversation_id}")
+    async def get_conversation(conversation_id: str):
+        try:
+            index = int(conversation_id.removeprefix("conv_"))
+        except ValueError:
+            index = -1
+        if not 0 <= index < config.conversations:
+            return JSONResponse({"detail": {"status": "conversation_not_found"}}, 404)
+        return conversation(index, detail=True)
+
+    return app
+
+
+class MockServer:
+    """Mock API served by uvicorn on a background thread, for use from a benchmark."""
+
+    def __init__(self, config: MockConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = create_app(config)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, timeout: float = 10.0) -> "MockServer":
+        self._thread.start()
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("mock API did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def parse_args(argv: list[str] | None = None) -> tuple[argparse.Namespace, MockConfig]:
+    defaults = MockConfig()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms, help="Random extra latency, up to this")
+    parser.add_argument("--audio-bytes", type=int, default=defaults.audio_bytes, help="Size of generated audio")
+    parser.add_argument("--chunk-bytes", type=int, default=defaults.chunk_bytes, help="Audio streaming chunk size")
+    parser.add_argument("--chunk-delay-ms", type=float, default=defaults.chunk_delay_ms, help="Delay between audio chunks")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of requests that fail (0-1)")
+    parser.add_argument(
+        "--error-statuses",
+        default=",".join(map(str, defaults.error_statuses)),
+        help="Comma-separated statuses injected errors are drawn from",
+    )
+    args = parser.parse_args(argv)
+    config = MockConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        audio_bytes=args.audio_bytes,
+        chunk_bytes=args.chunk_bytes,
+        chunk_delay_ms=args.chunk_delay_ms,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(",") if status),
+    )
+    return args, config
+
+
+def main(argv: list[str] | None = None) -> None:
+    args, config = parse_args(argv)
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Cold-start benchmark for the stdio server.
+
+Every MCP client session spawns a fresh server process, so the time until it
+answers `initialize` is paid by users on each session. This script reports:
+
+- the slowest imports when loading `elevenlabs_mcp.server`, from
+  `python -X importtime`
+- the time from process spawn to the `initialize` response, over several runs
+
+It exits non-zero when the median time-to-initialize exceeds the target.
+
+    python benchmarks/startup.py --runs 10 --target 1.0
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Median seconds from spawn to initialize response
+TARGET_INITIALIZE_SECS = 1.0
+INITIALIZE = {
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "startup-benchmark", "version": "1.0"},
+    },
+}
+
+
+def server_env(data_dir: str) -> dict[str, str]:
+    env = dict(os.environ)
+    # A placeholder key is enough: nothing is sent to the API before the first tool call
+    env.setdefault("ELEVENLABS_API_KEY", "benchmark")
+    env["ELEVENLABS_MCP_DATA_DIR"] = data_dir
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def import_times(env: dict[str, str], top: int) -> tuple[float, list[tuple[str, float, float]]]:
+    """Total import time of the server module and its `top` slowest imports as (module, self ms, cumulative ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import elevenlabs_mcp.server"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, len(name) - len(name.lstrip())))
+    # importtime lists children before their parent: the server's own imports are the
+    # rows one level deeper between the previous top-level import and the server row
+    end = next(i for i, row in enumerate(rows) if row[0] == "elevenlabs_mcp.server")
+    start = max((i for i, row in enumerate(rows[:end]) if row[3] == 1), default=-1) + 1
+    total = rows[end][2]
+    direct = [row for row in rows[start:end] if row[3] == 3]
+    direct.sort(key=lambda row: row[2], reverse=True)
+    return total, [(name, own, cumulative) for name, own, cumulative, _ in direct[:top]]
+
+
+def time_to_initialize(env: dict[str, str], timeout: float = 30.0) -> float:
+    """Seconds from spawning the server to reading its initialize response."""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "elevenlabs_mcp.server"],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    try:
+        process.stdin.write(json.dumps(INITIALIZE) + "\n")
+        process.stdin.flush()
+        line = process.stdout.readline()
+        elapsed = time.perf_counter() - started
+        if not line:
+            raise RuntimeError("server exited without answering initialize")
+        response = json.loads(line)
+        if "result" not in response:
+            raise RuntimeError(f"unexpected initialize response: {line.strip()}")
+        return elapsed
+    finally:
+        watchdog.cancel()
+        process.kill()
+        process.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Server spawns to time (5 default)")
+    parser.add_argument(
+        "--target",
+        type=float,
+        default=TARGET_INITIALIZE_SECS,
+        help=f"Median time-to-initialize budget in seconds ({TARGET_INITIALIZE_SECS} default)",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list (15 default)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = server_env(data_dir)
+        total, slowest = import_times(env, args.top)
+        print(f"import elevenlabs_mcp.server: {total:.0f} ms")
+        for name, own, cumulative in slowest:
+            print(f"  {cumulative:8.1f} ms  (self {own:6.1f})  {name}")
+
+        # The first spawn warms the bytecode and OS file caches and is not counted
+        time_to_initialize(env)
+        times = [time_to_initialize(env) for _ in range(args.runs)]
+
+    median = statistics.median(times)
+    print(
+        f"time to initialize response over {len(times)} runs: "
+        f"median {median * 1000:.0f} ms, min {min(times) * 1000:.0f} ms, max {max(times) * 1000:.0f} ms"
+    )
+    if median > args.target:
+        print(f"FAIL: median exceeds the {args.target * 1000:.0f} ms target")
+        return 1
+    print(f"OK: within the {args.target * 1000:.0f} ms target")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
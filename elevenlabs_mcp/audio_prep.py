@@ -0,0 +1,192 @@
+"""
+Sample preparation for instant voice cloning.
+
+Each file is decoded with soundfile, downmixed to mono and analysed in short
+frames with NumPy: leading and trailing silence is trimmed, clipped frames and
+long pauses are cut, and the remaining speech is normalized to a common
+loudness. Across all files the total is capped at the amount of audio instant
+cloning makes use of. Files are processed in parallel; any file soundfile
+cannot read is passed through unchanged.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+from elevenlabs_mcp.concurrency import map_concurrent
+
+FRAME_SECS = 0.05
+SILENCE_DBFS = -45.0
+TARGET_RMS_DBFS = -20.0
+PEAK_CEILING_DBFS = -1.0
+CLIP_LEVEL = 0.999
+# Share of clipped samples above which a frame is dropped
+CLIPPED_FRAME_RATIO = 0.01
+# Pauses longer than this are shortened to it
+MAX_PAUSE_SECS = 0.5
+# Instant cloning gains nothing from more than a few minutes of audio
+MAX_TOTAL_SECS = 180.0
+MIN_CLIP_SECS = 1.0
+LOSSY_EXTENSIONS = {".mp3", ".ogg", ".opus"}
+
+
+@dataclass
+class PreparedSample:
+    source: Path
+    path: Path
+    original_bytes: int
+    original_secs: float | None
+    prepared_bytes: int
+    prepared_secs: float | None
+    note: str | None = None
+
+
+def db_to_amplitude(db: float) -> float:
+    return 10 ** (db / 20)
+
+
+def clean_signal(signal: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Trim, drop clipped frames and long pauses, and normalize a mono float signal."""
+    frame = max(1, int(sample_rate * FRAME_SECS))
+    frame_count = signal.size // frame
+    if frame_count == 0:
+        return signal
+    frames = signal[: frame_count * frame].reshape(frame_count, frame)
+    rms = np.sqrt(np.mean(frames**2, axis=1))
+    silent = rms < db_to_amplitude(SILENCE_DBFS)
+    clipped = np.mean(np.abs(frames) >= CLIP_LEVEL, axis=1) > CLIPPED_FRAME_RATIO
+
+    keep = ~clipped
+    voiced = np.flatnonzero(~silent & ~clipped)
+    if voiced.size == 0:
+        return np.zeros(0, dtype=signal.dtype)
+    keep[: voiced[0]] = False
+    keep[voiced[-1] + 1 :] = False
+
+    # Within each run of silent frames, keep only the first MAX_PAUSE_SECS
+    max_pause_frames = int(MAX_PAUSE_SECS / FRAME_SECS)
+    run_start = np.flatnonzero(np.diff(np.concatenate(([False], silent))) == 1)
+    run_end = np.flatnonzero(np.diff(np.concatenate((silent, [False]))) == -1) + 1
+    for start, end in zip(run_start, run_end):
+        if end - start > max_pause_frames:
+            keep[start + max_pause_frames : end] = False
+
+    kept = frames[keep]
+    speech_rms = np.sqrt(np.mean(kept[~silent[keep]] ** 2))
+    peak = np.max(np.abs(kept))
+    gain = min(
+        db_to_amplitude(TARGET_RMS_DBFS) / max(speech_rms, 1e-9),
+        db_to_amplitude(PEAK_CEILING_DBFS) / max(peak, 1e-9),
+    )
+    return (kept.reshape(-1) * gain).astype(np.float32)
+
+
+def clean_file(source: Path, max_secs: float) -> tuple[PreparedSample, np.ndarray | None, int]:
+    """Decode and clean one file. Returns (sample info, signal or None if unreadable, sample rate)."""
+    size = os.path.getsize(source)
+    try:
+        signal, sample_rate = sf.read(str(source), dtype="float32", always_2d=True)
+    except (RuntimeError, sf.LibsndfileError) as e:
+        return PreparedSample(source, source, size, None, size, None, f"unprocessed: {e}"), None, 0
+    sample = PreparedSample(source, source, size, signal.shape[0] / sample_rate, size, None)
+    # No single file is ever kept beyond the overall cap
+    cleaned = clean_signal(signal.mean(axis=1), sample_rate)[: int(max_secs * sample_rate)]
+    return sample, cleaned, sample_rate
+
+
+def write_signal(signal: np.ndarray, sample_rate: int, source: Path, output_stem: Path) -> Path:
+    """Write as MP3 if the source was lossy (keeps uploads small), otherwise FLAC."""
+    if source.suffix.lower() in LOSSY_EXTENSIONS:
+        path = output_stem.with_suffix(".mp3")
+        try:
+            sf.write(str(path), signal, sample_rate, format="MP3", subtype="MPEG_LAYER_III")
+            return path
+        except (RuntimeError, sf.LibsndfileError):
+            # Older libsndfile builds cannot encode MP3
+            pass
+    path = output_stem.with_suffix(".flac")
+    sf.write(str(path), signal, sample_rate, format="FLAC", subtype="PCM_16")
+    return path
+
+
+def prepare_samples(
+    files: list[Path],
+    output_dir: Path,
+    max_total_secs: float = MAX_TOTAL_SECS,
+    max_workers: int = 4,
+) -> tuple[list[PreparedSample], dict]:
+    """
+    Prepare clone samples into `output_dir`.
+
+    Returns (samples to upload, in input order, and a summary of the seconds
+    and bytes saved). Files whose audio is entirely silence or clipping, or
+    that fall beyond the duration cap, are left out.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    cleaned: dict[int, tuple] = {}
+    for position, result, error in map_concurrent(
+        lambda position: clean_file(files[position], max_total_secs),
+        range(len(files)),
+        max_workers=max_workers,
+    ):
+        if error is not None:
+            size = os.path.getsize(files[position])
+            note = f"unprocessed: {error}"
+            result = (PreparedSample(files[position], files[position], size, None, size, None, note), None, 0)
+        cleaned[position] = result
+
+    # Spend the duration budget in input order, then encode the survivors in parallel
+    samples = []
+    to_write = []
+    dropped = []
+    dropped_secs = 0.0
+    remaining = max_total_secs
+    for position in range(len(files)):
+        sample, signal, sample_rate = cleaned[position]
+        if signal is None:
+            samples.append(sample)
+            continue
+        signal = signal[: int(max(remaining, 0) * sample_rate)]
+        if signal.size < MIN_CLIP_SECS * sample_rate:
+            dropped.append(str(sample.source))
+            dropped_secs += sample.original_secs
+            continue
+        remaining -= signal.size / sample_rate
+        sample.prepared_secs = signal.size / sample_rate
+        samples.append(sample)
+        # Prefixed with the position so same-named inputs never collide
+        to_write.append((sample, signal, sample_rate, output_dir / f"{position:03d}_{sample.source.stem}"))
+    cleaned.clear()
+
+    for (sample, *_), path, error in map_concurrent(
+        lambda item: write_signal(item[1], item[2], item[0].source, item[3]),
+        to_write,
+        max_workers=max_workers,
+    ):
+        if error is not None:
+            sample.prepared_secs = sample.original_secs
+            sample.note = f"unprocessed: {error}"
+            continue
+        sample.path = path
+        sample.prepared_bytes = os.path.getsize(path)
+
+    original_bytes = sum(os.path.getsize(path) for path in files)
+    prepared_bytes = sum(sample.prepared_bytes for sample in samples)
+    original_secs = sum(sample.original_secs or 0 for sample in samples) + dropped_secs
+    prepared_secs = sum(sample.prepared_secs or 0 for sample in samples)
+    summary = {
+        "files_in": len(files),
+        "files_uploaded": len(samples),
+        "files_dropped": dropped,
+        "unprocessed": [str(s.source) for s in samples if s.note],
+        "original_secs": round(original_secs, 1),
+        "prepared_secs": round(prepared_secs, 1),
+        "secs_saved": round(original_secs - prepared_secs, 1),
+        "original_bytes": original_bytes,
+        "prepared_bytes": prepared_bytes,
+        "bytes_saved": original_bytes - prepared_bytes,
+    }
+    return samples, summary
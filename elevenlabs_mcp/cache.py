@@ -0,0 +1,262 @@
+"""
+TTL cache for slowly changing API reads (models, agents, phone numbers,
+subscription).
+
+Each endpoint has its own TTL. Within the TTL the cached value is returned
+as is; for a while after it, the stale value is still returned while a
+background refresh fetches a new one (stale-while-revalidate). Tools that
+change state invalidate the affected endpoints explicitly. Values must be
+JSON-compatible so any backend can store them; the default backend keeps
+them in memory, the SQLite backend shares them between the worker processes
+of one HTTP server (ELEVENLABS_MCP_CACHE_BACKEND=sqlite).
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from elevenlabs_mcp.metrics import record
+from elevenlabs_mcp.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTLS = {
+    "models": 3600.0,
+    "agents": 60.0,
+    "agent": 60.0,
+    "phone_numbers": 300.0,
+    "subscription": 60.0,
+}
+STALE_WHILE_REVALIDATE_SECS = 600.0
+MAX_MEMORY_ENTRIES = 1024
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> tuple[Any, float] | None: ...
+
+    def set(self, key: str, value: Any, stored_at: float) -> None: ...
+
+    def delete(self, key: str) -> None: ...
+
+    def delete_prefix(self, prefix: str) -> None: ...
+
+    def prune(self, stored_before: float) -> None: ...
+
+
+class MemoryBackend:
+    """In-process LRU backend."""
+
+    def __init__(self, max_entries: int = MAX_MEMORY_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: Any, stored_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, stored_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def prune(self, stored_before: float) -> None:
+        with self._lock:
+            for key in [key for key, (_, stored_at) in self._entries.items() if stored_at < stored_before]:
+                del self._entries[key]
+
+
+class SQLiteBackend:
+    """Backend in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> tuple[Any, float] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        # substr() rather than LIKE, which would treat _ and % in keys as wildcards
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def prune(self, stored_before: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cache WHERE stored_at < ?", (stored_before,))
+
+
+def backend_from_env(path: Path) -> CacheBackend:
+    """The backend chosen by ELEVENLABS_MCP_CACHE_BACKEND: `memory` (default) or `sqlite` at `path`."""
+    name = os.environ.get("ELEVENLABS_MCP_CACHE_BACKEND", "memory").strip().lower()
+    if name == "sqlite":
+        return SQLiteBackend(path)
+    if name != "memory":
+        logger.warning("Ignoring unknown ELEVENLABS_MCP_CACHE_BACKEND: %s", name)
+    return MemoryBackend()
+
+
+@dataclass
+class CacheResult:
+    value: Any
+    # None when the value was just fetched
+    age_secs: float | None = None
+    stale: bool = False
+
+    @property
+    def cached(self) -> bool:
+        return self.age_secs is not None
+
+    def note(self) -> str:
+        """Suffix marking cached text responses; empty for fresh ones."""
+        if not self.cached:
+            return ""
+        refreshing = ", refreshing in background" if self.stale else ""
+        return f"\n\n(Cached response, {int(self.age_secs)}s old{refreshing})"
+
+    def info(self) -> dict:
+        return {"cached": self.cached, "age_secs": int(self.age_secs or 0), "stale": self.stale}
+
+
+def load_ttls() -> dict[str, float]:
+    """DEFAULT_TTLS overridden by ELEVENLABS_MCP_CACHE_TTLS, a JSON object of endpoint -> seconds."""
+    ttls = dict(DEFAULT_TTLS)
+    overrides = os.environ.get("ELEVENLABS_MCP_CACHE_TTLS")
+    if overrides:
+        try:
+            ttls.update({key: float(value) for key, value in json.loads(overrides).items()})
+        except (ValueError, TypeError, AttributeError):
+            logger.warning("Ignoring invalid ELEVENLABS_MCP_CACHE_TTLS: %s", overrides)
+    return ttls
+
+
+class TTLCache:
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        ttls: dict[str, float] | None = None,
+        stale_secs: float = STALE_WHILE_REVALIDATE_SECS,
+        singleflight: SingleFlight | None = None,
+        namespace: str = "",
+    ):
+        self.backend = backend or MemoryBackend()
+        # Prefixed to every key, so caches of different API keys can share a backend
+        self.namespace = namespace
+        # Concurrent misses for the same key share one upstream call
+        self.singleflight = singleflight or SingleFlight()
+        self.ttls = ttls if ttls is not None else load_ttls()
+        self.stale_secs = stale_secs
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0}
+        self._refreshing: set[str] = set()
+        # Bumped by invalidate() so fetches that started before it never store their result
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def key(self, endpoint: str, *parts) -> str:
+        return f"{self.namespace}{endpoint}:" + ":".join(map(str, parts))
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+        record("cache_misses" if stat == "misses" else "cache_hits")
+
+    def _store(self, key: str, value: Any, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+        self.backend.set(key, value, time.time())
+
+    def _refresh(self, key: str, loader: Callable[[], Any], generation: int) -> None:
+        try:
+            self._store(key, self.singleflight.do(key, loader), generation)
+        except Exception as e:
+            logger.warning("Background cache refresh of %s failed: %s", key, e)
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def fetch(self, endpoint: str, loader: Callable[[], Any], *parts) -> CacheResult:
+        """Cached value for `endpoint` (and `parts`, e.g. an ID), calling `loader` when needed."""
+        ttl = self.ttls.get(endpoint, 0.0)
+        key = self.key(endpoint, *parts)
+        generation = self._generation
+        if ttl > 0:
+            entry = self.backend.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = max(0.0, time.time() - stored_at)
+                if age < ttl:
+                    self._count("hits")
+                    return CacheResult(value, age)
+                if age < ttl + self.stale_secs:
+                    self._count("stale_hits")
+                    with self._lock:
+                        start = key not in self._refreshing
+                        self._refreshing.add(key)
+                    if start:
+                        # In the caller's context, so the loader talks to the API as the caller did
+                        threading.Thread(
+                            target=contextvars.copy_context().run,
+                            args=(self._refresh, key, loader, generation),
+                            daemon=True,
+                        ).start()
+                    return CacheResult(value, age, stale=True)
+
+        self._count("misses")
+        value = self.singleflight.do(key, loader)
+        if ttl > 0:
+            self._store(key, value, generation)
+        return CacheResult(value)
+
+    def invalidate(self, endpoint: str, *parts) -> None:
+        """Drop cached entries for `endpoint`, or only the one for `parts` if given."""
+        with self._lock:
+            self._generation += 1
+        if parts:
+            self.backend.delete(self.key(endpoint, *parts))
+        else:
+            self.backend.delete_prefix(f"{self.namespace}{endpoint}:")
@@ -0,0 +1,267 @@
+"""
+Outbound call campaigns.
+
+A campaign dials a list of numbers through one agent, keeping at most a fixed
+number of calls live at once (never more than the agent's own
+`call_limits.agent_concurrency_limit`) and starting at most a fixed number of
+calls per second. A call holds its slot until its conversation reaches a
+terminal status, which is tracked by polling the in-flight conversations
+concurrently.
+
+Every state change is appended to a JSONL journal. Running the campaign
+again with the same journal skips finished calls, resumes polling the ones
+still in progress and redials failed dials, so long campaigns can span many
+runs. A number whose dial failed `max_dial_attempts` times is given up on.
+Only dials known not to have placed a call are redialed: when a dial errors
+after its request may have reached the API (a read timeout, a 500), the call
+may be ringing, so the number is recorded as `dial_unknown` and left for the
+user to check rather than called twice.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+from elevenlabs_mcp.concurrency import RateLimiter, map_concurrent
+from elevenlabs_mcp.conversation_export import fetch_conversation
+from elevenlabs_mcp.conversation_index import TERMINAL_STATUSES
+from elevenlabs_mcp.retry import UNPROCESSED_STATUSES, UNSENT_ERRORS
+from elevenlabs_mcp.utils import ElevenLabsMcpError, make_error
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+IN_PROGRESS = "in_progress"
+DIAL_FAILED = "dial_failed"
+# The dial errored after its request may have placed the call
+DIAL_UNKNOWN = "dial_unknown"
+GAVE_UP = "gave_up"
+# Journal statuses that are never retried
+FINAL_STATUSES = ("done", "failed", "untracked", GAVE_UP, DIAL_UNKNOWN)
+MAX_DIAL_ATTEMPTS = 3
+POLL_REQUESTS_PER_SECOND = 10.0
+
+
+class CampaignJournal:
+    """Append-only JSONL log of call status changes; the last entry per number wins."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.state: dict[str, dict] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted run
+                        continue
+                    self.state[entry["to_number"]] = entry
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, to_number: str, status: str, **fields) -> None:
+        entry = {"to_number": to_number, "status": status, "at": int(time.time()), **fields}
+        self.state[to_number] = entry
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def agent_concurrency_limit(client: ElevenLabs, agent_id: str) -> int | None:
+    """The agent's configured concurrent-call limit, or None if unlimited."""
+    agent = client.conversational_ai.agents.get(agent_id=agent_id)
+    call_limits = getattr(agent.platform_settings, "call_limits", None) if agent.platform_settings else None
+    limit = getattr(call_limits, "agent_concurrency_limit", None) if call_limits else None
+    return limit if limit is not None and limit > 0 else None
+
+
+def normalize_calls(calls: list) -> list[dict]:
+    """Accept numbers or {"to_number", "dynamic_variables"} dicts; drop repeated numbers."""
+    normalized = []
+    seen = set()
+    for position, call in enumerate(calls):
+        if isinstance(call, str):
+            call = {"to_number": call}
+        if not isinstance(call, dict) or not call.get("to_number"):
+            make_error(
+                f"Call #{position + 1} has no to_number",
+                code="INVALID_PARAMETERS",
+                suggestion='Pass numbers as strings or {"to_number": ..., "dynamic_variables": {...}}',
+            )
+        if call["to_number"] in seen:
+            continue
+        seen.add(call["to_number"])
+        normalized.append(
+            {"to_number": call["to_number"], "dynamic_variables": call.get("dynamic_variables") or {}}
+        )
+    return normalized
+
+
+def dial_not_placed(error: Exception) -> bool:
+    """Whether a dial that raised `error` certainly placed no call, so redialing is safe."""
+    if isinstance(error, UNSENT_ERRORS):
+        return True
+    # The SDK's ApiError: the API answered, and rejected the dial or did not take it on
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and (400 <= status_code < 500 or status_code in UNPROCESSED_STATUSES)
+
+
+def run_campaign(
+    client: ElevenLabs,
+    http_client: httpx.Client,
+    api_key: str,
+    agent_id: str,
+    agent_phone_number_id: str,
+    calls: list,
+    journal_path: Path,
+    max_concurrent_calls: int = 5,
+    calls_per_second: float = 1.0,
+    poll_interval_secs: float = 10.0,
+    max_runtime_secs: float | None = None,
+    max_dial_attempts: int = MAX_DIAL_ATTEMPTS,
+) -> dict:
+    """
+    Dial `calls` and track them to completion, or until `max_runtime_secs` passes.
+
+    Returns a summary of the whole campaign (not just this run) read from the
+    journal, with `finished` false if calls remain to be dialed or completed.
+    Numbers given up on after `max_dial_attempts` failed dials, over all runs,
+    count as finished and are listed in `gave_up_numbers`; numbers whose dial
+    may or may not have placed a call are never redialed and are listed in
+    `dial_unknown_numbers`.
+    """
+    max_dial_attempts = max(1, max_dial_attempts)
+    calls = normalize_calls(calls)
+    agent_limit = agent_concurrency_limit(client, agent_id)
+    concurrency = max(1, min(max_concurrent_calls, agent_limit or max_concurrent_calls))
+    deadline = time.monotonic() + max_runtime_secs if max_runtime_secs else None
+    dial_limiter = RateLimiter(calls_per_second, burst=1)
+    poll_limiter = RateLimiter(POLL_REQUESTS_PER_SECOND, burst=concurrency)
+
+    journal = CampaignJournal(journal_path)
+    try:
+        active = {
+            entry["to_number"]: entry["conversation_id"]
+            for entry in journal.state.values()
+            if entry["status"] == IN_PROGRESS
+        }
+        pending = [
+            call
+            for call in calls
+            if journal.state.get(call["to_number"], {}).get("status")
+            not in (*FINAL_STATUSES, IN_PROGRESS)
+        ]
+        pending.reverse()
+        dialed = 0
+
+        def dial(call: dict):
+            options = {}
+            if call["dynamic_variables"]:
+                options["conversation_initiation_client_data"] = {"dynamic_variables": call["dynamic_variables"]}
+            # The SDK would resend the dial after a 5xx, which may already have placed the call
+            return client.conversational_ai.twilio.outbound_call(
+                agent_id=agent_id,
+                agent_phone_number_id=agent_phone_number_id,
+                to_number=call["to_number"],
+                request_options={"max_retries": 0},
+                **options,
+            )
+
+        def poll(to_number: str) -> dict:
+            return fetch_conversation(http_client, api_key, active[to_number])
+
+        while pending or active:
+            if active:
+                for to_number, conversation, error in map_concurrent(
+                    poll, list(active), max_workers=concurrency, rate_limiter=poll_limiter
+                ):
+                    # Transient poll errors keep the call active until the next round
+                    if error is not None or conversation.get("status") not in TERMINAL_STATUSES:
+                        continue
+                    metadata = conversation.get("metadata") or {}
+                    analysis = conversation.get("analysis") or {}
+                    journal.record(
+                        to_number,
+                        conversation["status"],
+                        conversation_id=active.pop(to_number),
+                        call_duration_secs=metadata.get("call_duration_secs"),
+                        call_successful=analysis.get("call_successful"),
+                        termination_reason=metadata.get("termination_reason"),
+                    )
+
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+            batch = []
+            while pending and len(active) + len(batch) < concurrency:
+                batch.append(pending.pop())
+            for call, response, error in map_concurrent(
+                dial, batch, max_workers=len(batch) or 1, rate_limiter=dial_limiter
+            ):
+                dialed += 1
+                to_number = call["to_number"]
+                if error is not None or not response.success:
+                    message = (
+                        error.message if isinstance(error, ElevenLabsMcpError)
+                        else str(error) if error is not None
+                        else response.message
+                    )
+                    previous = journal.state.get(to_number, {})
+                    attempts = (previous.get("attempts", 1) if previous.get("status") == DIAL_FAILED else 0) + 1
+                    if error is not None and not dial_not_placed(error):
+                        status = DIAL_UNKNOWN
+                    else:
+                        status = GAVE_UP if attempts >= max_dial_attempts else DIAL_FAILED
+                    journal.record(to_number, status, error=message, attempts=attempts)
+                elif response.conversation_id:
+                    active[to_number] = response.conversation_id
+                    journal.record(
+                        to_number,
+                        IN_PROGRESS,
+                        conversation_id=response.conversation_id,
+                        call_sid=response.call_sid,
+                    )
+                else:
+                    journal.record(to_number, "untracked", call_sid=response.call_sid)
+
+            if active:
+                remaining = deadline - time.monotonic() if deadline is not None else poll_interval_secs
+                time.sleep(max(0.0, min(poll_interval_secs, remaining)))
+
+        counts: dict[str, int] = {}
+        gave_up = []
+        unknown = []
+        for call in calls:
+            status = journal.state.get(call["to_number"], {}).get("status", "pending")
+            counts[status] = counts.get(status, 0) + 1
+            if status == GAVE_UP:
+                gave_up.append(call["to_number"])
+            elif status == DIAL_UNKNOWN:
+                unknown.append(call["to_number"])
+    finally:
+        journal.close()
+
+    return {
+        "journal_file": str(journal_path),
+        "total_calls": len(calls),
+        "dialed_this_run": dialed,
+        "max_concurrent_calls": concurrency,
+        "agent_concurrency_limit": agent_limit,
+        "status_counts": counts,
+        "gave_up_numbers": gave_up,
+        "dial_unknown_numbers": unknown,
+        "finished": not any(
+            counts.get(status) for status in ("pending", IN_PROGRESS, DIAL_FAILED)
+        ),
+    }
@@ -0,0 +1,269 @@
+"""
+Record and replay of upstream HTTP traffic.
+
+A cassette is a JSONL file of request/response pairs captured at the bottom
+of the shared client's transport stack, below the governor, so SDK calls and
+raw requests are both covered and replayed traffic still passes through
+rate limiting, retries, metrics and tracing. Each entry keeps the response
+status, headers and body chunks with their boundaries, plus the time to the
+response headers and the offset of every chunk.
+
+- ELEVENLABS_MCP_CASSETTE: the cassette file
+- ELEVENLABS_MCP_CASSETTE_MODE: `record` (append real traffic) or `replay`
+  (serve it back without network access; the default)
+- ELEVENLABS_MCP_CASSETTE_TIME_SCALE: replay timings multiplied by this
+  (1 default, 0 serves instantly)
+
+Replayed requests are matched on method, path, query and body digest, then
+on method, path and query, then on method and path alone, since multipart
+boundaries and generated text differ between runs. Entries with the same
+key are served in recorded order, starting over once used up. API keys are
+never written to the cassette.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+
+from elevenlabs_mcp.governor import replayable
+
+logger = logging.getLogger(__name__)
+
+MODES = ("record", "replay")
+# Request bodies up to this size are stored for inspection; larger ones only as a digest
+MAX_STORED_REQUEST_BYTES = 64 * 1024
+# Never written to a cassette
+SECRET_HEADERS = {"xi-api-key", "authorization", "cookie", "set-cookie"}
+
+
+def _request_key(request: httpx.Request) -> tuple[str, str, str]:
+    query = "&".join(sorted(request.url.query.decode().split("&"))) if request.url.query else ""
+    return request.method.upper(), request.url.path, query
+
+
+def _body_digest(request: httpx.Request) -> str | None:
+    # One-shot bodies cannot be read here without consuming them before they are sent
+    if not replayable(request):
+        return None
+    return hashlib.sha256(request.read()).hexdigest()
+
+
+def _public_headers(headers: httpx.Headers) -> list[list[str]]:
+    return [[key, value] for key, value in headers.multi_items() if key.lower() not in SECRET_HEADERS]
+
+
+class _RecordingStream(httpx.SyncByteStream):
+    """
+    Response body passed through unchanged, written to the cassette once it is
+    read to the end or closed. A body abandoned half-read and never closed is
+    not recorded.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream, entry: dict, headers_at: float, write):
+        self._stream = stream
+        self._entry = entry
+        self._headers_at = headers_at
+        self._write = write
+        self._written = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._entry["chunks"].append(
+                [round((time.monotonic() - self._headers_at) * 1000, 3), base64.b64encode(chunk).decode()]
+            )
+            yield chunk
+        self._finish()
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._finish()
+
+    def _finish(self) -> None:
+        if not self._written:
+            self._written = True
+            self._write(self._entry)
+
+
+class _ReplayStream(httpx.SyncByteStream):
+    """Recorded body chunks, each yielded at its recorded offset times the time scale."""
+
+    def __init__(self, chunks: list, time_scale: float):
+        self._chunks = chunks
+        self._time_scale = time_scale
+
+    def __iter__(self) -> Iterator[bytes]:
+        started = time.monotonic()
+        for offset_ms, data in self._chunks:
+            delay = offset_ms / 1000 * self._time_scale - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+            yield base64.b64decode(data)
+
+
+class CassetteTransport(httpx.BaseTransport):
+    """httpx transport recording traffic to, or replaying it from, a cassette file."""
+
+    def __init__(
+        self,
+        path: Path,
+        mode: str = "replay",
+        time_scale: float = 1.0,
+        transport: httpx.BaseTransport | None = None,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"cassette mode must be one of {', '.join(MODES)}, not {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.time_scale = max(time_scale, 0.0)
+        self.stats = {"recorded": 0, "replayed": 0, "misses": 0}
+        self._transport = transport
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, list[dict]] | None = None
+        self._positions: dict[tuple, int] = defaultdict(int)
+        if mode == "record":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        elif not self.path.is_file():
+            raise FileNotFoundError(
+                f"cassette {self.path} does not exist; record it first with ELEVENLABS_MCP_CASSETTE_MODE=record"
+            )
+
+    @property
+    def transport(self) -> httpx.BaseTransport:
+        # Only recording talks to the network; built on first request, like GovernedTransport
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = httpx.HTTPTransport()
+        return self._transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "record":
+            return self._record(request)
+        return self._replay(request)
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+            self.stats["recorded"] += 1
+
+    def _record(self, request: httpx.Request) -> httpx.Response:
+        method, path, query = _request_key(request)
+        digest = _body_digest(request)
+        body = request.content if digest is not None else b""
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+        headers_at = time.monotonic()
+        entry = {
+            "method": method,
+            "path": path,
+            "query": query,
+            "request_digest": digest,
+            "request_headers": _public_headers(request.headers),
+            "request_body": base64.b64encode(body).decode() if len(body) <= MAX_STORED_REQUEST_BYTES else None,
+            "request_bytes": len(body),
+            "status": response.status_code,
+            "headers": _public_headers(response.headers),
+            "ttfb_ms": round((headers_at - started) * 1000, 3),
+            "chunks": [],
+        }
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, entry, headers_at, self._write),
+            extensions=response.extensions,
+        )
+
+    def _load(self) -> dict[tuple, list[dict]]:
+        with self._lock:
+            if self._entries is None:
+                entries: dict[tuple, list[dict]] = defaultdict(list)
+                with open(self.path, encoding="utf-8") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            continue
+                        for key in self._keys(entry["method"], entry["path"], entry["query"], entry["request_digest"]):
+                            entries[key].append(entry)
+                self._entries = dict(entries)
+                logger.info("Loaded cassette %s", self.path)
+        return self._entries
+
+    @staticmethod
+    def _keys(method: str, path: str, query: str, digest: str | None) -> list[tuple]:
+        """Lookup keys from the most to the least specific."""
+        keys = [(method, path, query), (method, path)]
+        if digest is not None:
+            keys.insert(0, (method, path, query, digest))
+        return keys
+
+    def _next_entry(self, request: httpx.Request) -> dict | None:
+        entries = self._load()
+        for key in self._keys(*_request_key(request), _body_digest(request)):
+            candidates = entries.get(key)
+            if candidates:
+                with self._lock:
+                    position = self._positions[key]
+                    self._positions[key] = position + 1
+                return candidates[position % len(candidates)]
+        return None
+
+    def _replay(self, request: httpx.Request) -> httpx.Response:
+        entry = self._next_entry(request)
+        if entry is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            # A 404 is surfaced as an API error and not retried, unlike a transport error
+            return httpx.Response(
+                404,
+                json={
+                    "detail": {
+                        "status": "cassette_miss",
+                        "message": f"No recorded response for {request.method} {request.url.path} in {self.path}",
+                    }
+                },
+            )
+        with self._lock:
+            self.stats["replayed"] += 1
+        if entry["ttfb_ms"] and self.time_scale:
+            time.sleep(entry["ttfb_ms"] / 1000 * self.time_scale)
+        return httpx.Response(
+            status_code=entry["status"],
+            headers=entry["headers"],
+            stream=_ReplayStream(entry["chunks"], self.time_scale),
+        )
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+
+def cassette_from_env() -> CassetteTransport | None:
+    """
+    The cassette configured by ELEVENLABS_MCP_CASSETTE, or None to talk to the API directly.
+
+    Raises FileNotFoundError at startup when replaying a cassette that was never recorded.
+    """
+    path = os.environ.get("ELEVENLABS_MCP_CASSETTE")
+    if not path:
+        return None
+    mode = os.environ.get("ELEVENLABS_MCP_CASSETTE_MODE", "replay").strip().lower()
+    try:
+        time_scale = float(os.environ.get("ELEVENLABS_MCP_CASSETTE_TIME_SCALE", "1"))
+    except ValueError:
+        logger.warning("Ignoring invalid ELEVENLABS_MCP_CASSETTE_TIME_SCALE")
+        time_scale = 1.0
+    return CassetteTransport(Path(os.path.expanduser(path)), mode, time_scale)
@@ -0,0 +1,186 @@
+"""
+Helpers for running blocking API calls concurrently under limits.
+
+The ElevenLabs SDK and the shared httpx client are synchronous, so bulk tools
+fan out over a thread pool and bound both in-flight calls and request rate.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Thread-safe token bucket allowing `rate` acquisitions per second, bursting to `burst`."""
+
+    def __init__(self, rate: float | None, burst: int = 1):
+        self.rate = rate if rate and rate > 0 else None
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Block until a token is available. Returns the seconds spent waiting."""
+        if self.rate is None:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def map_concurrent(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 8,
+    rate_limiter: RateLimiter | None = None,
+) -> Iterator[tuple[T, R | None, BaseException | None]]:
+    """
+    Apply `fn` to `items` on a thread pool, yielding (item, result, error) as calls finish.
+
+    Items are consumed lazily and at most `max_workers` calls are in flight,
+    so arbitrarily long inputs never pile up results in memory.
+    """
+    max_workers = max(1, max_workers)
+
+    def call(item: T) -> R:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return fn(item)
+
+    # Workers run in the caller's context, so per-call state such as metrics follows the work
+    context = contextvars.copy_context()
+
+    def submit(executor: ThreadPoolExecutor, item: T):
+        return executor.submit(context.copy().run, call, item)
+
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for item in iterator:
+            pending[submit(executor, item)] = item
+            if len(pending) >= max_workers:
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, (None if error else future.result()), error
+            for item in iterator:
+                pending[submit(executor, item)] = item
+                if len(pending) >= max_workers:
+                    break
+
+
+class FairExecutor:
+    """
+    Thread pool serving one FIFO queue per key in turn.
+
+    A free thread takes the next task of the key after the one it served
+    last. Running tasks are capped per key at an equal share of the threads
+    among the keys with work queued or running, and never more than
+    `max_per_key` (all threads but one by default): tasks cannot be
+    preempted, so without that reserve a key arriving behind a burst of
+    long tasks would wait for the first of them to finish. Threads are
+    started on demand up to `max_workers`.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "fair", max_per_key: int | None = None):
+        self.max_workers = max(1, max_workers)
+        self.max_per_key = max(1, max_per_key if max_per_key is not None else self.max_workers - 1)
+        self.thread_name_prefix = thread_name_prefix
+        # Keys with queued tasks, in the order they are served
+        self._queues: OrderedDict[str, deque] = OrderedDict()
+        self._running: dict[str, int] = {}
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._condition = threading.Condition()
+
+    def submit(self, key: str, fn: Callable[..., R], *args, **kwargs) -> Future:
+        future: Future = Future()
+        with self._condition:
+            self._queues.setdefault(key, deque()).append((future, fn, args, kwargs))
+            if self._idle == 0 and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.thread_name_prefix}-{len(self._threads)}", daemon=True
+                )
+                self._threads.append(thread)
+                thread.start()
+            self._condition.notify()
+        return future
+
+    def queued(self) -> dict[str, int]:
+        """Tasks waiting for a thread, per key."""
+        with self._condition:
+            return {key: len(queue) for key, queue in self._queues.items()}
+
+    def running(self) -> dict[str, int]:
+        """Tasks holding a thread, per key."""
+        with self._condition:
+            return dict(self._running)
+
+    def _cap(self) -> int:
+        active = len(self._queues.keys() | self._running.keys())
+        return max(1, min(self.max_per_key, self.max_workers // max(1, active)))
+
+    def _next(self) -> tuple | None:
+        # Called with the condition held; None when every key with work is at its cap
+        cap = self._cap()
+        for key, queue in self._queues.items():
+            if self._running.get(key, 0) < cap:
+                break
+        else:
+            return None
+        task = queue.popleft()
+        if queue:
+            self._queues.move_to_end(key)
+        else:
+            del self._queues[key]
+        self._running[key] = self._running.get(key, 0) + 1
+        return key, *task
+
+    def _done(self, key: str) -> None:
+        with self._condition:
+            self._running[key] -= 1
+            if not self._running[key]:
+                del self._running[key]
+                # One key fewer raises the share of the others
+                self._condition.notify_all()
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                self._idle += 1
+                while (task := self._next()) is None:
+                    self._condition.wait()
+                self._idle -= 1
+            key, future, fn, args, kwargs = task
+            try:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            finally:
+                self._done(key)
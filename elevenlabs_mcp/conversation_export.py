@@ -0,0 +1,228 @@
+"""
+Bulk export of full conversation details.
+
+Details are fetched concurrently under a rate limit and streamed to disk as
+they arrive, so memory use stays flat regardless of export size. Completed
+conversation IDs are appended to a cursor file once their records are on disk;
+re-running the same export skips them, which makes interrupted exports
+resumable. Parquet is written as one complete part file per batch, since a
+Parquet file is unreadable until its footer is written on close.
+"""
+
+import os
+
+import json
+from pathlib import Path
+from typing import Iterable, Literal
+
+import httpx
+
+from elevenlabs_mcp.concurrency import RateLimiter, map_concurrent
+from elevenlabs_mcp.utils import ElevenLabsMcpError, api_url, make_error
+
+CONVERSATION_PATH = "/v1/convai/conversations/{conversation_id}"
+PARQUET_BATCH_SIZE = 500
+
+
+def fetch_conversation(http_client: httpx.Client, api_key: str, conversation_id: str) -> dict:
+    """Fetch one conversation's full details, including transcript and analysis."""
+    response = http_client.get(
+        api_url(CONVERSATION_PATH.format(conversation_id=conversation_id)),
+        headers={"xi-api-key": api_key},
+    )
+    if response.status_code == 404:
+        make_error(
+            f"Conversation with ID {conversation_id} not found",
+            code="CONVERSATION_NOT_FOUND",
+            suggestion="Check the conversation ID or use list_conversations() to see available conversations"
+        )
+    elif response.status_code == 403:
+        make_error(
+            f"No access to conversation {conversation_id}",
+            code="ACCESS_DENIED",
+            suggestion="Check that your API key belongs to the workspace that owns this conversation"
+        )
+    elif response.status_code != 200:
+        make_error(
+            f"API error: {response.status_code} - {response.text}",
+            code="API_ERROR",
+            suggestion="Check your API key and network connection"
+        )
+    return response.json()
+
+
+class JsonlWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, record: dict) -> list[str]:
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        return [record["conversation_id"]]
+
+    def close(self) -> list[str]:
+        self._file.close()
+        return []
+
+
+class ParquetWriter:
+    """
+    Buffers records and writes each batch as a part file next to `path`;
+    nested fields are stored as JSON strings.
+    """
+
+    def __init__(self, path: Path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            make_error(
+                "Parquet export requires pyarrow",
+                code="MISSING_DEPENDENCY",
+                suggestion="Install it with `pip install pyarrow`, or use format='jsonl'"
+            )
+        self._pa = pa
+        self._pq = pq
+        self._schema = pa.schema(
+            [
+                ("conversation_id", pa.string()),
+                ("agent_id", pa.string()),
+                ("status", pa.string()),
+                ("start_time_unix_secs", pa.int64()),
+                ("call_duration_secs", pa.int64()),
+                ("transcript", pa.string()),
+                ("metadata", pa.string()),
+                ("analysis", pa.string()),
+            ]
+        )
+        self.path = path
+        self.paths: list[Path] = []
+        self._buffer: list[dict] = []
+
+    def write(self, record: dict) -> list[str]:
+        metadata = record.get("metadata") or {}
+        self._buffer.append(
+            {
+                "conversation_id": record["conversation_id"],
+                "agent_id": record.get("agent_id"),
+                "status": record.get("status"),
+                "start_time_unix_secs": metadata.get("start_time_unix_secs"),
+                "call_duration_secs": metadata.get("call_duration_secs"),
+                "transcript": json.dumps(record.get("transcript") or [], ensure_ascii=False),
+                "metadata": json.dumps(metadata, ensure_ascii=False),
+                "analysis": json.dumps(record.get("analysis"), ensure_ascii=False),
+            }
+        )
+        if len(self._buffer) >= PARQUET_BATCH_SIZE:
+            return self._flush()
+        return []
+
+    def close(self) -> list[str]:
+        return self._flush()
+
+    def _flush(self) -> list[str]:
+        if not self._buffer:
+            return []
+        table = self._pa.Table.from_pylist(self._buffer, schema=self._schema)
+        part = next_free_path(self.path)
+        # Renamed into place once complete, so no reader or resumed export sees a partial file
+        temporary = part.with_name(part.name + ".tmp")
+        self._pq.write_table(table, str(temporary))
+        os.replace(temporary, part)
+        self.paths.append(part)
+        flushed = [row["conversation_id"] for row in self._buffer]
+        self._buffer = []
+        return flushed
+
+
+def read_cursor(cursor_path: Path) -> set[str]:
+    if not cursor_path.exists():
+        return set()
+    with open(cursor_path, encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def next_free_path(path: Path) -> Path:
+    """`path`, or its first part file name not taken yet: Parquet files cannot be appended to."""
+    if not path.exists():
+        return path
+    part = 2
+    while True:
+        candidate = path.with_name(f"{path.stem}.part{part}{path.suffix}")
+        if not candidate.exists():
+            return candidate
+        part += 1
+
+
+def export_conversations(
+    http_client: httpx.Client,
+    api_key: str,
+    conversation_ids: Iterable[str],
+    output_path: Path,
+    cursor_path: Path,
+    format: Literal["jsonl", "parquet"] = "jsonl",
+    max_concurrency: int = 8,
+    requests_per_second: float | None = 10.0,
+) -> dict:
+    """
+    Fetch conversation details concurrently and stream them to `output_path`.
+
+    Args:
+        http_client: Client used for the detail requests
+        api_key: ElevenLabs API key
+        conversation_ids: IDs to export, in export order
+        output_path: JSONL file (appended on resume), or the first Parquet part file
+        cursor_path: File listing IDs already exported
+        format: 'jsonl' or 'parquet'
+        max_concurrency: Maximum detail requests in flight
+        requests_per_second: Request rate cap (None for unlimited)
+
+    Returns a summary with counts and the files written.
+    """
+    done = read_cursor(cursor_path)
+    conversation_ids = list(conversation_ids)
+    pending_ids = [cid for cid in conversation_ids if cid not in done]
+
+    if format == "parquet":
+        writer = ParquetWriter(output_path)
+    else:
+        writer = JsonlWriter(output_path)
+
+    exported = 0
+    failures: list[dict] = []
+    with open(cursor_path, "a", encoding="utf-8") as cursor_file:
+        try:
+            for conversation_id, record, error in map_concurrent(
+                lambda cid: fetch_conversation(http_client, api_key, cid),
+                pending_ids,
+                max_workers=max_concurrency,
+                rate_limiter=RateLimiter(requests_per_second, burst=max_concurrency),
+            ):
+                if error is not None:
+                    message = error.message if isinstance(error, ElevenLabsMcpError) else str(error)
+                    failures.append({"conversation_id": conversation_id, "error": message})
+                    continue
+                record.setdefault("conversation_id", conversation_id)
+                flushed = writer.write(record)
+                exported += 1
+                if flushed:
+                    cursor_file.write("".join(f"{cid}\n" for cid in flushed))
+                    cursor_file.flush()
+        finally:
+            flushed = writer.close()
+            if flushed:
+                cursor_file.write("".join(f"{cid}\n" for cid in flushed))
+
+    summary = {
+        "output_file": str(output_path),
+        "cursor_file": str(cursor_path),
+        "format": format,
+        "exported": exported,
+        "previously_exported": len(conversation_ids) - len(pending_ids),
+        "failed": len(failures),
+        "failures": failures[:20],
+    }
+    if format == "parquet":
+        summary["output_files"] = [str(path) for path in writer.paths]
+    return summary
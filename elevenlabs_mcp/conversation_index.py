@@ -0,0 +1,419 @@
+"""
+Local SQLite index of conversation metadata.
+
+The ElevenLabs API lists conversations newest first, at most 100 per page.
+This index mirrors the summaries locally so filtered queries over tens of
+thousands of conversations run in milliseconds instead of dozens of round trips.
+
+Sync is incremental: each run pages from the newest conversation back to the
+newest one already indexed (minus a small overlap), and also re-reads any
+conversation that was still in progress at the last sync. A run that stops
+early because of its page budget saves its cursor and resumes there next time.
+Queries need not wait for a sync: `sync_in_background` refreshes an index
+whose last sync is older than a minute without blocking the caller.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+from elevenlabs_mcp.utils import api_url, make_error, get_data_dir
+
+logger = logging.getLogger(__name__)
+
+CONVERSATIONS_PATH = "/v1/convai/conversations"
+PAGE_SIZE = 100
+TERMINAL_STATUSES = ("done", "failed")
+# Conversations can show up in the listing slightly out of start-time order
+SYNC_OVERLAP_SECS = 600
+# Non-terminal conversations older than this are treated as abandoned and not re-read
+ACTIVE_LOOKBACK_SECS = 24 * 3600
+# Age of the last sync past which a query refreshes the index in the background
+MAX_STALENESS_SECS = 60
+
+SORT_COLUMNS = {
+    "start_time": "start_time_unix_secs",
+    "duration": "call_duration_secs",
+    "message_count": "message_count",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation_id TEXT PRIMARY KEY,
+    agent_id TEXT NOT NULL,
+    agent_name TEXT,
+    status TEXT,
+    start_time_unix_secs INTEGER NOT NULL,
+    call_duration_secs INTEGER,
+    message_count INTEGER,
+    call_successful TEXT,
+    termination_reason TEXT,
+    synced_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_start
+    ON conversations (start_time_unix_secs);
+CREATE INDEX IF NOT EXISTS idx_conversations_agent_start
+    ON conversations (agent_id, start_time_unix_secs);
+CREATE INDEX IF NOT EXISTS idx_conversations_status_start
+    ON conversations (status, start_time_unix_secs);
+CREATE INDEX IF NOT EXISTS idx_conversations_duration
+    ON conversations (call_duration_secs);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    newest_start_unix_secs INTEGER,
+    pending_floor INTEGER,
+    pending_cursor TEXT,
+    pending_newest INTEGER,
+    last_synced_at INTEGER
+);
+"""
+
+
+class ConversationIndex:
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        # Scopes with a background sync running
+        self._syncing: set[str] = set()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        return self._conn
+
+    @property
+    def lock(self) -> threading.Lock:
+        return self._lock
+
+    def sync(
+        self,
+        http_client: httpx.Client,
+        api_key: str,
+        agent_id: str | None = None,
+        max_pages: int = 50,
+    ) -> dict:
+        """
+        Pull new and still-active conversations into the index.
+
+        Args:
+            http_client: Client used for the listing requests
+            api_key: ElevenLabs API key
+            agent_id: Restrict the sync to one agent (all agents by default)
+            max_pages: Page budget for this run; the rest resumes next run
+
+        Returns a summary with pages fetched, rows upserted and whether the
+        index is caught up.
+        """
+        scope = agent_id or "*"
+        state = self._get_state(scope)
+
+        if state and state["pending_cursor"]:
+            floor = state["pending_floor"]
+            cursor = state["pending_cursor"]
+            newest = state["pending_newest"]
+        else:
+            floor = self._refresh_floor(scope, agent_id, state)
+            cursor = None
+            newest = None
+
+        pages = 0
+        upserted = 0
+        complete = False
+        while pages < max_pages:
+            params = {"page_size": PAGE_SIZE}
+            if agent_id:
+                params["agent_id"] = agent_id
+            if floor is not None:
+                params["call_start_after_unix"] = floor
+            if cursor:
+                params["cursor"] = cursor
+
+            response = http_client.get(
+                api_url(CONVERSATIONS_PATH), headers={"xi-api-key": api_key}, params=params
+            )
+            if response.status_code != 200:
+                make_error(
+                    f"API error while syncing conversations: {response.status_code} - {response.text}",
+                    code="API_ERROR",
+                    suggestion="Check your API key and network connection, then retry the sync"
+                )
+            data = response.json()
+            conversations = data.get("conversations", [])
+            pages += 1
+
+            if conversations:
+                page_newest = max(c.get("start_time_unix_secs", 0) for c in conversations)
+                newest = page_newest if newest is None else max(newest, page_newest)
+                upserted += self._upsert(conversations)
+
+            cursor = data.get("next_cursor")
+            if not data.get("has_more") or not cursor:
+                complete = True
+                break
+
+        now = int(time.time())
+        with self._lock:
+            if complete:
+                watermark = max(
+                    (state["newest_start_unix_secs"] if state else None) or 0,
+                    newest or 0,
+                ) or None
+                self._conn.execute(
+                    """INSERT INTO sync_state (scope, newest_start_unix_secs, pending_floor,
+                           pending_cursor, pending_newest, last_synced_at)
+                       VALUES (?, ?, NULL, NULL, NULL, ?)
+                       ON CONFLICT(scope) DO UPDATE SET
+                           newest_start_unix_secs = excluded.newest_start_unix_secs,
+                           pending_floor = NULL, pending_cursor = NULL, pending_newest = NULL,
+                           last_synced_at = excluded.last_synced_at""",
+                    (scope, watermark, now),
+                )
+            else:
+                self._conn.execute(
+                    """INSERT INTO sync_state (scope, newest_start_unix_secs, pending_floor,
+                           pending_cursor, pending_newest, last_synced_at)
+                       VALUES (?, ?, ?, ?, ?, ?)
+                       ON CONFLICT(scope) DO UPDATE SET
+                           pending_floor = excluded.pending_floor,
+                           pending_cursor = excluded.pending_cursor,
+                           pending_newest = excluded.pending_newest,
+                           last_synced_at = excluded.last_synced_at""",
+                    (
+                        scope,
+                        state["newest_start_unix_secs"] if state else None,
+                        floor,
+                        cursor,
+                        newest,
+                        now,
+                    ),
+                )
+            self._conn.commit()
+
+        return {
+            "scope": agent_id or "all agents",
+            "pages_fetched": pages,
+            "conversations_upserted": upserted,
+            "caught_up": complete,
+            "indexed_total": self.count(),
+        }
+
+    def query(
+        self,
+        agent_id: str | None = None,
+        status: str | None = None,
+        started_after: int | None = None,
+        started_before: int | None = None,
+        min_duration_secs: int | None = None,
+        max_duration_secs: int | None = None,
+        sort_by: str = "start_time",
+        sort_direction: str = "desc",
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[dict], int]:
+        """Filter indexed conversations. Returns (rows, total matching rows)."""
+        if sort_by not in SORT_COLUMNS:
+            make_error(
+                f"Invalid sort_by '{sort_by}'",
+                code="INVALID_SORT",
+                suggestion=f"Use one of: {', '.join(SORT_COLUMNS)}"
+            )
+        where, params = build_filters(
+            agent_id=agent_id,
+            status=status,
+            started_after=started_after,
+            started_before=started_before,
+            min_duration_secs=min_duration_secs,
+            max_duration_secs=max_duration_secs,
+        )
+        direction = "ASC" if sort_direction == "asc" else "DESC"
+        with self._lock:
+            total = self._conn.execute(
+                f"SELECT COUNT(*) FROM conversations {where}", params
+            ).fetchone()[0]
+            rows = self._conn.execute(
+                f"""SELECT conversation_id, agent_id, agent_name, status,
+                        start_time_unix_secs, call_duration_secs, message_count,
+                        call_successful, termination_reason
+                    FROM conversations {where}
+                    ORDER BY {SORT_COLUMNS[sort_by]} {direction}, conversation_id {direction}
+                    LIMIT ? OFFSET ?""",
+                [*params, limit, offset],
+            ).fetchall()
+        return [dict(row) for row in rows], total
+
+    def conversation_ids(self, **filters) -> list[str]:
+        """IDs of indexed conversations matching `filters`, oldest first."""
+        where, params = build_filters(**filters)
+        with self._lock:
+            rows = self._conn.execute(
+                f"""SELECT conversation_id FROM conversations {where}
+                    ORDER BY start_time_unix_secs ASC, conversation_id ASC""",
+                params,
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def synced_secs_ago(self, agent_id: str | None = None) -> float | None:
+        """Seconds since the last sync covering `agent_id` (all agents by default), or None if never."""
+        scopes = ["*", agent_id] if agent_id else ["*"]
+        synced = [state["last_synced_at"] for state in map(self._get_state, scopes) if state]
+        synced = [value for value in synced if value is not None]
+        return max(0.0, time.time() - max(synced)) if synced else None
+
+    def sync_in_background(
+        self,
+        http_client: httpx.Client,
+        api_key: str,
+        agent_id: str | None = None,
+        max_staleness_secs: float = MAX_STALENESS_SECS,
+    ) -> bool:
+        """
+        Start a sync on a background thread if the last one is older than
+        `max_staleness_secs` and none is running for this scope. Returns
+        whether one was started.
+        """
+        age = self.synced_secs_ago(agent_id)
+        if age is not None and age <= max_staleness_secs:
+            return False
+        scope = agent_id or "*"
+        with self._lock:
+            if scope in self._syncing:
+                return False
+            self._syncing.add(scope)
+
+        def run():
+            try:
+                self.sync(http_client, api_key, agent_id=agent_id)
+            except Exception as e:
+                logger.warning("Background sync of the conversation index failed: %s", e)
+            finally:
+                with self._lock:
+                    self._syncing.discard(scope)
+
+        threading.Thread(target=run, name="conversation-index-sync", daemon=True).start()
+        return True
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    def _get_state(self, scope: str) -> sqlite3.Row | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT * FROM sync_state WHERE scope = ?", (scope,)
+            ).fetchone()
+
+    def _refresh_floor(
+        self, scope: str, agent_id: str | None, state: sqlite3.Row | None
+    ) -> int | None:
+        """Oldest start time this run must reach: the watermark, or an older active call."""
+        if not state or state["newest_start_unix_secs"] is None:
+            return None
+        floor = state["newest_start_unix_secs"] - SYNC_OVERLAP_SECS
+        placeholders = ",".join("?" for _ in TERMINAL_STATUSES)
+        sql = (
+            "SELECT MIN(start_time_unix_secs) FROM conversations "
+            f"WHERE status NOT IN ({placeholders}) AND start_time_unix_secs >= ?"
+        )
+        params: list = [*TERMINAL_STATUSES, floor - ACTIVE_LOOKBACK_SECS]
+        if agent_id:
+            sql += " AND agent_id = ?"
+            params.append(agent_id)
+        with self._lock:
+            oldest_active = self._conn.execute(sql, params).fetchone()[0]
+        if oldest_active is not None:
+            floor = min(floor, oldest_active - 1)
+        return max(floor, 0)
+
+    def _upsert(self, conversations: list[dict]) -> int:
+        now = int(time.time())
+        rows = [
+            (
+                c["conversation_id"],
+                c.get("agent_id", ""),
+                c.get("agent_name"),
+                c.get("status"),
+                c.get("start_time_unix_secs", 0),
+                c.get("call_duration_secs"),
+                c.get("message_count"),
+                c.get("call_successful"),
+                c.get("termination_reason"),
+                now,
+            )
+            for c in conversations
+            if c.get("conversation_id")
+        ]
+        with self._lock:
+            self._conn.executemany(
+                """INSERT INTO conversations (conversation_id, agent_id, agent_name, status,
+                       start_time_unix_secs, call_duration_secs, message_count,
+                       call_successful, termination_reason, synced_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(conversation_id) DO UPDATE SET
+                       agent_id = excluded.agent_id,
+                       agent_name = excluded.agent_name,
+                       status = excluded.status,
+                       start_time_unix_secs = excluded.start_time_unix_secs,
+                       call_duration_secs = excluded.call_duration_secs,
+                       message_count = excluded.message_count,
+                       call_successful = excluded.call_successful,
+                       termination_reason = COALESCE(excluded.termination_reason, conversations.termination_reason),
+                       synced_at = excluded.synced_at""",
+                rows,
+            )
+            self._conn.commit()
+        return len(rows)
+
+
+def build_filters(
+    agent_id: str | None = None,
+    status: str | None = None,
+    started_after: int | None = None,
+    started_before: int | None = None,
+    min_duration_secs: int | None = None,
+    max_duration_secs: int | None = None,
+) -> tuple[str, list]:
+    """Build a WHERE clause over the conversations table."""
+    clauses = []
+    params: list = []
+    if agent_id:
+        clauses.append("agent_id = ?")
+        params.append(agent_id)
+    if status:
+        clauses.append("status = ?")
+        params.append(status)
+    if started_after is not None:
+        clauses.append("start_time_unix_secs >= ?")
+        params.append(started_after)
+    if started_before is not None:
+        clauses.append("start_time_unix_secs < ?")
+        params.append(started_before)
+    if min_duration_secs is not None:
+        clauses.append("call_duration_secs >= ?")
+        params.append(min_duration_secs)
+    if max_duration_secs is not None:
+        clauses.append("call_duration_secs <= ?")
+        params.append(max_duration_secs)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    return where, params
+
+
+_indexes: dict[str | None, ConversationIndex] = {}
+_index_lock = threading.Lock()
+
+
+def get_conversation_index(scope: str | None = None) -> ConversationIndex:
+    """The index of the server's own API key, or of the key whose fingerprint is `scope`."""
+    with _index_lock:
+        if scope not in _indexes:
+            name = f"conversations_{scope}.db" if scope else "conversations.db"
+            _indexes[scope] = ConversationIndex(get_data_dir() / name)
+        return _indexes[scope]
@@ -0,0 +1,199 @@
+"""
+Aggregate conversation analytics over the local index.
+
+Metadata comes from the conversation index and per-turn timing from the
+ingested transcripts. Both are loaded as columnar NumPy arrays and every
+metric is computed with vectorized operations, so tens of thousands of
+conversations reduce to a report in about a second, most of it spent reading
+SQLite rows.
+"""
+
+import numpy as np
+
+from elevenlabs_mcp.conversation_index import ConversationIndex, build_filters
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def load_columns(index: ConversationIndex, **filters) -> tuple[dict, dict]:
+    """Return (conversation columns, turn columns) as NumPy arrays for the filtered set."""
+    where, params = build_filters(**filters)
+    with index.lock:
+        conversations = index.conn.execute(
+            f"""SELECT rowid, agent_id, status, start_time_unix_secs,
+                    call_duration_secs, message_count, termination_reason
+                FROM conversations {where}
+                ORDER BY rowid""",
+            params,
+        ).fetchall()
+        # Walks the (conversation_id, turn_index) unique index, so no sort is needed
+        turns = index.conn.execute(
+            f"""SELECT conversations.rowid, t.role = 'agent', t.role = 'user', t.time_in_call_secs
+                FROM transcript_turns t
+                JOIN conversations USING (conversation_id)
+                {where}""",
+            params,
+        ).fetchall()
+
+    columns = list(zip(*conversations)) or [()] * 7
+    conversation_columns = {
+        "rowid": np.array(columns[0], dtype=np.int64),
+        "agent_id": np.array([v or "unknown" for v in columns[1]], dtype=str),
+        "status": np.array([v or "unknown" for v in columns[2]], dtype=str),
+        "start": np.array([v or 0 for v in columns[3]], dtype=np.int64),
+        "duration": np.array(columns[4], dtype=np.float64),
+        "message_count": np.array(columns[5], dtype=np.float64),
+        "termination_reason": np.array([v or "unknown" for v in columns[6]], dtype=str),
+    }
+    columns = list(zip(*turns)) or [()] * 4
+    turn_columns = {
+        "rowid": np.array(columns[0], dtype=np.int64),
+        "is_agent": np.array(columns[1], dtype=bool),
+        "is_user": np.array(columns[2], dtype=bool),
+        "time": np.array(columns[3], dtype=np.float64),
+    }
+    return conversation_columns, turn_columns
+
+
+def summarize(values: np.ndarray) -> dict | None:
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return None
+    percentiles = np.percentile(values, PERCENTILES)
+    summary = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)}
+    summary.update(
+        mean=round(float(values.mean()), 2),
+        max=round(float(values.max()), 2),
+        count=int(values.size),
+    )
+    return summary
+
+
+def crosstab(rows: np.ndarray, columns: np.ndarray) -> dict:
+    """Count occurrences of each (row, column) pair as a nested dict."""
+    if rows.size == 0:
+        return {}
+    row_labels, row_codes = np.unique(rows, return_inverse=True)
+    column_labels, column_codes = np.unique(columns, return_inverse=True)
+    counts = np.bincount(
+        row_codes * len(column_labels) + column_codes,
+        minlength=len(row_labels) * len(column_labels),
+    ).reshape(len(row_labels), len(column_labels))
+    return {
+        str(row_label): {
+            str(column_label): int(count)
+            for column_label, count in zip(column_labels, counts[i])
+            if count
+        }
+        for i, row_label in enumerate(row_labels)
+    }
+
+
+def turn_metrics(conversations: dict, turns: dict) -> dict:
+    """Talk time and time-to-first-response per conversation, aligned with `conversations`."""
+    n = conversations["rowid"].size
+    agent_talk = np.zeros(n)
+    user_talk = np.zeros(n)
+    first_response = np.full(n, np.nan)
+    has_transcript = np.zeros(n, dtype=bool)
+    if n == 0 or turns["rowid"].size == 0:
+        return {
+            "agent_talk": agent_talk,
+            "user_talk": user_talk,
+            "first_response": first_response,
+            "has_transcript": has_transcript,
+        }
+
+    # Conversations are ordered by rowid, so searchsorted maps each turn to its row
+    conv = np.searchsorted(conversations["rowid"], turns["rowid"])
+    valid = ~np.isnan(turns["time"])
+    order = np.lexsort((turns["time"][valid], conv[valid]))
+    conv = conv[valid][order]
+    time = turns["time"][valid][order]
+    is_agent = turns["is_agent"][valid][order]
+    is_user = turns["is_user"][valid][order]
+    has_transcript[conv] = True
+
+    # A turn lasts until the next turn starts, or until the call ends
+    next_time = np.empty_like(time)
+    next_time[:-1] = time[1:]
+    last_in_conversation = np.ones(time.size, dtype=bool)
+    last_in_conversation[:-1] = conv[1:] != conv[:-1]
+    call_end = conversations["duration"][conv]
+    next_time[last_in_conversation] = np.where(
+        np.isnan(call_end[last_in_conversation]),
+        time[last_in_conversation],
+        call_end[last_in_conversation],
+    )
+    segment = np.clip(next_time - time, 0, None)
+    agent_talk = np.bincount(conv, weights=segment * is_agent, minlength=n)
+    user_talk = np.bincount(conv, weights=segment * is_user, minlength=n)
+
+    # First agent turn after the caller first speaks
+    first_user = np.full(n, np.inf)
+    np.minimum.at(first_user, conv[is_user], time[is_user])
+    answers = is_agent & (time > first_user[conv])
+    first_answer = np.full(n, np.inf)
+    np.minimum.at(first_answer, conv[answers], time[answers])
+    responded = np.isfinite(first_user) & np.isfinite(first_answer)
+    first_response[responded] = first_answer[responded] - first_user[responded]
+
+    return {
+        "agent_talk": agent_talk,
+        "user_talk": user_talk,
+        "first_response": first_response,
+        "has_transcript": has_transcript,
+    }
+
+
+def compute_stats(index: ConversationIndex, **filters) -> dict:
+    """Aggregate metrics for the indexed conversations matching `filters`."""
+    conversations, turns = load_columns(index, **filters)
+    n = conversations["rowid"].size
+    if n == 0:
+        return {"conversation_count": 0}
+
+    metrics = turn_metrics(conversations, turns)
+    with_transcript = metrics["has_transcript"]
+    agent_talk = metrics["agent_talk"][with_transcript]
+    user_talk = metrics["user_talk"][with_transcript]
+    total_talk = agent_talk + user_talk
+    ratio = np.divide(
+        agent_talk, total_talk, out=np.full(total_talk.shape, np.nan), where=total_talk > 0
+    )
+    days = (conversations["start"] // 86400).astype("datetime64[D]")
+
+    by_agent = {}
+    agent_labels, agent_codes = np.unique(conversations["agent_id"], return_inverse=True)
+    for code, agent in enumerate(agent_labels):
+        mask = agent_codes == code
+        by_agent[str(agent)] = {
+            "conversation_count": int(mask.sum()),
+            "duration_secs": summarize(conversations["duration"][mask]),
+            "time_to_first_response_secs": summarize(metrics["first_response"][mask]),
+        }
+
+    agent_seconds = float(agent_talk.sum())
+    user_seconds = float(user_talk.sum())
+    return {
+        "conversation_count": int(n),
+        "conversations_with_transcript": int(with_transcript.sum()),
+        "first_day": str(days.min()),
+        "last_day": str(days.max()),
+        "duration_secs": summarize(conversations["duration"]),
+        "turn_count": summarize(conversations["message_count"]),
+        "talk_time": {
+            "agent_secs": round(agent_seconds, 1),
+            "user_secs": round(user_seconds, 1),
+            "agent_to_user_ratio": round(agent_seconds / user_seconds, 3) if user_seconds else None,
+            "agent_share_per_conversation": summarize(ratio),
+        },
+        "time_to_first_response_secs": summarize(metrics["first_response"]),
+        "status_by_agent": crosstab(conversations["agent_id"], conversations["status"]),
+        "status_by_day": crosstab(days, conversations["status"]),
+        "termination_by_agent": crosstab(
+            conversations["agent_id"], conversations["termination_reason"]
+        ),
+        "termination_by_day": crosstab(days, conversations["termination_reason"]),
+        "by_agent": by_agent,
+    }
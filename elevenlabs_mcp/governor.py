@@ -0,0 +1,353 @@
+"""
+Client-side governor for all HTTP traffic to the ElevenLabs API.
+
+Installed as the transport of the shared httpx client, so SDK calls and raw
+requests pass through it alike. Every request takes a token from the bucket
+of its endpoint family; generation requests (speech, transcription, sound,
+music) additionally hold a slot of a global semaphore sized to the account's
+concurrent-request limit, which is derived from the subscription tier. A 429
+response is not returned to the caller: the family pauses for the
+`Retry-After` period and the request is queued again, up to a retry limit.
+Queue depth, wait time and in-flight counts are kept per family.
+"""
+
+import email.utils
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterator
+
+import httpx
+
+from elevenlabs_mcp.concurrency import RateLimiter
+from elevenlabs_mcp.tracing import event
+
+logger = logging.getLogger(__name__)
+
+# Path prefix -> endpoint family; the first match wins
+FAMILIES = (
+    ("/v1/text-to-speech", "tts"),
+    ("/v1/text-to-dialogue", "tts"),
+    ("/v1/speech-to-text", "stt"),
+    ("/v1/speech-to-speech", "sts"),
+    ("/v1/sound-generation", "audio"),
+    ("/v1/audio-isolation", "audio"),
+    ("/v1/music", "audio"),
+    ("/v1/text-to-voice", "voices"),
+    ("/v1/voices", "voices"),
+    ("/v1/shared-voices", "voices"),
+    ("/v1/similar-voices", "voices"),
+    ("/v1/convai", "convai"),
+)
+# Families counted against the account's concurrent-request limit
+CONCURRENCY_FAMILIES = {"tts", "stt", "sts", "audio"}
+# Requests per second per family; bursts of twice that are allowed
+DEFAULT_RATES = {
+    "tts": 10.0,
+    "stt": 5.0,
+    "sts": 5.0,
+    "audio": 5.0,
+    "voices": 10.0,
+    "convai": 10.0,
+    "default": 10.0,
+}
+# Response extension holding the seconds the request spent upstream, queueing in the governor excluded
+UPSTREAM_SECS = "elevenlabs_mcp.upstream_secs"
+# Concurrent generation requests allowed per subscription tier
+TIER_CONCURRENCY = {
+    "free": 2,
+    "starter": 3,
+    "creator": 5,
+    "pro": 10,
+    "scale": 15,
+    "business": 15,
+    "growing_business": 15,
+    "enterprise": 15,
+}
+# Used until the tier is known, and for tiers missing above
+DEFAULT_CONCURRENCY = 2
+MAX_RETRIES = 6
+MAX_RETRY_AFTER_SECS = 60.0
+
+
+def load_rates() -> dict[str, float]:
+    """DEFAULT_RATES overridden by ELEVENLABS_MCP_RATE_LIMITS, a JSON object of family -> requests per second (0 disables)."""
+    rates = dict(DEFAULT_RATES)
+    overrides = os.environ.get("ELEVENLABS_MCP_RATE_LIMITS")
+    if overrides:
+        try:
+            rates.update({key: float(value) for key, value in json.loads(overrides).items()})
+        except (ValueError, TypeError, AttributeError):
+            logger.warning("Ignoring invalid ELEVENLABS_MCP_RATE_LIMITS: %s", overrides)
+    return rates
+
+
+def endpoint_family(path: str) -> str:
+    for prefix, family in FAMILIES:
+        if path.startswith(prefix):
+            return family
+    return "default"
+
+
+def retry_after_secs(response: httpx.Response, attempt: int) -> float:
+    """Delay requested by a 429 response, or exponential backoff if it gives none."""
+    value = response.headers.get("retry-after")
+    if value:
+        try:
+            return min(max(float(value), 0.0), MAX_RETRY_AFTER_SECS)
+        except ValueError:
+            try:
+                delay = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+                return min(max(delay, 0.0), MAX_RETRY_AFTER_SECS)
+            except (TypeError, ValueError):
+                pass
+    return min(0.5 * 2**attempt, MAX_RETRY_AFTER_SECS)
+
+
+class ConcurrencyLimit:
+    """Counting semaphore whose limit can change while it is in use."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify()
+
+    def resize(self, limit: int) -> None:
+        with self._condition:
+            self.limit = max(1, limit)
+            self._condition.notify_all()
+
+
+class FamilyStats:
+    def __init__(self):
+        self.requests = 0
+        self.throttled = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.in_flight = 0
+        self.wait_secs = 0.0
+        self.max_wait_secs = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "throttled_429": self.throttled,
+            "queue_depth": self.queued,
+            "max_queue_depth": self.max_queued,
+            "in_flight": self.in_flight,
+            "avg_wait_secs": round(self.wait_secs / self.requests, 3) if self.requests else 0.0,
+            "max_wait_secs": round(self.max_wait_secs, 3),
+        }
+
+
+class Governor:
+    def __init__(
+        self,
+        rates: dict[str, float] | None = None,
+        concurrency: int | None = None,
+        max_retries: int = MAX_RETRIES,
+    ):
+        rates = rates if rates is not None else load_rates()
+        self.max_retries = max_retries
+        self._buckets = {
+            family: RateLimiter(rate, burst=max(1, int(rate * 2)))
+            for family, rate in rates.items()
+        }
+        self._default_bucket = self._buckets.setdefault("default", RateLimiter(None))
+        override = os.environ.get("ELEVENLABS_MCP_MAX_CONCURRENCY")
+        # An explicit limit is never replaced by the tier lookup
+        self._fixed = concurrency is not None or bool(override and override.isdigit())
+        self.tier: str | None = None
+        self.concurrency = ConcurrencyLimit(
+            concurrency if concurrency is not None else int(override) if self._fixed else DEFAULT_CONCURRENCY
+        )
+        self._paused_until: dict[str, float] = {}
+        self._stats: dict[str, FamilyStats] = {}
+        self._lock = threading.Lock()
+
+    def size_for_tier(self, tier: str | None) -> None:
+        """Set the concurrency limit from a subscription tier name."""
+        self.tier = tier
+        if self._fixed:
+            return
+        limit = TIER_CONCURRENCY.get((tier or "").lower(), DEFAULT_CONCURRENCY)
+        self.concurrency.resize(limit)
+        logger.info("API concurrency limit set to %d for tier %s", limit, tier)
+
+    def size_in_background(self, fetch_tier: Callable[[], str | None]) -> None:
+        """Look up the tier on a daemon thread; requests meanwhile use the default limit."""
+
+        def run():
+            try:
+                self.size_for_tier(fetch_tier())
+            except Exception as e:
+                logger.warning("Could not size API concurrency from subscription: %s", e)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _family_stats(self, family: str) -> FamilyStats:
+        stats = self._stats.get(family)
+        if stats is None:
+            stats = self._stats.setdefault(family, FamilyStats())
+        return stats
+
+    def _wait_turn(self, family: str) -> None:
+        """Block until `family` may send: past any 429 pause, a rate token, and a concurrency slot."""
+        while True:
+            with self._lock:
+                pause = self._paused_until.get(family, 0.0) - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+        self._buckets.get(family, self._default_bucket).acquire()
+        if family in CONCURRENCY_FAMILIES:
+            self.concurrency.acquire()
+
+    def _release(self, family: str) -> None:
+        if family in CONCURRENCY_FAMILIES:
+            self.concurrency.release()
+        with self._lock:
+            self._family_stats(family).in_flight -= 1
+
+    def _pause(self, family: str, delay: float) -> None:
+        with self._lock:
+            until = time.monotonic() + delay
+            self._paused_until[family] = max(self._paused_until.get(family, 0.0), until)
+            self._family_stats(family).throttled += 1
+
+    def send(self, request: httpx.Request, send: Callable[[httpx.Request], httpx.Response]) -> httpx.Response:
+        """Send `request` through `send` once allowed, retrying 429 responses after their delay."""
+        family = endpoint_family(request.url.path)
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            with self._lock:
+                stats = self._family_stats(family)
+                stats.queued += 1
+                stats.max_queued = max(stats.max_queued, stats.queued)
+            try:
+                self._wait_turn(family)
+            finally:
+                with self._lock:
+                    stats.queued -= 1
+            waited = time.monotonic() - started
+            if waited >= 0.001:
+                event("governor.wait", family=family, wait_secs=round(waited, 3))
+            with self._lock:
+                stats.requests += 1
+                stats.in_flight += 1
+                stats.wait_secs += waited
+                stats.max_wait_secs = max(stats.max_wait_secs, waited)
+
+            try:
+                response = send(request)
+            except BaseException:
+                self._release(family)
+                raise
+            if response.status_code != 429 or attempt >= self.max_retries:
+                return httpx.Response(
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    stream=_ReleasingStream(response.stream, lambda: self._release(family)),
+                    extensions=response.extensions,
+                )
+
+            # Keep the body so the 429 can still be returned if the request cannot be replayed
+            response.read()
+            response.close()
+            self._release(family)
+            delay = retry_after_secs(response, attempt)
+            self._pause(family, delay)
+            event("governor.throttled", family=family, retry_after_secs=delay, attempt=attempt + 1)
+            logger.info("429 from %s, retrying in %.1fs (attempt %d)", request.url.path, delay, attempt + 1)
+            attempt += 1
+            if not replayable(request):
+                return httpx.Response(
+                    status_code=429, headers=response.headers, content=response.content
+                )
+
+    def status(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "tier": self.tier,
+                "concurrency_limit": self.concurrency.limit,
+                "concurrency_in_flight": self.concurrency.in_flight,
+                "families": {family: stats.as_dict() for family, stats in sorted(self._stats.items())},
+                "paused": {
+                    family: round(until - now, 1)
+                    for family, until in self._paused_until.items()
+                    if until > now
+                },
+            }
+
+
+def replayable(request: httpx.Request) -> bool:
+    """Whether the request body can be sent again (bytes and multipart can; one-shot iterators cannot)."""
+    return isinstance(request.stream, (httpx.ByteStream, httpx._multipart.MultipartStream))
+
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees the request's governor slot once it is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._released:
+                self._released = True
+                self._release()
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """httpx transport routing every request through a Governor."""
+
+    def __init__(self, governor: Governor, transport: httpx.BaseTransport | None = None):
+        self.governor = governor
+        self._transport = transport
+        # A transport passed in, like a cassette, may be shared by several governors
+        self._owns_transport = transport is None
+        self._lock = threading.Lock()
+
+    @property
+    def transport(self) -> httpx.BaseTransport:
+        # Built on first request: loading the TLS certificates is a large part of startup
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    self._transport = httpx.HTTPTransport()
+        return self._transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.governor.send(request, self._send)
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+        response.extensions[UPSTREAM_SECS] = time.monotonic() - started
+        return response
+
+    def close(self) -> None:
+        if self._owns_transport and self._transport is not None:
+            self._transport.close()
@@ -0,0 +1,130 @@
+"""
+Access control for the HTTP transports.
+
+Over HTTP anyone who can reach the port could otherwise spend the server's
+API key and use its file tools, so:
+
+- binding anything but a loopback address needs a bearer token
+  (ELEVENLABS_MCP_AUTH_TOKEN), checked on every request by AccessMiddleware;
+- with client keys enabled (ELEVENLABS_MCP_CLIENT_KEYS=1 or --client-keys),
+  a request may instead carry its own API key in `xi-api-key` and runs as
+  that key, with its files confined to a directory of its own; a request
+  with neither is refused, so the server's key is never used implicitly;
+- Host and Origin headers are always validated (DNS rebinding protection),
+  against the loopback names, the bind address and the names listed in
+  ELEVENLABS_MCP_ALLOWED_HOSTS or --allowed-hosts.
+"""
+
+import hmac
+import json
+import os
+
+from mcp.server.transport_security import TransportSecuritySettings
+
+AUTH_TOKEN_ENV = "ELEVENLABS_MCP_AUTH_TOKEN"
+CLIENT_KEYS_ENV = "ELEVENLABS_MCP_CLIENT_KEYS"
+# Same header as key_pool.API_KEY_HEADER, as ASGI spells it
+API_KEY_HEADER = b"xi-api-key"
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+WILDCARD_HOSTS = ("0.0.0.0", "::", "")
+
+
+def auth_token() -> str | None:
+    return os.environ.get(AUTH_TOKEN_ENV, "").strip() or None
+
+
+def client_keys_enabled() -> bool:
+    return os.environ.get(CLIENT_KEYS_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def parse_hosts(value: str | None) -> list[str]:
+    return [host.strip() for host in (value or "").split(",") if host.strip()]
+
+
+def check_bind(host: str, token: str | None, allowed_hosts: list[str]) -> None:
+    """Raise ValueError when serving on `host` would expose the server unprotected."""
+    if host in LOOPBACK_HOSTS:
+        return
+    if not token:
+        raise ValueError(
+            f"Serving on {host or 'all interfaces'} needs {AUTH_TOKEN_ENV} set to a bearer token clients must send"
+        )
+    if host in WILDCARD_HOSTS and not allowed_hosts:
+        raise ValueError(
+            f"Serving on {host or 'all interfaces'} needs --allowed-hosts (or ELEVENLABS_MCP_ALLOWED_HOSTS) "
+            "listing the names clients use to reach the server"
+        )
+
+
+def _bracketed(host: str) -> str:
+    return f"[{host}]" if ":" in host and not host.startswith("[") else host
+
+
+def transport_security(host: str, allowed_hosts: list[str]) -> TransportSecuritySettings:
+    """DNS rebinding protection allowing the loopback names, `host` and `allowed_hosts`."""
+    names = [*LOOPBACK_HOSTS, *allowed_hosts]
+    if host not in WILDCARD_HOSTS:
+        names.append(host)
+    hosts: list[str] = []
+    origins: list[str] = []
+    for name in dict.fromkeys(names):
+        name = _bracketed(name)
+        # An entry with a port allows only that port, one without allows any
+        patterns = [name] if name.rsplit("]", 1)[-1].count(":") else [name, f"{name}:*"]
+        hosts += patterns
+        origins += [f"{scheme}://{pattern}" for pattern in patterns for scheme in ("http", "https")]
+    return TransportSecuritySettings(
+        enable_dns_rebinding_protection=True, allowed_hosts=hosts, allowed_origins=origins
+    )
+
+
+class AccessMiddleware:
+    """
+    ASGI middleware admitting HTTP requests that carry the bearer `token`, or
+    their own API key when `client_keys` is set.
+
+    Without a token (loopback only) and without client keys, every request
+    is admitted and runs as the server's key, as over stdio.
+    """
+
+    def __init__(self, app, token: str | None, client_keys: bool = False):
+        self.app = app
+        self.client_keys = client_keys
+        self._expected = f"Bearer {token}".encode() if token else None
+
+    def check(self, headers: dict[bytes, bytes]) -> tuple[int, str] | None:
+        """(status, message) refusing a request with these headers, or None to admit it."""
+        if headers.get(API_KEY_HEADER, b"").strip():
+            if self.client_keys:
+                return None
+            return 403, "This server does not accept client API keys; unset the xi-api-key header"
+        if self._expected is not None:
+            if hmac.compare_digest(headers.get(b"authorization", b""), self._expected):
+                return None
+            return 401, "Missing or invalid bearer token"
+        if self.client_keys:
+            return 401, "Send your ElevenLabs API key in the xi-api-key header"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        refusal = self.check(dict(scope["headers"]))
+        if refusal is None:
+            await self.app(scope, receive, send)
+            return
+        status, message = refusal
+        body = json.dumps({"error": "unauthorized" if status == 401 else "forbidden", "message": message}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"www-authenticate", b"Bearer"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
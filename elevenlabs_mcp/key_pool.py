@@ -0,0 +1,143 @@
+"""
+Per-API-key clients, for serving several ElevenLabs accounts from one server.
+
+The server's own key (ELEVENLABS_API_KEY) is the default. Over HTTP with
+client keys enabled (see http_auth.py), a client sends its own key in the
+`xi-api-key` header, the header the ElevenLabs API itself uses; MCP clients
+send their configured headers with every request of a session. Its tools
+read and write files only below a directory of its own in the data dir. Each distinct key gets a tenant with its own
+httpx client and transport stack (so its calls reuse connections), SDK
+client, governor (rate limits and concurrency sized to its own
+subscription), response cache namespace, request coalescing and voice
+catalog. Nothing a tenant fetched is ever served to another key.
+
+Tenants live in an LRU pool of ELEVENLABS_MCP_MAX_KEYS (32 default) besides
+the default one; an evicted tenant is closed once its last call finishes.
+The tenant of the running call is held in a context variable, which
+the tool executor and `map_concurrent` carry into worker threads.
+"""
+
+import contextvars
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from elevenlabs_mcp.cache import TTLCache
+from elevenlabs_mcp.governor import Governor
+from elevenlabs_mcp.retry import RetryingTransport
+from elevenlabs_mcp.singleflight import SingleFlight
+from elevenlabs_mcp.voice_catalog import VoiceCatalog
+
+logger = logging.getLogger(__name__)
+
+API_KEY_HEADER = "xi-api-key"
+DEFAULT_MAX_KEYS = 32
+
+
+@dataclass
+class Tenant:
+    api_key: str
+    fingerprint: str
+    governor: Governor
+    transport: RetryingTransport
+    http: httpx.Client
+    # ElevenLabs SDK client, built on first use
+    client: Any
+    flights: SingleFlight
+    cache: TTLCache
+    voice_catalog: VoiceCatalog
+    # Calls running under this tenant, and whether the pool evicted it
+    active: int = field(default=0, repr=False)
+    retired: bool = field(default=False, repr=False)
+
+    def close(self) -> None:
+        self.http.close()
+
+
+_current: contextvars.ContextVar[Tenant | None] = contextvars.ContextVar(
+    "elevenlabs_mcp_tenant", default=None
+)
+
+
+def max_keys_from_env() -> int:
+    value = os.environ.get("ELEVENLABS_MCP_MAX_KEYS", "")
+    if value.isdigit() and int(value) > 0:
+        return int(value)
+    if value:
+        logger.warning("Ignoring invalid ELEVENLABS_MCP_MAX_KEYS: %s", value)
+    return DEFAULT_MAX_KEYS
+
+
+class KeyPool:
+    """LRU pool of tenants built by `build`, plus the `default` tenant, which is never evicted."""
+
+    def __init__(self, build: Callable[[str], Tenant], default: Tenant, max_keys: int | None = None):
+        self.build = build
+        self.max_keys = max_keys if max_keys is not None else max_keys_from_env()
+        self.default = default
+        self.stats = {"built": 0, "evicted": 0}
+        self._tenants: OrderedDict[str, Tenant] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, api_key: str | None) -> Tenant:
+        # Called with the lock held
+        if not api_key or api_key == self.default.api_key:
+            return self.default
+        tenant = self._tenants.get(api_key)
+        if tenant is not None:
+            self._tenants.move_to_end(api_key)
+            return tenant
+        # Cheap: the SDK client and the connection pool are built on first request
+        tenant = self._tenants[api_key] = self.build(api_key)
+        self.stats["built"] += 1
+        while len(self._tenants) > self.max_keys:
+            _, evicted = self._tenants.popitem(last=False)
+            self.stats["evicted"] += 1
+            evicted.retired = True
+            if not evicted.active:
+                evicted.close()
+        return tenant
+
+    def get(self, api_key: str | None) -> Tenant:
+        """The tenant of `api_key`, or the default one when it is empty."""
+        with self._lock:
+            return self._get(api_key)
+
+    @contextmanager
+    def use(self, api_key: str | None) -> Iterator[Tenant]:
+        """Run the enclosed code, and whatever it hands to worker threads, as the tenant of `api_key`."""
+        with self._lock:
+            tenant = self._get(api_key)
+            tenant.active += 1
+        token = _current.set(tenant)
+        try:
+            yield tenant
+        finally:
+            _current.reset(token)
+            with self._lock:
+                tenant.active -= 1
+                close = tenant.retired and not tenant.active
+            if close:
+                tenant.close()
+
+    def current(self) -> Tenant:
+        """The tenant of the running call; the default one outside any call."""
+        return _current.get() or self.default
+
+    def status(self) -> dict:
+        with self._lock:
+            return {"keys": len(self._tenants) + 1, "max_keys": self.max_keys, **self.stats}
+
+
+def request_api_key(request: Any) -> str | None:
+    """The key sent in the `xi-api-key` header of an HTTP request, if any."""
+    headers = getattr(request, "headers", None)
+    if headers is None:
+        return None
+    return (headers.get(API_KEY_HEADER) or "").strip() or None
@@ -0,0 +1,281 @@
+"""
+Knowledge-base document uploads and agent attachment.
+
+Documents are described as dicts with a `name` and exactly one of `url`,
+`file_path` or `text`. Uploads can run concurrently; attaching them to an
+agent is a single get/update round trip no matter how many documents.
+
+A local index maps the SHA-256 of each uploaded document's content (file
+bytes, text, or normalized URL) to the document ID the API returned, so the
+same policy document attached to many agents is uploaded and indexed once.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+from elevenlabs_mcp.concurrency import map_concurrent
+from elevenlabs_mcp.utils import ElevenLabsMcpError, get_data_dir
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form for hashing: lowercase scheme/host, no default port, fragment or trailing slash, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (
+        (scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)
+    ):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def content_hash(document: dict) -> str:
+    digest = hashlib.sha256()
+    if document.get("url") is not None:
+        digest.update(b"url\0" + normalize_url(document["url"]).encode("utf-8"))
+    elif document.get("text") is not None:
+        digest.update(b"text\0" + document["text"].encode("utf-8"))
+    else:
+        digest.update(b"file\0")
+        with open(document["file_path"], "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentHashIndex:
+    """SQLite map of (API key fingerprint, content hash) to uploaded document ID."""
+
+    def __init__(self, path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS kb_documents (
+                   scope TEXT NOT NULL,
+                   content_hash TEXT NOT NULL,
+                   document_id TEXT NOT NULL,
+                   type TEXT NOT NULL,
+                   source TEXT,
+                   created_at INTEGER NOT NULL,
+                   PRIMARY KEY (scope, content_hash)
+               )"""
+        )
+        self._conn.commit()
+
+    def lookup(self, scope: str, digest: str) -> tuple[str, str] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT document_id, type FROM kb_documents WHERE scope = ? AND content_hash = ?",
+                (scope, digest),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def record(self, scope: str, digest: str, document_id: str, type: str, source: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO kb_documents
+                       (scope, content_hash, document_id, type, source, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                (scope, digest, document_id, type, source, int(time.time())),
+            )
+            self._conn.commit()
+
+    def forget(self, scope: str, digest: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM kb_documents WHERE scope = ? AND content_hash = ?", (scope, digest)
+            )
+            self._conn.commit()
+
+
+_hash_index: DocumentHashIndex | None = None
+_hash_index_lock = threading.Lock()
+
+
+def get_document_hash_index() -> DocumentHashIndex:
+    global _hash_index
+    with _hash_index_lock:
+        if _hash_index is None:
+            _hash_index = DocumentHashIndex(get_data_dir() / "knowledge_base.db")
+        return _hash_index
+
+
+def upload_document(
+    client: ElevenLabs,
+    document: dict,
+    dedup: DocumentHashIndex | None = None,
+    scope: str = "",
+    digest: str | None = None,
+) -> dict:
+    """
+    Upload one document, or reuse an identical one uploaded before.
+
+    Returns {"name", "id", "type"} for the agent's locator, plus "reused".
+    Reused IDs are checked with a cheap documents.get; if the document was
+    deleted server-side the stale entry is dropped and it is uploaded again.
+    Pass `digest` when the content hash is already known to skip rehashing.
+    """
+    documents = client.conversational_ai.knowledge_base.documents
+    name = document["name"]
+    if dedup is not None:
+        digest = digest or content_hash(document)
+        known = dedup.lookup(scope, digest)
+        if known:
+            from elevenlabs.core.api_error import ApiError
+
+            try:
+                documents.get(documentation_id=known[0])
+                return {"name": name, "id": known[0], "type": known[1], "reused": True}
+            except ApiError as e:
+                # Only a document gone upstream is stale; anything else may pass
+                if e.status_code != 404:
+                    raise
+                dedup.forget(scope, digest)
+
+    locator = _create_document(documents, document)
+    if dedup is not None:
+        source = document.get("url") or document.get("file_path") or "text"
+        dedup.record(scope, digest, locator["id"], locator["type"], source)
+    return {**locator, "reused": False}
+
+
+def _create_document(documents, document: dict) -> dict:
+    name = document["name"]
+    if document.get("url") is not None:
+        response = documents.create_from_url(name=name, url=document["url"])
+        return {"name": name, "id": response.id, "type": "url"}
+
+    if document.get("text") is not None:
+        text_io = BytesIO(document["text"].encode("utf-8"))
+        text_io.name = "text.txt"
+        text_io.content_type = "text/plain"
+        response = documents.create_from_file(name=name, file=text_io)
+    else:
+        # The open file is streamed by httpx rather than read into memory first
+        with open(document["file_path"], "rb") as file:
+            response = documents.create_from_file(name=name, file=file)
+    return {"name": name, "id": response.id, "type": "file"}
+
+
+def upload_documents(
+    client: ElevenLabs,
+    documents: list[dict],
+    max_concurrency: int = 8,
+    dedup: DocumentHashIndex | None = None,
+    scope: str = "",
+) -> tuple[list[dict], list[dict]]:
+    """
+    Upload documents concurrently. Returns (uploaded locators, failures), in input order.
+
+    With `dedup`, documents are hashed first and each distinct content in the
+    batch is uploaded once; its duplicates share the locator as reused.
+    """
+    results: dict[int, dict] = {}
+    errors: dict[int, str] = {}
+    digests: dict[int, str] = {}
+    if dedup is not None:
+        for position, digest, error in map_concurrent(
+            lambda position: content_hash(documents[position]),
+            range(len(documents)),
+            max_workers=max_concurrency,
+        ):
+            if error is not None:
+                errors[position] = _error_message(error)
+            else:
+                digests[position] = digest
+
+    # Later copies of a digest wait for the first one's outcome instead of racing it
+    leaders: dict[str, int] = {}
+    duplicates: dict[int, int] = {}
+    pending = []
+    for position in range(len(documents)):
+        if position in errors:
+            continue
+        digest = digests.get(position)
+        leader = leaders.setdefault(digest, position) if digest else position
+        if leader != position:
+            duplicates[position] = leader
+        else:
+            pending.append(position)
+
+    for position, locator, error in map_concurrent(
+        lambda position: upload_document(
+            client, documents[position], dedup, scope, digests.get(position)
+        ),
+        pending,
+        max_workers=max_concurrency,
+    ):
+        if error is not None:
+            errors[position] = _error_message(error)
+        else:
+            results[position] = locator
+
+    for position, leader in duplicates.items():
+        if leader in results:
+            results[position] = {
+                **results[leader],
+                "name": documents[position]["name"],
+                "reused": True,
+            }
+        else:
+            errors[position] = errors[leader]
+
+    failures = [
+        {"name": documents[position]["name"], "error": errors[position]}
+        for position in sorted(errors)
+    ]
+    return [results[position] for position in sorted(results)], failures
+
+
+def _error_message(error: BaseException) -> str:
+    return error.message if isinstance(error, ElevenLabsMcpError) else str(error)
+
+
+def attach_documents(client: ElevenLabs, agent_id: str, locators: list[dict]) -> int:
+    """Append locators to the agent's knowledge base in one update. Returns how many were new."""
+    from elevenlabs.types.knowledge_base_locator import KnowledgeBaseLocator
+
+    agent = client.conversational_ai.agents.get(agent_id=agent_id)
+    knowledge_base = agent.conversation_config.agent.prompt.knowledge_base
+    existing_ids = {item.id for item in knowledge_base}
+    added = 0
+    for locator in locators:
+        if locator["id"] in existing_ids:
+            continue
+        knowledge_base.append(
+            KnowledgeBaseLocator(type=locator["type"], name=locator["name"], id=locator["id"])
+        )
+        existing_ids.add(locator["id"])
+        added += 1
+    if added:
+        client.conversational_ai.agents.update(
+            agent_id=agent_id, conversation_config=agent.conversation_config
+        )
+    return added
+
+
+def default_document_name(document: dict, position: int, prefix: str | None = None) -> str:
+    if document.get("url") is not None:
+        base = document["url"]
+    elif document.get("file_path") is not None:
+        base = Path(document["file_path"]).name
+    else:
+        base = f"Text {position + 1}"
+    return f"{prefix}: {base}" if prefix else base
@@ -0,0 +1,75 @@
+"""
+Incremental transcript delivery for in-progress conversations.
+
+Each caller gets a cursor per conversation recording how much of the
+transcript it has already received, so repeated polls only return turns that
+are new (or the last turn, if it kept growing) instead of the whole
+transcript every few seconds. Cursors are kept in a cache backend: in memory
+by default, or in the SQLite file the worker processes of one HTTP server
+share, so a poll answered by another worker continues where the last left
+off. Cursors untouched for a day are dropped.
+"""
+
+import threading
+import time
+
+from elevenlabs_mcp.cache import CacheBackend, MemoryBackend
+
+MAX_CURSORS = 4096
+CURSOR_TTL_SECS = 86400.0
+
+
+class TranscriptCursors:
+    """Per-(caller, conversation) delivery cursors stored in `backend`."""
+
+    def __init__(self, backend: CacheBackend | None = None, ttl_secs: float = CURSOR_TTL_SECS):
+        self.backend = backend or MemoryBackend(max_entries=MAX_CURSORS)
+        self.ttl_secs = ttl_secs
+        self._pruned_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(caller: str, conversation_id: str) -> str:
+        return f"{caller}\n{conversation_id}"
+
+    def reset(self, caller: str, conversation_id: str) -> None:
+        self.backend.delete(self._key(caller, conversation_id))
+
+    def advance(self, caller: str, conversation_id: str, transcript: list[dict]) -> list[dict]:
+        """
+        Return turns the caller has not seen yet and move its cursor to the end.
+
+        A turn that was delivered while still being spoken is returned again,
+        marked "updated", once its message has grown.
+        """
+        key = self._key(caller, conversation_id)
+        with self._lock:
+            now = time.time()
+            entry = self.backend.get(key)
+            delivered, last_length = entry[0] if entry and entry[1] >= now - self.ttl_secs else (0, 0)
+            new_turns = []
+            if 0 < delivered <= len(transcript):
+                last = transcript[delivered - 1]
+                if len(last.get("message") or "") > last_length:
+                    new_turns.append({**last, "turn_index": delivered - 1, "updated": True})
+            elif delivered > len(transcript):
+                delivered = 0
+            new_turns.extend(
+                {**turn, "turn_index": index}
+                for index, turn in enumerate(transcript[delivered:], start=delivered)
+            )
+            if transcript:
+                self.backend.set(key, [len(transcript), len(transcript[-1].get("message") or "")], now)
+            if now - self._pruned_at > self.ttl_secs / 24:
+                self._pruned_at = now
+                self.backend.prune(now - self.ttl_secs)
+            return new_turns
+
+
+def format_turn(turn: dict) -> str:
+    speaker = turn.get("role", "Unknown")
+    text = turn.get("message") or ""
+    timestamp = turn.get("time_in_call_secs", "")
+    prefix = f"[{timestamp}s] " if timestamp != "" and timestamp is not None else ""
+    suffix = " (updated)" if turn.get("updated") else ""
+    return f"{prefix}{speaker}: {text}{suffix}"
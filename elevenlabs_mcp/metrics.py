@@ -0,0 +1,607 @@
+"""
+Per-tool latency and throughput metrics.
+
+Every tool call is timed, and the time is split into upstream time (wall
+time during which at least one API request of the call was in flight, from
+the governor sending it to closing its response body), queue time (wall
+time spent with requests waiting in the governor for a rate-limit token, a
+concurrency slot or the end of a 429 pause, and none in flight) and local
+processing (the rest). Requests are metered below the retry layer: every
+attempt counts as a request, attempts after the first also count as
+retries, and the backoff between attempts is local time.
+HTTP traffic is attributed to the tool call that made it through a context
+variable, which the tool executor and `map_concurrent` carry into worker
+threads; requests made by background refreshes count towards the totals
+only. Calls are also totalled per API key (by fingerprint) when the server
+serves several. Latencies go into fixed-bucket histograms so a long-running
+server uses constant memory.
+
+Besides the `get_server_metrics` tool, metrics can be exported in the
+Prometheus text format to a file (ELEVENLABS_MCP_METRICS_FILE, for the
+node_exporter textfile collector) or served over HTTP on
+ELEVENLABS_MCP_METRICS_PORT at /metrics.
+
+Metrics are kept per process. When an HTTP server runs several workers,
+every sample is labelled with the worker's PID, each worker writes a file of
+its own beside ELEVENLABS_MCP_METRICS_FILE, and the worker that binds the
+metrics port serves the metrics of all of them, which each publishes to the
+data directory every 15 seconds.
+"""
+
+import contextvars
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterator
+
+import httpx
+
+from elevenlabs_mcp.governor import UPSTREAM_SECS
+from elevenlabs_mcp.utils import ElevenLabsMcpError, get_data_dir
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds; a final +Inf bucket catches the rest
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Response headers reporting the characters a request was billed for
+CHARACTER_HEADERS = ("character-cost", "x-character-count")
+# Set on a request once it was sent, so sending it again counts as a retry
+SENT_EXTENSION = "elevenlabs_mcp.sent"
+METRICS_FILE_INTERVAL_SECS = 15.0
+HTTP_COUNTERS = ("requests", "retries", "bytes_uploaded", "bytes_downloaded", "characters_billed")
+COUNTERS = (*HTTP_COUNTERS, "cache_hits", "cache_misses")
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(BUCKETS) if value <= bound), len(BUCKETS))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation within the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+        return self.max
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_secs": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50_secs": round(self.quantile(0.5), 4),
+            "p95_secs": round(self.quantile(0.95), 4),
+            "p99_secs": round(self.quantile(0.99), 4),
+            "max_secs": round(self.max, 4),
+        }
+
+
+def _merged(intervals: list[tuple[float, float]]) -> list[tuple[float, float]]:
+    merged: list[tuple[float, float]] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlap(a: list[tuple[float, float]], b: list[tuple[float, float]]) -> float:
+    """Length of the intersection of two merged interval lists."""
+    total = 0.0
+    i = j = 0
+    while i < len(a) and j < len(b):
+        total += max(0.0, min(a[i][1], b[j][1]) - max(a[i][0], b[j][0]))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return total
+
+
+class CallStats:
+    """What one tool call spent upstream and queued in the governor, collected while it runs."""
+
+    def __init__(self):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        # Totals of the intervals folded in while no request was open
+        self.upstream_secs = 0.0
+        self.queue_secs = 0.0
+        self._upstream: list[tuple[float, float]] = []
+        self._queue: list[tuple[float, float]] = []
+        # Open requests by token: when they entered the governor, and when they were sent
+        self._queued: dict[int, float] = {}
+        self._sent: dict[int, float] = {}
+        self._tokens = 0
+        self._lock = threading.Lock()
+
+    def request_queued(self) -> int:
+        """Mark a request entering the governor; returns its token."""
+        with self._lock:
+            self._tokens += 1
+            self._queued[self._tokens] = time.perf_counter()
+            return self._tokens
+
+    def request_sent(self, token: int, upstream_secs: float | None) -> None:
+        """
+        Mark the response of a request arriving, `upstream_secs` after the
+        governor sent it; the time before that was spent queued.
+        """
+        now = time.perf_counter()
+        with self._lock:
+            queued_at = self._queued.pop(token)
+            sent_at = queued_at if upstream_secs is None else max(queued_at, now - upstream_secs)
+            if sent_at > queued_at:
+                self._queue.append((queued_at, sent_at))
+            self._sent[token] = sent_at
+
+    def request_finished(self, token: int) -> None:
+        """Mark a request's response closed, or its sending failed."""
+        now = time.perf_counter()
+        with self._lock:
+            # A request that failed before any response counts as upstream throughout
+            started = self._sent.pop(token, None)
+            if started is None:
+                started = self._queued.pop(token)
+            self._upstream.append((started, now))
+            if not self._queued and not self._sent:
+                upstream, queue = self._times(now)
+                self.upstream_secs += upstream
+                self.queue_secs += queue
+                self._upstream.clear()
+                self._queue.clear()
+
+    def _times(self, now: float) -> tuple[float, float]:
+        # Called with the lock held
+        upstream = _merged(self._upstream + [(start, now) for start in self._sent.values()])
+        queue = _merged(self._queue + [(start, now) for start in self._queued.values()])
+        queue_secs = sum(end - start for start, end in queue) - _overlap(queue, upstream)
+        return sum(end - start for start, end in upstream), queue_secs
+
+    def add(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += amount
+
+    def total_times(self) -> tuple[float, float]:
+        """Upstream and queue time so far, including requests still open."""
+        with self._lock:
+            upstream, queue = self._times(time.perf_counter())
+            return self.upstream_secs + upstream, self.queue_secs + queue
+
+
+class ToolMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.errors: dict[str, int] = {}
+        self.total = Histogram()
+        self.upstream = Histogram()
+        self.queue = Histogram()
+        self.local = Histogram()
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def observe(
+        self, call: CallStats, elapsed: float, upstream: float, queue: float, error: BaseException | None
+    ) -> None:
+        self.calls += 1
+        self.total.observe(elapsed)
+        self.upstream.observe(upstream)
+        self.queue.observe(queue)
+        self.local.observe(elapsed - upstream - queue)
+        for counter, value in call.counters.items():
+            self.counters[counter] += value
+        if error is not None:
+            code = error_code(error)
+            self.errors[code] = self.errors.get(code, 0) + 1
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": sum(self.errors.values()),
+            "errors_by_code": dict(sorted(self.errors.items())),
+            "total": self.total.summary(),
+            "upstream": self.upstream.summary(),
+            "queue": self.queue.summary(),
+            "local": self.local.summary(),
+            **self.counters,
+        }
+
+
+_current_call: contextvars.ContextVar[CallStats | None] = contextvars.ContextVar(
+    "elevenlabs_mcp_call", default=None
+)
+
+
+def record(counter: str, amount: int = 1) -> None:
+    """Add to a counter of the tool call running in this context, if any."""
+    call = _current_call.get()
+    if call is not None:
+        call.add(counter, amount)
+
+
+def error_code(error: BaseException) -> str:
+    """The ElevenLabsMcpError code, HTTP_<status> for SDK API errors, else the exception type."""
+    if isinstance(error, ElevenLabsMcpError):
+        return error.code or "UNCODED"
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        return f"HTTP_{status}"
+    return type(error).__name__
+
+
+class Metrics:
+    def __init__(self, key_label: Callable[[], str | None] | None = None):
+        self.started_at = time.time()
+        self.tools: dict[str, ToolMetrics] = {}
+        # Label of the API key the current call runs under, for the per-key totals
+        self.key_label = key_label
+        self.keys: dict[str, ToolMetrics] = {}
+        # All traffic, including background refreshes outside any tool call
+        self.http = dict.fromkeys(HTTP_COUNTERS, 0)
+        # PID label of this process when it is one of several workers
+        self.worker: str | None = None
+        # Where the workers publish their metrics for the one serving the port
+        self.peers_dir: Path | None = None
+        self._lock = threading.Lock()
+
+    def instrument(self, fn: Callable) -> Callable:
+        """Wrap a tool function so its calls are timed; keeps the signature FastMCP inspects."""
+        name = fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                call = CallStats()
+                token = _current_call.set(call)
+                started = time.perf_counter()
+                error = None
+                try:
+                    return await fn(*args, **kwargs)
+                except BaseException as e:
+                    error = e
+                    raise
+                finally:
+                    _current_call.reset(token)
+                    self._finish(name, call, time.perf_counter() - started, error)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            call = CallStats()
+            token = _current_call.set(call)
+            started = time.perf_counter()
+            error = None
+            try:
+                return fn(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                _current_call.reset(token)
+                self._finish(name, call, time.perf_counter() - started, error)
+
+        return wrapper
+
+    def _finish(self, name: str, call: CallStats, elapsed: float, error: BaseException | None) -> None:
+        upstream, queue = call.total_times()
+        upstream = min(upstream, elapsed)
+        queue = min(queue, elapsed - upstream)
+        key = self.key_label() if self.key_label else None
+        with self._lock:
+            self.tools.setdefault(name, ToolMetrics()).observe(call, elapsed, upstream, queue, error)
+            if key is not None:
+                self.keys.setdefault(key, ToolMetrics()).observe(call, elapsed, upstream, queue, error)
+
+    def count_http(self, counter: str, amount: int = 1, call: CallStats | None = None) -> None:
+        with self._lock:
+            self.http[counter] += amount
+        if call is not None:
+            call.add(counter, amount)
+
+    def snapshot(self, tool_name: str | None = None) -> dict:
+        with self._lock:
+            tools = {
+                name: tool.as_dict()
+                for name, tool in sorted(self.tools.items())
+                if tool_name is None or name == tool_name
+            }
+            return {
+                "uptime_secs": int(time.time() - self.started_at),
+                "http": dict(self.http),
+                "tools": tools,
+                "keys": {key: metrics.as_dict() for key, metrics in sorted(self.keys.items())},
+            }
+
+    def prometheus(self, key: str | None = None) -> str:
+        """All metrics in the Prometheus text exposition format; per-key ones only for `key`, if given."""
+        lines = [
+            "# HELP elevenlabs_mcp_uptime_seconds Seconds since the server started.",
+            "# TYPE elevenlabs_mcp_uptime_seconds gauge",
+            f"elevenlabs_mcp_uptime_seconds {time.time() - self.started_at:.0f}",
+        ]
+        with self._lock:
+            keys = sorted(item for item in self.keys.items() if key is None or item[0] == key)
+            for counter, value in self.http.items():
+                metric = f"elevenlabs_mcp_http_{counter}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+
+            lines.append("# TYPE elevenlabs_mcp_tool_calls_total counter")
+            lines += [
+                f'elevenlabs_mcp_tool_calls_total{{tool="{name}"}} {tool.calls}'
+                for name, tool in sorted(self.tools.items())
+            ]
+            lines.append("# TYPE elevenlabs_mcp_tool_errors_total counter")
+            lines += [
+                f'elevenlabs_mcp_tool_errors_total{{tool="{name}",code="{code}"}} {count}'
+                for name, tool in sorted(self.tools.items())
+                for code, count in sorted(tool.errors.items())
+            ]
+            for counter in COUNTERS:
+                metric = f"elevenlabs_mcp_tool_{counter}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines += [
+                    f'{metric}{{tool="{name}"}} {tool.counters[counter]}'
+                    for name, tool in sorted(self.tools.items())
+                ]
+            for phase in ("total", "upstream", "queue", "local"):
+                metric = f"elevenlabs_mcp_tool_{phase}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for name, tool in sorted(self.tools.items()):
+                    histogram = getattr(tool, phase)
+                    cumulative = 0
+                    for bound, count in zip((*BUCKETS, "+Inf"), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{tool="{name}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{tool="{name}"}} {histogram.sum:.6f}')
+                    lines.append(f'{metric}_count{{tool="{name}"}} {histogram.count}')
+
+            lines.append("# TYPE elevenlabs_mcp_key_calls_total counter")
+            lines += [
+                f'elevenlabs_mcp_key_calls_total{{key="{key_label}"}} {metrics.calls}'
+                for key_label, metrics in keys
+            ]
+            lines.append("# TYPE elevenlabs_mcp_key_errors_total counter")
+            lines += [
+                f'elevenlabs_mcp_key_errors_total{{key="{key_label}"}} {sum(metrics.errors.values())}'
+                for key_label, metrics in keys
+            ]
+            for counter in COUNTERS:
+                metric = f"elevenlabs_mcp_key_{counter}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines += [
+                    f'{metric}{{key="{key_label}"}} {metrics.counters[counter]}'
+                    for key_label, metrics in keys
+                ]
+            lines.append("# TYPE elevenlabs_mcp_key_total_seconds histogram")
+            for key_label, metrics in keys:
+                cumulative = 0
+                for bound, count in zip((*BUCKETS, "+Inf"), metrics.total.counts):
+                    cumulative += count
+                    lines.append(f'elevenlabs_mcp_key_total_seconds_bucket{{key="{key_label}",le="{bound}"}} {cumulative}')
+                lines.append(f'elevenlabs_mcp_key_total_seconds_sum{{key="{key_label}"}} {metrics.total.sum:.6f}')
+                lines.append(f'elevenlabs_mcp_key_total_seconds_count{{key="{key_label}"}} {metrics.total.count}')
+        if self.worker:
+            lines = [_with_label(line, "worker", self.worker) for line in lines]
+        return "\n".join(lines) + "\n"
+
+    def exposition(self) -> str:
+        """Metrics of this process, merged with those the other workers published, if any."""
+        own = self.prometheus()
+        if self.peers_dir is None:
+            return own
+        texts = [own]
+        fresh_after = time.time() - 3 * METRICS_FILE_INTERVAL_SECS
+        for path in sorted(self.peers_dir.glob("*.prom")):
+            try:
+                # Files of workers that exited without cleaning up go stale
+                if path.stem != self.worker and path.stat().st_mtime >= fresh_after:
+                    texts.append(path.read_text(encoding="utf-8"))
+            except OSError:
+                continue
+        return merge_expositions(texts)
+
+    def start_exporters(self, workers: int = 1) -> None:
+        """Start the file and HTTP exporters configured in the environment, if any."""
+        if workers > 1:
+            self.worker = str(os.getpid())
+        path = os.environ.get("ELEVENLABS_MCP_METRICS_FILE")
+        if path:
+            path = Path(path)
+            if self.worker:
+                path = path.with_name(f"{path.stem}.{self.worker}{path.suffix}")
+            threading.Thread(target=self._write_file_loop, args=(path,), daemon=True).start()
+        port = os.environ.get("ELEVENLABS_MCP_METRICS_PORT")
+        if port:
+            if self.worker:
+                self.peers_dir = get_data_dir() / "metrics"
+                self.peers_dir.mkdir(parents=True, exist_ok=True)
+                published = self.peers_dir / f"{self.worker}.prom"
+                threading.Thread(target=self._write_file_loop, args=(published,), daemon=True).start()
+            try:
+                self._serve(int(port))
+            except ValueError as e:
+                logger.warning("Could not serve metrics on port %s: %s", port, e)
+            except OSError as e:
+                if self.worker:
+                    logger.debug("Metrics port %s is served by another worker", port)
+                else:
+                    logger.warning("Could not serve metrics on port %s: %s", port, e)
+
+    def write_file(self, path: Path) -> None:
+        # Written beside the target and renamed, so scrapers never read a partial file;
+        # named per process, as workers may write the same directory
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(self.prometheus(), encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _write_file_loop(self, path: Path) -> None:
+        while True:
+            try:
+                self.write_file(path)
+                if self.worker:
+                    _remove_dead_workers(path, self.worker)
+            except OSError as e:
+                logger.warning("Could not write metrics to %s: %s", path, e)
+            time.sleep(METRICS_FILE_INTERVAL_SECS)
+
+    def _serve(self, port: int) -> None:
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        # Loopback only: the metrics name tools and error codes
+        server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def _with_label(line: str, name: str, value: str) -> str:
+    """A sample line with one more label; comments are returned unchanged."""
+    if line.startswith("#"):
+        return line
+    brace, space = line.find("{"), line.find(" ")
+    if 0 <= brace < space:
+        return f'{line[:brace + 1]}{name}="{value}",{line[brace + 1:]}'
+    return f'{line[:space]}{{{name}="{value}"}}{line[space:]}'
+
+
+def merge_expositions(texts: list[str]) -> str:
+    """Several Prometheus texts as one, each metric's comments once, followed by the samples of all."""
+    comments: dict[str, list[str]] = {}
+    samples: dict[str, list[str]] = {}
+    for text in texts:
+        family = ""
+        for line in text.splitlines():
+            if line.startswith("# "):
+                parts = line.split(" ", 3)
+                family = parts[2] if len(parts) > 2 else ""
+                if line not in comments.setdefault(family, []):
+                    comments[family].append(line)
+                samples.setdefault(family, [])
+            elif line:
+                samples.setdefault(family, []).append(line)
+    lines = []
+    for family, family_samples in samples.items():
+        lines += comments.get(family, [])
+        lines += family_samples
+    return "\n".join(lines) + "\n"
+
+
+def _remove_dead_workers(path: Path, worker: str) -> None:
+    """Delete the files beside `path` written by worker processes that are gone."""
+    prefix, suffix = path.name.split(worker, 1)
+    for sibling in path.parent.glob(f"{prefix}*{suffix}"):
+        pid = sibling.name[len(prefix):len(sibling.name) - len(suffix)]
+        if not pid.isdigit() or pid == worker:
+            continue
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            sibling.unlink(missing_ok=True)
+        except OSError:
+            # Alive, under another user
+            pass
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """Response body that counts downloaded bytes and ends the request's upstream time on close."""
+
+    def __init__(self, stream: httpx.SyncByteStream, metrics: Metrics, call: CallStats | None, token: int):
+        self._stream = stream
+        self._metrics = metrics
+        self._call = call
+        self._token = token
+        self._closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._metrics.count_http("bytes_downloaded", len(chunk), self._call)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._closed:
+                self._closed = True
+                if self._call is not None:
+                    self._call.request_finished(self._token)
+
+
+class MeteredTransport(httpx.BaseTransport):
+    """
+    httpx transport between the retries and the governor: counts requests
+    (each attempt), retries (attempts after the first, hedges included),
+    bytes and billed characters per tool call, and splits each request's time
+    into queueing in the governor and upstream using UPSTREAM_SECS.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, metrics: Metrics):
+        self.transport = transport
+        self.metrics = metrics
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        call = _current_call.get()
+        self.metrics.count_http("requests", call=call)
+        if request.extensions.get(SENT_EXTENSION):
+            self.metrics.count_http("retries", call=call)
+        request.extensions[SENT_EXTENSION] = True
+        uploaded = int(request.headers.get("content-length") or 0)
+        if uploaded:
+            self.metrics.count_http("bytes_uploaded", uploaded, call)
+        token = call.request_queued() if call is not None else 0
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            if call is not None:
+                call.request_finished(token)
+            raise
+        if call is not None:
+            call.request_sent(token, response.extensions.get(UPSTREAM_SECS))
+        for header in CHARACTER_HEADERS:
+            characters = response.headers.get(header)
+            if characters and characters.isdigit():
+                self.metrics.count_http("characters_billed", int(characters), call)
+                break
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_MeteredStream(response.stream, self.metrics, call, token),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.transport.close()
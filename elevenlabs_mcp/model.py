@@ -32,3 +32,5 @@ class McpModel(BaseModel):
     id: str
     name: str
     languages: list[McpLanguage]
+    # Set when the model list was served from cache
+    cache_age_secs: Optional[int] = None
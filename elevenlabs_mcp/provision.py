@@ -0,0 +1,349 @@
+"""
+Declarative bulk agent provisioning.
+
+A spec lists agents by name using the same fields as the `create_agent` tool,
+optionally with shared `defaults`:
+
+    defaults:
+      llm: gemini-2.0-flash-001
+      voice_id: cgSgspJ2msm6clMCkdW9
+    agents:
+      - name: Tenant A support
+        system_prompt: You help Tenant A customers.
+        first_message: Hi, how can I help?
+
+Existing agents are matched by name. Each agent is created if missing,
+updated only if its live configuration differs from the spec, and otherwise
+left alone, so applying the same spec twice makes no changes. An existing
+agent is compared, and updated, only in the fields its spec entry or the
+`defaults` set; settings changed elsewhere are left alone.
+
+Run from the command line with `elevenlabs-mcp-provision spec.yaml`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from elevenlabs_mcp.concurrency import RateLimiter, map_concurrent
+from elevenlabs_mcp.convai import create_conversation_config, create_platform_settings
+from elevenlabs_mcp.utils import ElevenLabsMcpError, api_url, load_env, make_error
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+# Same defaults as the create_agent tool
+AGENT_DEFAULTS = {
+    "first_message": None,
+    "voice_id": "cgSgspJ2msm6clMCkdW9",
+    "language": "en",
+    "llm": "gemini-2.0-flash-001",
+    "temperature": 0.5,
+    "max_tokens": None,
+    "asr_quality": "high",
+    "model_id": "eleven_turbo_v2",
+    "optimize_streaming_latency": 3,
+    "stability": 0.5,
+    "similarity_boost": 0.8,
+    "turn_timeout": 7,
+    "max_duration_seconds": 300,
+    "record_voice": True,
+    "retention_days": 730,
+}
+REQUIRED_FIELDS = ("name", "system_prompt")
+AGENT_FIELDS = set(AGENT_DEFAULTS) | set(REQUIRED_FIELDS)
+# Spec field -> where desired_state() puts its value
+FIELD_PATHS = {
+    "system_prompt": "conversation_config.agent.prompt.prompt",
+    "llm": "conversation_config.agent.prompt.llm",
+    "temperature": "conversation_config.agent.prompt.temperature",
+    "max_tokens": "conversation_config.agent.prompt.max_tokens",
+    "first_message": "conversation_config.agent.first_message",
+    "language": "conversation_config.agent.language",
+    "asr_quality": "conversation_config.asr.quality",
+    "voice_id": "conversation_config.tts.voice_id",
+    "model_id": "conversation_config.tts.model_id",
+    "optimize_streaming_latency": "conversation_config.tts.optimize_streaming_latency",
+    "stability": "conversation_config.tts.stability",
+    "similarity_boost": "conversation_config.tts.similarity_boost",
+    "turn_timeout": "conversation_config.turn.turn_timeout",
+    "max_duration_seconds": "conversation_config.conversation.max_duration_seconds",
+    "record_voice": "platform_settings.privacy.record_voice",
+    "retention_days": "platform_settings.privacy.retention_days",
+}
+LIST_PAGE_SIZE = 100
+
+
+def parse_spec(text: str, yaml_format: bool | None = None) -> dict:
+    """Parse a YAML or JSON spec. JSON is tried first unless YAML is requested."""
+    if not yaml_format:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            if yaml_format is False:
+                make_error("Spec is not valid JSON", code="INVALID_SPEC")
+    try:
+        import yaml
+    except ImportError:
+        make_error(
+            "YAML specs require PyYAML",
+            code="MISSING_DEPENDENCY",
+            suggestion='Install it with `pip install "elevenlabs-mcp[yaml]"` or write the spec as JSON',
+        )
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        make_error(f"Spec is not valid YAML or JSON: {e}", code="INVALID_SPEC")
+
+
+def load_spec(path: Path) -> dict:
+    suffix = path.suffix.lower()
+    yaml_format = True if suffix in (".yaml", ".yml") else False if suffix == ".json" else None
+    return parse_spec(path.read_text(encoding="utf-8"), yaml_format)
+
+
+def resolve_agents(spec: dict) -> list[dict]:
+    """
+    Validate the spec and return one fully populated field dict per agent.
+
+    Each also lists under "spec_fields" the fields the spec sets for it.
+    """
+    if not isinstance(spec, dict) or not isinstance(spec.get("agents"), list):
+        make_error(
+            "Spec must be a mapping with an `agents` list",
+            code="INVALID_SPEC",
+            suggestion="See the provision_agents tool description for the spec format",
+        )
+    defaults = spec.get("defaults") or {}
+    unknown = set(defaults) - set(AGENT_DEFAULTS)
+    if unknown:
+        make_error(f"Unknown fields in defaults: {', '.join(sorted(unknown))}", code="INVALID_SPEC")
+
+    agents = []
+    names = set()
+    for position, entry in enumerate(spec["agents"]):
+        if not isinstance(entry, dict):
+            make_error(f"Agent #{position + 1} must be a mapping", code="INVALID_SPEC")
+        unknown = set(entry) - AGENT_FIELDS
+        if unknown:
+            make_error(
+                f"Unknown fields for agent #{position + 1}: {', '.join(sorted(unknown))}",
+                code="INVALID_SPEC",
+                suggestion=f"Allowed fields: {', '.join(sorted(AGENT_FIELDS))}",
+            )
+        missing = [field for field in REQUIRED_FIELDS if not entry.get(field)]
+        if missing:
+            make_error(
+                f"Agent #{position + 1} is missing {', '.join(missing)}", code="INVALID_SPEC"
+            )
+        if entry["name"] in names:
+            make_error(f"Agent name '{entry['name']}' appears more than once", code="INVALID_SPEC")
+        names.add(entry["name"])
+        agents.append(
+            {**AGENT_DEFAULTS, **defaults, **entry, "spec_fields": sorted((set(defaults) | set(entry)) - {"name"})}
+        )
+    return agents
+
+
+def desired_state(agent: dict) -> dict:
+    conversation_config = create_conversation_config(
+        language=agent["language"],
+        system_prompt=agent["system_prompt"],
+        llm=agent["llm"],
+        first_message=agent["first_message"],
+        temperature=agent["temperature"],
+        max_tokens=agent["max_tokens"],
+        asr_quality=agent["asr_quality"],
+        voice_id=agent["voice_id"],
+        model_id=agent["model_id"],
+        optimize_streaming_latency=agent["optimize_streaming_latency"],
+        stability=agent["stability"],
+        similarity_boost=agent["similarity_boost"],
+        turn_timeout=agent["turn_timeout"],
+        max_duration_seconds=agent["max_duration_seconds"],
+    )
+    # Documents attached later (e.g. add_knowledge_base_to_agent) are not part of the spec
+    del conversation_config["agent"]["prompt"]["knowledge_base"]
+    platform_settings = create_platform_settings(
+        record_voice=agent["record_voice"],
+        retention_days=agent["retention_days"],
+    )
+    return {"conversation_config": conversation_config, "platform_settings": platform_settings}
+
+
+_MISSING = object()
+
+
+def get_path(state: Any, path: str) -> Any:
+    """The value at dotted `path` in nested dicts, or _MISSING."""
+    for key in path.split("."):
+        if not isinstance(state, dict) or key not in state:
+            return _MISSING
+        state = state[key]
+    return state
+
+
+def managed_paths(agent: dict, state: dict) -> list[str]:
+    """Paths in `state` of the fields the spec sets; a field left out of the state (e.g. null) is skipped."""
+    paths = [FIELD_PATHS[field] for field in agent["spec_fields"] if field in FIELD_PATHS]
+    return [path for path in paths if get_path(state, path) is not _MISSING]
+
+
+def normalize(value: Any) -> Any:
+    """The API returns unset optional fields as null, empty strings or -1 alike."""
+    if value is _MISSING or value == "" or value == -1:
+        return None
+    return value
+
+
+def differences(desired: dict, actual: dict, paths: Iterable[str]) -> list[str]:
+    """Those of `paths` where the normalized values of `desired` and `actual` disagree."""
+    found = []
+    for path in paths:
+        want = normalize(get_path(desired, path))
+        have = normalize(get_path(actual, path))
+        if isinstance(want, float) and isinstance(have, (int, float)) and not isinstance(have, bool):
+            same = math.isclose(want, have, rel_tol=1e-6)
+        else:
+            same = want == have
+        if not same:
+            found.append(path)
+    return found
+
+
+def partial_state(state: dict, paths: Iterable[str]) -> dict:
+    """Only the values of `state` at `paths`, nested as in `state`."""
+    partial: dict = {}
+    for path in paths:
+        *parents, leaf = path.split(".")
+        node = partial
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = get_path(state, path)
+    return partial
+
+
+def list_agent_ids(client: ElevenLabs) -> dict[str, list[str]]:
+    """All agents on the account, as name -> agent IDs."""
+    by_name: dict[str, list[str]] = {}
+    cursor = None
+    while True:
+        page = client.conversational_ai.agents.list(page_size=LIST_PAGE_SIZE, cursor=cursor)
+        for agent in page.agents:
+            by_name.setdefault(agent.name, []).append(agent.agent_id)
+        if not page.has_more or not page.next_cursor:
+            return by_name
+        cursor = page.next_cursor
+
+
+def provision(
+    client: ElevenLabs,
+    spec: dict,
+    dry_run: bool = False,
+    max_concurrency: int = 8,
+    requests_per_second: float | None = 5.0,
+) -> dict:
+    """
+    Converge the account's agents to `spec`.
+
+    Returns a summary with per-agent results: the action taken (create,
+    update, unchanged, or error), the agent ID, and for updates which fields
+    differed.
+    """
+    agents = resolve_agents(spec)
+    existing = list_agent_ids(client)
+    limiter = RateLimiter(requests_per_second, burst=max_concurrency)
+    api = client.conversational_ai.agents
+
+    def apply(agent: dict) -> dict:
+        name = agent["name"]
+        state = desired_state(agent)
+        agent_ids = existing.get(name, [])
+        if len(agent_ids) > 1:
+            make_error(
+                f"{len(agent_ids)} existing agents are named '{name}'",
+                code="AMBIGUOUS_AGENT",
+                suggestion="Rename or delete the duplicates so each spec name matches one agent",
+            )
+        if not agent_ids:
+            if dry_run:
+                return {"name": name, "action": "create"}
+            limiter.acquire()
+            response = api.create(name=name, **state)
+            return {"name": name, "action": "create", "agent_id": response.agent_id}
+
+        agent_id = agent_ids[0]
+        limiter.acquire()
+        current = api.get(agent_id=agent_id).model_dump()
+        paths = managed_paths(agent, state)
+        changed = differences(state, current, paths)
+        if not changed:
+            return {"name": name, "action": "unchanged", "agent_id": agent_id}
+        if not dry_run:
+            limiter.acquire()
+            # A partial update: settings the spec does not set keep their live values
+            api.update(agent_id=agent_id, **partial_state(state, changed))
+        return {"name": name, "action": "update", "agent_id": agent_id, "changed": changed}
+
+    results: dict[str, dict] = {}
+    for agent, result, error in map_concurrent(apply, agents, max_workers=max_concurrency):
+        if error is not None:
+            message = error.message if isinstance(error, ElevenLabsMcpError) else str(error)
+            result = {"name": agent["name"], "action": "error", "error": message}
+        results[agent["name"]] = result
+
+    ordered = [results[agent["name"]] for agent in agents]
+    counts = {action: 0 for action in ("create", "update", "unchanged", "error")}
+    for result in ordered:
+        counts[result["action"]] += 1
+    return {"dry_run": dry_run, "agents": len(ordered), **counts, "results": ordered}
+
+
+def main(argv: list[str] | None = None) -> int:
+    load_env()
+    parser = argparse.ArgumentParser(
+        description="Create or update ElevenLabs agents from a YAML or JSON spec."
+    )
+    parser.add_argument("spec", type=Path, help="Path to the spec file")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Show what would change without applying it"
+    )
+    parser.add_argument("--max-concurrency", type=int, default=8, help="Parallel API calls (8 default)")
+    parser.add_argument(
+        "--requests-per-second", type=float, default=5.0, help="Request rate limit (5 default)"
+    )
+    parser.add_argument(
+        "--api-key",
+        help="ElevenLabs API key (alternatively, set ELEVENLABS_API_KEY environment variable)",
+    )
+    args = parser.parse_args(argv)
+
+    api_key = args.api_key or os.environ.get("ELEVENLABS_API_KEY")
+    if not api_key:
+        print("Error: ElevenLabs API key is required.", file=sys.stderr)
+        return 1
+    from elevenlabs.client import ElevenLabs
+
+    try:
+        summary = provision(
+            ElevenLabs(api_key=api_key, base_url=api_url("")),
+            load_spec(args.spec),
+            dry_run=args.dry_run,
+            max_concurrency=args.max_concurrency,
+            requests_per_second=args.requests_per_second,
+        )
+    except ElevenLabsMcpError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(summary, indent=2))
+    return 1 if summary["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
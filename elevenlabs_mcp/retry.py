@@ -0,0 +1,246 @@
+"""
+Retries and hedged requests for transient API failures.
+
+Sits in front of the governor in the shared httpx client's transport stack,
+so every attempt is rate limited and queued like a fresh request and backoff
+sleeps never hold a concurrency slot. A request is retried with exponential
+backoff and full jitter when the failure is classified as retryable. For any
+method that is a connection that never carried the request, or a 503, which
+the API sends when it did not take the request on. 500, 502 and 504
+responses, and errors after the request was sent, are retried only for
+idempotent methods, since a POST that reached the server may already have
+been billed. 429s are left to the governor.
+
+Idempotent GETs can also be hedged: once a request has been outstanding for
+longer than the recent latency percentile of its endpoint family, a second
+copy is sent and whichever answers first is used. Latencies are measured
+below the governor, so time spent queued there does not raise the threshold.
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import httpx
+
+from elevenlabs_mcp.governor import UPSTREAM_SECS, endpoint_family, replayable, retry_after_secs
+from elevenlabs_mcp.tracing import event
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Failures that mean the request never reached the API, safe to retry for any method
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Responses meaning the API did not take the request on, safe to retry for any method
+UNPROCESSED_STATUSES = {503}
+# Latencies kept per family for the hedging threshold, and the minimum before hedging starts
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 3
+    base_delay_secs: float = 0.5
+    max_delay_secs: float = 8.0
+    # Other statuses retried for idempotent methods only: the request may have been processed
+    idempotent_statuses: set[int] = field(default_factory=lambda: {500, 502, 504})
+    hedge: bool = False
+    hedge_percentile: float = 95.0
+    # Never hedge sooner than this, however fast the family usually is
+    hedge_min_delay_secs: float = 0.05
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """Defaults overridden by ELEVENLABS_MCP_MAX_RETRIES and ELEVENLABS_MCP_HEDGE (1 or a percentile)."""
+        policy = cls()
+        retries = os.environ.get("ELEVENLABS_MCP_MAX_RETRIES", "")
+        if retries.isdigit():
+            policy.max_retries = int(retries)
+        hedge = os.environ.get("ELEVENLABS_MCP_HEDGE", "").strip().lower()
+        if hedge in ("1", "true", "yes"):
+            policy.hedge = True
+        elif hedge:
+            try:
+                policy.hedge_percentile = min(max(float(hedge), 50.0), 99.9)
+                policy.hedge = True
+            except ValueError:
+                logger.warning("Ignoring invalid ELEVENLABS_MCP_HEDGE: %s", hedge)
+        return policy
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given retry number (0-based)."""
+        return random.uniform(0, min(self.max_delay_secs, self.base_delay_secs * 2**attempt))
+
+    def retryable_status(self, method: str, status: int) -> bool:
+        if status in UNPROCESSED_STATUSES:
+            return True
+        return method in IDEMPOTENT_METHODS and status in self.idempotent_statuses
+
+    def retryable_error(self, method: str, error: Exception) -> bool:
+        if isinstance(error, UNSENT_ERRORS):
+            return True
+        return method in IDEMPOTENT_METHODS and isinstance(error, httpx.TransportError)
+
+
+class RetryingTransport(httpx.BaseTransport):
+    """
+    httpx transport adding retries and, optionally, hedged GETs to `transport`.
+
+    Backoff sleeps block the sending thread, so async tools must send from a
+    worker thread, never from the event loop.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy | None = None):
+        self.transport = transport
+        self.policy = policy or RetryPolicy.from_env()
+        self.stats = {
+            "requests": 0,
+            "retries": 0,
+            "retried_errors": 0,
+            "retried_statuses": 0,
+            "gave_up": 0,
+            "hedges_sent": 0,
+            "hedge_wins": 0,
+        }
+        self._latencies: dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._hedge_pool: ThreadPoolExecutor | None = None
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _record_latency(self, family: str, secs: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(family, deque(maxlen=LATENCY_WINDOW)).append(secs)
+
+    def hedge_delay(self, family: str) -> float | None:
+        """Seconds after which a GET in `family` is hedged, or None while too few latencies are known."""
+        with self._lock:
+            samples = sorted(self._latencies.get(family, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.policy.hedge_percentile / 100))
+        return max(samples[index], self.policy.hedge_min_delay_secs)
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = self.transport.handle_request(request)
+        # Without a governor below, the whole call is upstream time
+        upstream_secs = response.extensions.get(UPSTREAM_SECS, time.monotonic() - started)
+        self._record_latency(endpoint_family(request.url.path), upstream_secs)
+        return response
+
+    def _send_hedged(self, request: httpx.Request, delay: float) -> httpx.Response:
+        """Send `request`, and a copy if no answer arrived within `delay`; return the first answer."""
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+        # In the caller's context, so the metering below attributes both sends to its tool call
+        primary = self._hedge_pool.submit(contextvars.copy_context().run, self._send, request)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count("hedges_sent")
+        event("hedge", after_secs=round(delay, 3))
+        hedge = self._hedge_pool.submit(contextvars.copy_context().run, self._send, request)
+        pending = {primary, hedge}
+        error: BaseException | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                for loser in (done | pending) - {future}:
+                    loser.add_done_callback(_close_response)
+                if future is hedge:
+                    self._count("hedge_wins")
+                return future.result()
+        raise error
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        method = request.method.upper()
+        self._count("requests")
+        attempt = 0
+        while True:
+            try:
+                delay = self.hedge_delay(endpoint_family(request.url.path)) if (
+                    self.policy.hedge and method == "GET"
+                ) else None
+                if delay is not None:
+                    response = self._send_hedged(request, delay)
+                else:
+                    response = self._send(request)
+            except Exception as e:
+                if (
+                    attempt >= self.policy.max_retries
+                    or not self.policy.retryable_error(method, e)
+                    or not replayable(request)
+                ):
+                    if attempt:
+                        self._count("gave_up")
+                    raise
+                self._count("retried_errors")
+                wait_secs = self.policy.backoff(attempt)
+                logger.info("%s %s failed (%s), retrying in %.2fs", method, request.url.path, e, wait_secs)
+                event("retry", reason=type(e).__name__, attempt=attempt + 1, delay_secs=round(wait_secs, 3))
+            else:
+                if not self.policy.retryable_status(method, response.status_code):
+                    return response
+                if attempt >= self.policy.max_retries or not replayable(request):
+                    self._count("gave_up")
+                    return response
+                self._count("retried_statuses")
+                # A 503 may say when to come back
+                wait_secs = (
+                    retry_after_secs(response, attempt)
+                    if "retry-after" in response.headers
+                    else self.policy.backoff(attempt)
+                )
+                response.close()
+                logger.info(
+                    "%s %s returned %d, retrying in %.2fs",
+                    method, request.url.path, response.status_code, wait_secs,
+                )
+                event("retry", reason=f"HTTP {response.status_code}", attempt=attempt + 1, delay_secs=round(wait_secs, 3))
+            self._count("retries")
+            attempt += 1
+            time.sleep(wait_secs)
+
+    def close(self) -> None:
+        if self._hedge_pool is not None:
+            self._hedge_pool.shutdown(wait=False)
+        self.transport.close()
+
+
+def disable_sdk_retries(client) -> None:
+    """
+    Turn off the ElevenLabs SDK client's own retry loop, which resends any
+    request, POSTs included, after a 5xx, 408, 409 or 429. RetryingTransport
+    and the governor below it already retry what is safe to retry.
+    """
+    http_client = getattr(getattr(client, "_client_wrapper", None), "httpx_client", None)
+    if http_client is None:
+        logger.warning("Could not turn off the SDK's retries: unknown client layout")
+        return
+    request = http_client.request
+
+    def request_once(*args, request_options=None, **kwargs):
+        return request(*args, request_options={"max_retries": 0, **(request_options or {})}, **kwargs)
+
+    http_client.request = request_once
+
+
+def _close_response(future: Future) -> None:
+    """Release the connection of a hedged request that lost the race."""
+    if future.exception() is None:
+        future.result().close()
@@ -11,33 +11,84 @@ Each tool that makes an API call is marked with a cost warning. Please follow th
 Tools without cost warnings in their description are free to use as they only read existing data.
 """
 
+import argparse
 import httpx
+import json
 import os
-import base64
 import asyncio
+import contextvars
+import functools
+import inspect
 import time
 import re
+import tempfile
+import threading
+from contextlib import ExitStack
 from datetime import datetime
-from io import BytesIO
+from pathlib import Path
 from typing import Literal
-from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from mcp.types import TextContent
-from elevenlabs.client import ElevenLabs
 from elevenlabs_mcp.model import McpVoice, McpModel, McpLanguage
 from elevenlabs_mcp.utils import (
+    ElevenLabsMcpError,
+    api_url,
     make_error,
+    make_api_error,
+    make_status_error,
     make_output_path,
     make_output_file,
     handle_input_file,
+    parse_timestamp,
+    format_timestamp,
+    key_fingerprint,
+    get_data_dir,
+    load_env,
+    confine_paths,
+    confined,
+    path_root,
 )
+from elevenlabs_mcp.conversation_index import get_conversation_index
+from elevenlabs_mcp.conversation_export import (
+    export_conversations as export_conversation_records,
+    fetch_conversation,
+)
+from elevenlabs_mcp.live_transcript import TranscriptCursors, format_turn
+from elevenlabs_mcp.transcript_search import get_transcript_store
 from elevenlabs_mcp.convai import create_conversation_config, create_platform_settings
-from elevenlabs.types.knowledge_base_locator import KnowledgeBaseLocator
+from elevenlabs_mcp.campaign import run_campaign
+from elevenlabs_mcp.cache import TTLCache, backend_from_env as cache_backend_from_env
+from elevenlabs_mcp.cassette import cassette_from_env
+from elevenlabs_mcp.governor import Governor, GovernedTransport
+from elevenlabs_mcp.http_auth import (
+    CLIENT_KEYS_ENV,
+    AccessMiddleware,
+    auth_token,
+    check_bind,
+    client_keys_enabled,
+    parse_hosts,
+    transport_security,
+)
+from elevenlabs_mcp.key_pool import KeyPool, Tenant, request_api_key
+from elevenlabs_mcp.metrics import Metrics, MeteredTransport
+from elevenlabs_mcp.retry import RetryingTransport, disable_sdk_retries
+from elevenlabs_mcp.singleflight import SingleFlight
+from elevenlabs_mcp.concurrency import FairExecutor
+from elevenlabs_mcp.tracing import TracedTransport, configure_from_env, event, span
+from elevenlabs_mcp.voice_catalog import VoiceCatalog
+from elevenlabs_mcp.voice_design import design_voices, write_base64
+from elevenlabs_mcp.provision import load_spec, parse_spec, provision
+from elevenlabs_mcp.knowledge_base import (
+    attach_documents,
+    default_document_name,
+    get_document_hash_index,
+    upload_document,
+    upload_documents,
+)
 
-from elevenlabs import play
 from elevenlabs_mcp import __version__
 
-load_dotenv()
+load_env()
 api_key = os.getenv("ELEVENLABS_API_KEY")
 base_path = os.getenv("ELEVENLABS_MCP_BASE_PATH")
 DEFAULT_VOICE_ID = "cgSgspJ2msm6clMCkdW9"
@@ -133,22 +184,203 @@ def calculate_dialogue_timeout(inputs):
     
     # Cap at 5 minutes but warn if close
     if timeout > 240:
-        print(f"Complex dialogue detected. Processing may take up to {timeout//60} minutes...")
+        event("dialogue.long_timeout", timeout_secs=timeout)
     
     return min(timeout, 300)  # Max 5 minutes
 
 if not api_key:
     raise ValueError("ELEVENLABS_API_KEY environment variable is required")
 
-# Add custom client to ElevenLabs to set User-Agent header
-custom_client = httpx.Client(
-    headers={
-        "User-Agent": f"ElevenLabs-MCP/{__version__}",
-    }
-)
+api_cassette = cassette_from_env()
+tracer = configure_from_env()
+# Shared by every API key; cache entries are namespaced by key. In memory by default, in SQLite
+# when HTTP workers share it
+api_cache_backend = cache_backend_from_env(get_data_dir() / f"cache_{key_fingerprint(api_key)}.sqlite")
+transcript_cursors = TranscriptCursors(cache_backend_from_env(get_data_dir() / "transcript_cursors.sqlite"))
+
+
+class _LazyClient:
+    """Stands in for the ElevenLabs SDK client, importing and building it on first use."""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from elevenlabs.client import ElevenLabs
+
+                    client = ElevenLabs(**self._kwargs)
+                    disable_sdk_retries(client)
+                    self._client = client
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+
+def build_tenant(key: str) -> Tenant:
+    """Clients, governor, cache and voice catalog for one API key."""
+    # Every API request, SDK or raw, is traced, retried on transient failures, metered per attempt
+    # and rate limited by the key's governor; below that it goes to the network, or to a cassette
+    # when one is configured
+    governor = Governor()
+    transport = RetryingTransport(MeteredTransport(GovernedTransport(governor, api_cassette), server_metrics))
+    # Add custom client to ElevenLabs to set User-Agent header
+    http = httpx.Client(
+        headers={
+            "User-Agent": f"ElevenLabs-MCP/{__version__}",
+        },
+        transport=TracedTransport(transport, tracer),
+    )
+    fingerprint = key_fingerprint(key)
+    # The SDK takes a noticeable share of startup, and each session starts a fresh server
+    client = _LazyClient(api_key=key, base_url=api_url(""), httpx_client=http)
+    # Shared by the cache and direct reads so identical concurrent requests make one call
+    flights = SingleFlight()
+    return Tenant(
+        api_key=key,
+        fingerprint=fingerprint,
+        governor=governor,
+        transport=transport,
+        http=http,
+        client=client,
+        flights=flights,
+        cache=TTLCache(backend=api_cache_backend, singleflight=flights, namespace=f"{fingerprint}/"),
+        voice_catalog=VoiceCatalog(client, get_data_dir() / f"voices_{fingerprint}.json"),
+    )
+
+
+def subscription_tier(tenant: Tenant) -> str | None:
+    return tenant.cache.fetch(
+        "subscription", lambda: tenant.client.user.subscription.get().model_dump(mode="json")
+    ).value.get("tier")
+
+
+def build_client_tenant(key: str) -> Tenant:
+    """Tenant of a key sent by a client, its governor sized from that key's own subscription."""
+    tenant = build_tenant(key)
+    tenant.governor.size_in_background(lambda: subscription_tier(tenant))
+    return tenant
+
+
+def _current_key_label():
+    return key_pool.current().fingerprint
+
+
+server_metrics = Metrics(key_label=_current_key_label)
+key_pool = KeyPool(build_client_tenant, build_tenant(api_key))
+
+
+class _Current:
+    """Stands in for an attribute of the tenant of the running call (see key_pool.py)."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(key_pool.current(), self._name), attr)
+
+
+client = _Current("client")
+custom_client = _Current("http")
+api_governor = _Current("governor")
+api_transport = _Current("transport")
+api_flights = _Current("flights")
+api_cache = _Current("cache")
+voice_catalog = _Current("voice_catalog")
+_shared_voice_library = None
+_shared_voice_library_lock = threading.Lock()
+# Sync tools run here rather than on the event loop, where one slow call would hold up every
+# session; API keys take turns, so one key's burst cannot starve the others
+tool_executor = FairExecutor(int(os.getenv("ELEVENLABS_MCP_TOOL_THREADS", "32")), thread_name_prefix="tool")
+
+
+def current_api_key() -> str:
+    return key_pool.current().api_key
+
+
+def current_scope() -> str | None:
+    """Fingerprint naming the local indexes of the current key; None for the server's own key."""
+    tenant = key_pool.current()
+    return None if tenant is key_pool.default else tenant.fingerprint
+
+
+async def in_tool_thread(fn, *args, **kwargs):
+    """
+    Run sync `fn` on tool_executor, queued under the current key, with the
+    caller's context variables. Async tools use this for blocking work
+    instead of asyncio.to_thread, so it takes turns with other keys' calls.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.wrap_future(
+        tool_executor.submit(key_pool.current().fingerprint, context.run, fn, *args, **kwargs)
+    )
+
+
+def _off_event_loop(fn):
+    """Async wrapper running sync `fn` through in_tool_thread."""
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await in_tool_thread(fn, *args, **kwargs)
+
+    return wrapper
+
+
+class _InstrumentedFastMCP(FastMCP):
+    """
+    FastMCP whose tools run as the API key of the request, are timed by
+    server_metrics, traced as root spans and kept off the event loop.
+    """
+
+    def _request_api_key(self) -> str | None:
+        if not client_keys_enabled():
+            return None
+        try:
+            return request_api_key(self.get_context().request_context.request)
+        except ValueError:
+            # Called outside a request, e.g. directly through call_tool
+            return None
+
+    def add_tool(self, fn, *args, **kwargs):
+        fn = server_metrics.instrument(tracer.instrument(fn))
+        if not inspect.iscoroutinefunction(fn):
+            fn = _off_event_loop(fn)
+        instrumented = fn
+
+        @functools.wraps(instrumented)
+        async def tool(*call_args, **call_kwargs):
+            with key_pool.use(self._request_api_key()) as tenant:
+                # Another key's files stay in a directory of its own
+                root = None if tenant is key_pool.default else tenant_files_dir(tenant)
+                with confine_paths(root):
+                    return await instrumented(*call_args, **call_kwargs)
+
+        super().add_tool(tool, *args, **kwargs)
+
+
+def tenant_files_dir(tenant: Tenant) -> Path:
+    """Where the tools of a client key read and write files."""
+    return get_data_dir() / "tenants" / tenant.fingerprint / "files"
+
+
+mcp = _InstrumentedFastMCP("ElevenLabs")
+
+
+def get_shared_voice_library():
+    """Shared voice library cache, created on first use so NumPy stays out of startup."""
+    global _shared_voice_library
+    from elevenlabs_mcp.shared_voice_library import SharedVoiceLibrary
 
-client = ElevenLabs(api_key=api_key, httpx_client=custom_client)
-mcp = FastMCP("ElevenLabs")
+    with _shared_voice_library_lock:
+        if _shared_voice_library is None:
+            # Public voices, the same for every key: fetched with the server's own
+            _shared_voice_library = SharedVoiceLibrary(key_pool.default.client)
+        return _shared_voice_library
 
 
 @mcp.tool(
@@ -201,12 +433,15 @@ def text_to_speech(
     if voice_id is not None and voice_name is not None:
         make_error("voice_id and voice_name cannot both be provided.")
 
-    voice = None
-    if voice_id is not None:
-        try:
-            voice = client.voices.get(voice_id=voice_id)
-        except:
-            make_error(f"""Voice ID '{voice_id}' not found!
+    with span("voice.resolve") as resolve_span:
+        voice = None
+        if voice_id is not None:
+            try:
+                voice = api_flights.do(
+                    ("voices.get", voice_id), lambda: client.voices.get(voice_id=voice_id)
+                )
+            except:
+                make_error(f"""Voice ID '{voice_id}' not found!
             
 💡 TIP: Use search_voices() first to get valid voice IDs.
 Example: search_voices() → Returns list with IDs → Use the ID in text_to_speech
@@ -218,33 +453,36 @@ Common voice IDs:
 - Brian: nPczCjzI2devNBz1zQrb
 - Rachel: 21m00Tcm4TlvDq8ikWAM
 - Adam: pNInz6obpgDQGcFmaJgB""")
-    elif voice_name is not None:
-        voices = client.voices.search(search=voice_name)
-        if len(voices.voices) == 0:
-            # Provide helpful suggestions
-            make_error(
-                f"No voices found with name '{voice_name}'",
-                code="VOICE_NOT_FOUND",
-                suggestion="Use get_voice_id_by_name() for fuzzy matching, or search_voices() to list all available voices"
+        elif voice_name is not None:
+            voices = api_flights.do(
+                ("voices.search", voice_name), lambda: client.voices.search(search=voice_name)
             )
-        voice = next((v for v in voices.voices if v.name == voice_name), None)
-        if voice is None:
-            # Check for partial matches
-            partial_matches = [v.name for v in voices.voices if voice_name.lower() in v.name.lower()]
-            if partial_matches:
+            if len(voices.voices) == 0:
+                # Provide helpful suggestions
                 make_error(
-                    f"Exact match for '{voice_name}' not found",
-                    code="VOICE_PARTIAL_MATCH",
-                    suggestion=f"Did you mean one of these? {', '.join(partial_matches[:5])}. Use get_voice_id_by_name() for automatic matching"
-                )
-            else:
-                make_error(
-                    f"Voice '{voice_name}' does not exist",
+                    f"No voices found with name '{voice_name}'",
                     code="VOICE_NOT_FOUND",
-                    suggestion="Try search_voices() to see all available voices"
+                    suggestion="Use get_voice_id_by_name() for fuzzy matching, or search_voices() to list all available voices"
                 )
+            voice = next((v for v in voices.voices if v.name == voice_name), None)
+            if voice is None:
+                # Check for partial matches
+                partial_matches = [v.name for v in voices.voices if voice_name.lower() in v.name.lower()]
+                if partial_matches:
+                    make_error(
+                        f"Exact match for '{voice_name}' not found",
+                        code="VOICE_PARTIAL_MATCH",
+                        suggestion=f"Did you mean one of these? {', '.join(partial_matches[:5])}. Use get_voice_id_by_name() for automatic matching"
+                    )
+                else:
+                    make_error(
+                        f"Voice '{voice_name}' does not exist",
+                        code="VOICE_NOT_FOUND",
+                        suggestion="Try search_voices() to see all available voices"
+                    )
 
-    voice_id = voice.voice_id if voice else DEFAULT_VOICE_ID
+        voice_id = voice.voice_id if voice else DEFAULT_VOICE_ID
+        resolve_span.set(voice_id=voice_id)
 
     output_path = make_output_path(output_directory, base_path)
     output_file_name = make_output_file("tts", text, output_path, "mp3")
@@ -261,7 +499,7 @@ Common voice IDs:
                 stability = 0.5
             else:
                 stability = 1.0
-            print(f"Auto-adjusted stability from {original_stability} to {stability}")
+            event("stability.adjusted", requested=original_stability, used=stability)
         
         # Simplify tags for v3
         text = simplify_tags(text)
@@ -269,8 +507,7 @@ Common voice IDs:
         # Validate and warn about remaining invalid tags
         invalid_tags = validate_and_warn_tags(text)
         if invalid_tags:
-            print(f"Warning: These tags may not work properly: {invalid_tags}")
-            print("Consider using: whispers, crying, shouting, pause, etc.")
+            event("tags.invalid", tags=", ".join(invalid_tags))
         
         # Sanitize text to avoid JSON parsing issues
         # Replace problematic characters that cause escaping issues
@@ -278,39 +515,14 @@ Common voice IDs:
         
         # Check if v3 proxy is enabled for users with web access
         if v3_proxy_enabled:
-            # Ensure proxy is running
-            import subprocess
-            import psutil
-            import sys
-            
-            # Check if proxy is already running
-            proxy_running = False
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    cmdline = proc.info.get('cmdline')
-                    if cmdline and 'v3_proxy.py' in ' '.join(cmdline):
-                        proxy_running = True
-                        break
-                except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
-                    continue
-            
-            if not proxy_running:
-                # Start proxy in background
-                proxy_path = os.path.join(os.path.dirname(__file__), 'v3_proxy.py')
-                subprocess.Popen([sys.executable, proxy_path], 
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL)
-                # Give it a moment to start
-                import time
-                time.sleep(2)
-            
+            ensure_v3_proxy()
             # Use proxy endpoint
             endpoint = f"{v3_proxy_url}/v1/text-to-dialogue/stream"
         else:
             # Use direct API endpoint (requires v3 access)
-            endpoint = "https://api.elevenlabs.io/v1/text-to-dialogue/stream"
+            endpoint = api_url("/v1/text-to-dialogue/stream")
         
-        response = httpx.post(
+        response = custom_client.post(
             endpoint,
             json={
                 "inputs": [{
@@ -325,7 +537,7 @@ Common voice IDs:
                 }
             },
             headers={
-                "xi-api-key": api_key,
+                "xi-api-key": current_api_key(),
                 "Content-Type": "application/json",
                 "Accept": "audio/mpeg"
             } if not v3_proxy_enabled else {
@@ -375,8 +587,9 @@ Common voice IDs:
         audio_bytes = b"".join(audio_data)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path / output_file_name, "wb") as f:
-        f.write(audio_bytes)
+    with span("file.write", bytes=len(audio_bytes)):
+        with open(output_path / output_file_name, "wb") as f:
+            f.write(audio_bytes)
 
     return TextContent(
         type="text",
@@ -484,7 +697,7 @@ def text_to_sound_effects(
     duration_seconds: float = 2.0,
     output_directory: str | None = None,
     output_format: str = "mp3_44100_128"
-) -> list[TextContent]:
+) -> TextContent:
     """
     Creates sound effects from text descriptions.
 
@@ -529,6 +742,9 @@ def search_voices(
     sort: Literal["created_at_unix", "name"] = "name",
     sort_direction: Literal["asc", "desc"] = "desc",
     return_format: Literal["json", "text"] = "json",
+    category: str | None = None,
+    labels: dict[str, str] | None = None,
+    v3_optimized: bool | None = None,
 ) -> TextContent:
     """
     Searches ElevenLabs voice library.
@@ -538,8 +754,12 @@ def search_voices(
         sort: Sort by 'name' or 'created_at_unix' (name default)
         sort_direction: 'asc' or 'desc' (desc default)
         return_format: 'json' or 'text' (json default)
+        category: Only voices in this category, e.g. 'premade', 'cloned' (optional)
+        labels: Label filters, e.g. {"gender": "female", "accent": "british"} (optional)
+        v3_optimized: Only v3-optimized (true) or other (false) voices (optional)
 
     Returns structured JSON with voice_id, name, category.
+    Searches a local snapshot of your voices that refreshes in the background.
     """
     # Common working voices that AI should use by default
     common_voices = {
@@ -552,91 +772,39 @@ def search_voices(
         "Rachel": "conversational American female",
         "Brian": "deep American male voice"
     }
-    
-    # If no search term, return common voices with helpful info
-    if not search:
-        # Get all voices first
-        all_voices_response = client.voices.get_all()
-        all_voices_dict = {v.name: v for v in all_voices_response.voices}
-        
-        # Build list of common voices that actually exist
-        result_voices = []
-        for voice_name, description in common_voices.items():
-            if voice_name in all_voices_dict:
-                voice = all_voices_dict[voice_name]
-                # Add helpful description to category
-                enhanced_voice = McpVoice(
-                    id=voice.voice_id,
-                    name=voice.name,
-                    category=f"{voice.category or 'general'} - {description}"
-                )
-                result_voices.append(enhanced_voice)
-        
-        # If we found common voices, return them
-        if result_voices:
-            return result_voices
-    
-    # Otherwise do normal search
-    response = client.voices.search(
-        search=search, sort=sort, sort_direction=sort_direction
+
+    voices = voice_catalog.search(
+        search=search,
+        category=category,
+        labels=labels,
+        v3_optimized=v3_optimized,
+        sort=sort,
+        sort_direction=sort_direction,
     )
-    
-    voices = [
-        McpVoice(id=voice.voice_id, name=voice.name, category=voice.category)
-        for voice in response.voices
-    ]
-    
-    # If searching for v3 voices or model 3, prioritize known v3-optimized voices
-    if search and ("v3" in search.lower() or "model 3" in search.lower()):
-        # These voice names are known to be optimized for v3 based on ElevenLabs website
-        # Each voice has been verified with its correct ID
-        v3_optimized_names = {
-            "James",  # EkK5I93UQWFDigLMpZcX
-            "Jane",  # RILOU7YmBhvwJGDGjNmP
-            "Juniper",  # aMSt68OGf4xUZAnLpTU8
-            "Arabella",  # Z3R5wn05IrDiVCyEkUrK
-            "Nichalia Schwartz",  # XfNU2rGpBa01ckF309OY
-            "Hope",  # tnSpp4vdxKPjI9w0GnoV
-            "Bradford",  # NNl6r8mD7vthiJatiJt1
-            "Reginald",  # Hjzqw9NR0xFMYU9Us0DL
-            "Gaming – Unreal Tonemanagement 2003",  # YOq2y2Up4RgXP2HyXjE5
-            "Austin",  # Bj9UqZbhQsanLzgalpEG
-            "kuon",  # B8gJV1IhpuegLxdpXFOE
-            "Blondie",  # exsUS4vynmxd379XN4yO
-            "Priyanka Sogam",  # BpjGufoPiobT79j2vtj4
-            "Alexandra",  # kdmDKE6EkgrWrrykO9Qt
-            "Monika Sogam",  # 2zRM7PkgwBPiau2jvVXc
-            "Jenna",  # TgnhEILA8UwUqIMi20rp
-            "Mark",  # 1SM7GgM6IMuvQlz2BwM3
-            "Grimblewood Thornwhisker",  # ouL9IsyrSnUkCmfnD02u
-            "Adeline",  # 5l5f8iK3YPeGga21rQIX
-            "Sam"  # scOwDtmlUjD3prqpp97I
-        }
-        
-        # Sort to put v3-optimized voices first
-        v3_voices = []
-        other_voices = []
-        
-        for voice in voices:
-            if voice.name in v3_optimized_names:
-                v3_voices.append(voice)
-            else:
-                other_voices.append(voice)
-        
-        voices = v3_voices + other_voices
-    
+
+    # If no search term or filter, return common voices with helpful info
+    if not (search or category or labels or v3_optimized is not None):
+        by_name = {voice["name"]: voice for voice in voices}
+        common = [
+            {**by_name[name], "category": f"{by_name[name]['category'] or 'general'} - {description}"}
+            for name, description in common_voices.items()
+            if name in by_name
+        ]
+        if common:
+            voices = common
+
     # Format the response
     if return_format == "json":
-        import json
         voice_data = {
             "total_count": len(voices),
             "search_term": search,
             "voices": [
                 {
-                    "voice_id": voice.id,
-                    "name": voice.name,
-                    "category": voice.category,
-                    "is_v3_optimized": voice.name in v3_optimized_names if search and "v3" in search.lower() else None
+                    "voice_id": voice["voice_id"],
+                    "name": voice["name"],
+                    "category": voice["category"],
+                    "labels": voice["labels"],
+                    "is_v3_optimized": voice["is_v3_optimized"],
                 }
                 for voice in voices
             ]
@@ -646,7 +814,7 @@ def search_voices(
         # Legacy text format
         lines = [f"Found {len(voices)} voices:\n"]
         for voice in voices:
-            lines.append(f"- {voice.name} (ID: {voice.id}) - {voice.category or 'general'}")
+            lines.append(f"- {voice['name']} (ID: {voice['voice_id']}) - {voice['category'] or 'general'}")
         return TextContent(type="text", text="\n".join(lines))
 
 
@@ -663,30 +831,26 @@ def get_voice_id_by_name(voice_name: str) -> TextContent:
     Returns JSON with voice_id, exact name, confidence score, and match type.
     Handles typos and case variations.
     """
-    import json
     from fuzzywuzzy import fuzz
     
     try:
-        # Get all voices
-        all_voices_response = client.voices.get_all()
-        
         # First try exact match (case-insensitive)
-        for voice in all_voices_response.voices:
-            if voice.name.lower() == voice_name.lower():
-                result = {
-                    "voice_id": voice.voice_id,
-                    "name": voice.name,
-                    "confidence": 100,
-                    "match_type": "exact"
-                }
-                return TextContent(type="text", text=json.dumps(result, indent=2))
+        voice = voice_catalog.find_by_name(voice_name)
+        if voice:
+            result = {
+                "voice_id": voice["voice_id"],
+                "name": voice["name"],
+                "confidence": 100,
+                "match_type": "exact"
+            }
+            return TextContent(type="text", text=json.dumps(result, indent=2))
         
         # If no exact match, try fuzzy matching
         best_match = None
         best_score = 0
         
-        for voice in all_voices_response.voices:
-            score = fuzz.ratio(voice.name.lower(), voice_name.lower())
+        for voice in voice_catalog.voices():
+            score = fuzz.ratio(voice["name"].lower(), voice_name.lower())
             if score > best_score:
                 best_score = score
                 best_match = voice
@@ -694,8 +858,8 @@ def get_voice_id_by_name(voice_name: str) -> TextContent:
         # Only return fuzzy match if confidence is above 70%
         if best_match and best_score >= 70:
             result = {
-                "voice_id": best_match.voice_id,
-                "name": best_match.name,
+                "voice_id": best_match["voice_id"],
+                "name": best_match["name"],
                 "confidence": best_score,
                 "match_type": "fuzzy",
                 "original_query": voice_name
@@ -718,24 +882,30 @@ def get_voice_id_by_name(voice_name: str) -> TextContent:
 
 @mcp.tool(description="Lists available TTS models. Returns: model list with capabilities. Use when: choosing between v2, v3, or other models.")
 def list_models() -> list[McpModel]:
-    response = client.models.list()
-    return [
-        McpModel(
-            id=model.model_id,
-            name=model.name,
-            languages=[
-                McpLanguage(language_id=lang.language_id, name=lang.name)
-                for lang in model.languages
-            ]
-        )
-        for model in response
-    ]
+    result = api_cache.fetch(
+        "models",
+        lambda: [
+            McpModel(
+                id=model.model_id,
+                name=model.name,
+                languages=[
+                    McpLanguage(language_id=lang.language_id, name=lang.name)
+                    for lang in model.languages
+                ]
+            ).model_dump()
+            for model in client.models.list()
+        ],
+    )
+    cache_age_secs = int(result.age_secs) if result.cached else None
+    return [McpModel(**{**model, "cache_age_secs": cache_age_secs}) for model in result.value]
 
 
 @mcp.tool(description="Gets voice details. Returns: voice metadata and settings. Use when: need detailed information about a specific voice.")
 def get_voice(voice_id: str) -> McpVoice:
     """Get details of a specific voice."""
-    response = client.voices.get(voice_id=voice_id)
+    response = api_flights.do(
+        ("voices.get", voice_id), lambda: client.voices.get(voice_id=voice_id)
+    )
     return McpVoice(
         id=response.voice_id,
         name=response.name,
@@ -747,8 +917,11 @@ def get_voice(voice_id: str) -> McpVoice:
 @mcp.tool(
     description="Creates voice clone from audio. Returns: new voice ID. Use when: creating custom voice from recordings."
 )
-def voice_clone(
-    name: str, files: list[str], description: str | None = None
+async def voice_clone(
+    name: str,
+    files: list[str],
+    description: str | None = None,
+    prepare_samples: bool = True,
 ) -> TextContent:
     """
     Creates instant voice clone.
@@ -757,23 +930,56 @@ def voice_clone(
         name: Name for the new voice
         files: List of audio file paths
         description: Voice description (optional)
+        prepare_samples: Trim silence, drop clipped audio, normalize and cap duration before upload (true default)
 
     Note: Incurs API costs. Requires quality audio samples.
     """
-    input_files = [str(handle_input_file(file).absolute()) for file in files]
-    voice = client.voices.ivc.create(
-        name=name,
-        description=description,
-        files=input_files
-    )
+    input_files = [handle_input_file(file).absolute() for file in files]
+
+    def run_clone():
+        with tempfile.TemporaryDirectory(prefix="elevenlabs-clone-") as prepared_dir:
+            summary = None
+            upload_paths = input_files
+            if prepare_samples:
+                from elevenlabs_mcp.audio_prep import prepare_samples as prepare_clone_samples
+
+                samples, summary = prepare_clone_samples(input_files, Path(prepared_dir))
+                if not samples:
+                    make_error(
+                        "No usable speech found in the provided files",
+                        code="NO_USABLE_AUDIO",
+                        suggestion="Provide recordings with clear speech, or set prepare_samples=false",
+                    )
+                upload_paths = [sample.path for sample in samples]
+
+            # Uploaded as open files so httpx streams them
+            with ExitStack() as stack:
+                upload_files = [
+                    (path.name, stack.enter_context(open(path, "rb"))) for path in upload_paths
+                ]
+                voice = client.voices.ivc.create(
+                    name=name,
+                    description=description,
+                    files=upload_files,
+                )
+        return voice, summary
 
-    return TextContent(
-        type="text",
-        text=f"""Voice cloned successfully: Name: {voice.name}
+    voice, summary = await in_tool_thread(run_clone)
+    voice_catalog.refresh_in_background()
+
+    text = f"""Voice cloned successfully: Name: {name}
         ID: {voice.voice_id}
-        Category: {voice.category}
-        Description: {voice.description or "N/A"}""",
-    )
+        Description: {description or "N/A"}"""
+    if summary:
+        text += f"""
+        Sample preparation: {summary["original_secs"]}s -> {summary["prepared_secs"]}s ({summary["secs_saved"]}s saved), {summary["original_bytes"]} -> {summary["prepared_bytes"]} bytes ({summary["bytes_saved"]} saved)"""
+        if summary["files_dropped"]:
+            text += f"""
+        Left out (silent, clipped or over the duration cap): {", ".join(summary["files_dropped"])}"""
+        if summary["unprocessed"]:
+            text += f"""
+        Uploaded unprocessed (unreadable by soundfile): {", ".join(summary["unprocessed"])}"""
+    return TextContent(type="text", text=text)
 
 
 @mcp.tool(
@@ -781,7 +987,7 @@ def voice_clone(
 )
 def isolate_audio(
     input_file_path: str, output_directory: str | None = None
-) -> list[TextContent]:
+) -> TextContent:
     """
     Isolates voice by removing background noise.
 
@@ -814,8 +1020,64 @@ def isolate_audio(
     description="Checks account subscription. Returns: subscription details and usage. Use when: monitoring API usage and limits."
 )
 def check_subscription() -> TextContent:
-    subscription = client.user.subscription.get()
-    return TextContent(type="text", text=f"{subscription.model_dump_json(indent=2)}")
+    result = api_cache.fetch(
+        "subscription", lambda: client.user.subscription.get().model_dump(mode="json")
+    )
+    subscription = dict(result.value)
+    api_governor.size_for_tier(subscription.get("tier"))
+    if result.cached:
+        subscription["cache"] = result.info()
+    return TextContent(type="text", text=json.dumps(subscription, indent=2))
+
+
+@mcp.tool(
+    description="Shows API throttling state. Returns: concurrency limit, per-endpoint queue depth, wait times, 429 counts and retries, plus cache and request coalescing counters. Use when: tools are slow or diagnosing rate limits."
+)
+def get_api_governor_status() -> TextContent:
+    status = api_governor.status()
+    status["key"] = key_pool.current().fingerprint
+    status["key_pool"] = key_pool.status()
+    status["retries"] = dict(api_transport.stats)
+    status["cache"] = dict(api_cache.stats)
+    status["coalesced_requests"] = dict(api_flights.stats)
+    if api_cassette is not None:
+        status["cassette"] = {"path": str(api_cassette.path), "mode": api_cassette.mode, **api_cassette.stats}
+    return TextContent(type="text", text=json.dumps(status, indent=2))
+
+
+@mcp.tool(
+    description="Shows server performance metrics. Returns: per-tool call counts, latency percentiles split into API, rate-limit queue and local time, bytes, characters billed, cache hits and errors by code. Use when: the server seems slow or checking usage."
+)
+def get_server_metrics(
+    tool_name: str | None = None,
+    return_format: Literal["json", "prometheus"] = "json",
+) -> TextContent:
+    """
+    Reports metrics collected since the server started.
+
+    An HTTP server with several workers keeps metrics per worker, and this
+    reports the one that answered; the metrics port serves all of them.
+
+    Args:
+        tool_name: Only report this tool (optional, all tools default)
+        return_format: 'json' or 'prometheus' text format (json default)
+    """
+    tenant = key_pool.current()
+    # Other clients' keys are none of this one's business
+    own_key = None if tenant is key_pool.default else tenant.fingerprint
+    if return_format == "prometheus":
+        return TextContent(type="text", text=server_metrics.prometheus(key=own_key))
+    snapshot = server_metrics.snapshot(tool_name)
+    if tool_name and not snapshot["tools"]:
+        make_error(
+            f"No calls recorded for tool '{tool_name}'",
+            code="INVALID_PARAMETERS",
+            suggestion="Call get_server_metrics without tool_name to see every tool with recorded calls",
+        )
+    if own_key is not None:
+        snapshot["keys"] = {key: value for key, value in snapshot["keys"].items() if key == own_key}
+    snapshot["cache"] = dict(api_cache.stats)
+    return TextContent(type="text", text=json.dumps(snapshot, indent=2))
 
 
 @mcp.tool(
@@ -867,6 +1129,7 @@ def create_agent(
         conversation_config=conversation_config,
         platform_settings=platform_settings,
     )
+    api_cache.invalidate("agents")
 
     return TextContent(
         type="text",
@@ -874,6 +1137,55 @@ def create_agent(
     )
 
 
+@mcp.tool(
+    description="Creates or updates many agents from a YAML/JSON spec. Returns: JSON with per-agent create/update/unchanged results. Use when: provisioning or reconciling agents in bulk."
+)
+async def provision_agents(
+    spec_file_path: str | None = None,
+    spec: str | None = None,
+    dry_run: bool = False,
+    max_concurrency: int = 8,
+    requests_per_second: float = 5.0,
+) -> TextContent:
+    """
+    Converges agents to a declarative spec, matching existing agents by name.
+
+    Args:
+        spec_file_path: Path to a .yaml/.yml/.json spec (optional)
+        spec: Inline YAML or JSON spec (optional)
+        dry_run: Report planned changes without applying them
+        max_concurrency: Parallel API calls (8 default)
+        requests_per_second: Request rate limit (5 default)
+
+    The spec has an `agents` list and optional shared `defaults`, using the
+    same fields as create_agent (name and system_prompt required).
+    Existing agents are compared and updated only in the fields the spec sets.
+    Note: Incurs API costs. Only missing or drifted agents are written.
+    """
+    if (spec_file_path is None) == (spec is None):
+        make_error(
+            "Provide exactly one of spec_file_path or spec",
+            code="INVALID_PARAMETERS",
+        )
+    if spec_file_path is not None:
+        spec_data = load_spec(handle_input_file(spec_file_path, audio_content_check=False))
+    else:
+        spec_data = parse_spec(spec)
+
+    summary = await in_tool_thread(
+        provision,
+        client,
+        spec_data,
+        dry_run=dry_run,
+        max_concurrency=max_concurrency,
+        requests_per_second=requests_per_second,
+    )
+    if not dry_run:
+        api_cache.invalidate("agents")
+        api_cache.invalidate("agent")
+    return TextContent(type="text", text=json.dumps(summary, indent=2))
+
+
 @mcp.tool(
     description="Adds knowledge to agent. Returns: knowledge base ID. Use when: giving agent access to documents or information."
 )
@@ -883,6 +1195,7 @@ def add_knowledge_base_to_agent(
     url: str | None = None,
     input_file_path: str | None = None,
     text: str | None = None,
+    reuse_existing: bool = True,
 ) -> TextContent:
     """
     Adds knowledge base to agent.
@@ -893,6 +1206,7 @@ def add_knowledge_base_to_agent(
         url: URL to fetch content (optional)
         input_file_path: File path (optional)
         text: Direct text content (optional)
+        reuse_existing: Reuse an identical document uploaded before (true default)
 
     Note: Incurs API costs. Supports epub, pdf, docx, txt, html.
     """
@@ -904,44 +1218,85 @@ def add_knowledge_base_to_agent(
     if len(provided_params) > 1:
         make_error("Must provide exactly one of: URL, file, or text")
 
-    if url is not None:
-        response = client.conversational_ai.knowledge_base.documents.create_from_url(
-            name=knowledge_base_name,
-            url=url,
-        )
-    else:
-        if text is not None:
-            text_bytes = text.encode("utf-8")
-            text_io = BytesIO(text_bytes)
-            text_io.name = "text.txt"
-            text_io.content_type = "text/plain"
-            file = text_io
-        elif input_file_path is not None:
-            path = handle_input_file(file_path=input_file_path, audio_content_check=False)
-            file = open(path, "rb")
-
-        response = client.conversational_ai.knowledge_base.documents.create_from_file(
-            name=knowledge_base_name,
-            file=file,
-        )
+    document = {"name": knowledge_base_name, "url": url, "text": text}
+    if input_file_path is not None:
+        path = handle_input_file(file_path=input_file_path, audio_content_check=False)
+        document["file_path"] = str(path)
 
-    agent = client.conversational_ai.agents.get(agent_id=agent_id)
-    agent.conversation_config.agent.prompt.knowledge_base.append(
-        KnowledgeBaseLocator(
-            type="file" if file else "url",
-            name=knowledge_base_name,
-            id=response.id,
-        )
-    )
-    client.conversational_ai.agents.update(
-        agent_id=agent_id, conversation_config=agent.conversation_config
-    )
+    dedup = get_document_hash_index() if reuse_existing else None
+    locator = upload_document(client, document, dedup, key_pool.current().fingerprint)
+    attach_documents(client, agent_id, [locator])
+    api_cache.invalidate("agent", agent_id)
+    action = "Reused existing knowledge base document" if locator["reused"] else "Knowledge base created"
     return TextContent(
         type="text",
-        text=f"""Knowledge base created with ID: {response.id} and added to agent {agent_id} successfully.""",
+        text=f"""{action} with ID: {locator["id"]} and added to agent {agent_id} successfully.""",
     )
 
 
+@mcp.tool(
+    description="Adds many documents to agent knowledge base. Returns: JSON with document IDs and failures. Use when: loading a set of URLs, files or texts into an agent at once."
+)
+async def add_knowledge_base_documents_to_agent(
+    agent_id: str,
+    urls: list[str] | None = None,
+    input_file_paths: list[str] | None = None,
+    texts: list[str] | None = None,
+    name_prefix: str | None = None,
+    max_concurrency: int = 8,
+    reuse_existing: bool = True,
+) -> TextContent:
+    """
+    Uploads documents in parallel, then attaches them with one agent update.
+
+    Args:
+        agent_id: Target agent ID
+        urls: URLs to fetch content from (optional)
+        input_file_paths: Files to upload: epub, pdf, docx, txt, html (optional)
+        texts: Text contents to upload (optional)
+        name_prefix: Prefix for document names (optional)
+        max_concurrency: Parallel uploads (8 default)
+        reuse_existing: Reuse identical documents uploaded before (true default)
+
+    Note: Incurs API costs. Documents that fail to upload are reported
+    and the rest are still attached.
+    """
+    documents = [{"url": url} for url in urls or []]
+    documents += [
+        {"file_path": str(handle_input_file(file_path=path, audio_content_check=False))}
+        for path in input_file_paths or []
+    ]
+    documents += [{"text": text} for text in texts or []]
+    if not documents:
+        make_error("Must provide at least one URL, file, or text")
+    for position, document in enumerate(documents):
+        document["name"] = default_document_name(document, position, name_prefix)
+
+    def run_upload() -> dict:
+        locators, failures = upload_documents(
+            client,
+            documents,
+            max_concurrency=max_concurrency,
+            dedup=get_document_hash_index() if reuse_existing else None,
+            scope=key_pool.current().fingerprint,
+        )
+        added = attach_documents(client, agent_id, locators) if locators else 0
+        api_cache.invalidate("agent", agent_id)
+        reused = sum(1 for locator in locators if locator["reused"])
+        return {
+            "agent_id": agent_id,
+            "uploaded": len(locators) - reused,
+            "reused": reused,
+            "attached": added,
+            "failed": len(failures),
+            "documents": locators,
+            "failures": failures,
+        }
+
+    result = await in_tool_thread(run_upload)
+    return TextContent(type="text", text=json.dumps(result, indent=2))
+
+
 @mcp.tool(description="Lists all agents. Returns: agent list with IDs. Use when: viewing available conversational AI agents.")
 def list_agents() -> TextContent:
     """List all available conversational AI agents.
@@ -949,20 +1304,26 @@ def list_agents() -> TextContent:
     Returns:
         TextContent with a formatted list of available agents
     """
-    response = client.conversational_ai.agents.list()
+    result = api_cache.fetch(
+        "agents",
+        lambda: [
+            {"name": agent.name, "agent_id": agent.agent_id}
+            for agent in client.conversational_ai.agents.list().agents
+        ],
+    )
 
-    if not response.agents:
-        return TextContent(type="text", text="No agents found.")
+    if not result.value:
+        return TextContent(type="text", text="No agents found." + result.note())
 
     agent_info = []
-    for agent in response.agents:
+    for agent in result.value:
         agent_info.append(
-            f"Name: {agent.name}\n"
-            f"ID: {agent.agent_id}"
+            f"Name: {agent['name']}\n"
+            f"ID: {agent['agent_id']}"
         )
 
     formatted_info = "\n\n".join(agent_info)
-    return TextContent(type="text", text=f"Available Agents:\n\n{formatted_info}")
+    return TextContent(type="text", text=f"Available Agents:\n\n{formatted_info}{result.note()}")
 
 
 @mcp.tool(description="Gets agent details. Returns: agent configuration. Use when: viewing specific agent settings and capabilities.")
@@ -975,15 +1336,27 @@ def get_agent(agent_id: str) -> TextContent:
     Returns:
         TextContent with detailed information about the agent
     """
-    response = client.conversational_ai.agents.get(agent_id=agent_id)
+    def load_agent() -> dict:
+        response = client.conversational_ai.agents.get(agent_id=agent_id)
+        tts = response.conversation_config.tts
+        return {
+            "name": response.name,
+            "agent_id": response.agent_id,
+            "has_tts": tts is not None,
+            "voice_id": tts.voice_id if tts else None,
+            "created_at_unix_secs": response.metadata.created_at_unix_secs,
+        }
+
+    result = api_cache.fetch("agent", load_agent, agent_id)
+    agent = result.value
 
     voice_info = "None"
-    if response.conversation_config.tts:
-        voice_info = f"Voice ID: {response.conversation_config.tts.voice_id}"
+    if agent["has_tts"]:
+        voice_info = f"Voice ID: {agent['voice_id']}"
 
     return TextContent(
         type="text",
-        text=f"Agent Details: Name: {response.name}, Agent ID: {response.agent_id}, Voice Configuration: {voice_info}, Created At: {datetime.fromtimestamp(response.metadata.created_at_unix_secs).strftime('%Y-%m-%d %H:%M:%S')}",
+        text=f"Agent Details: Name: {agent['name']}, Agent ID: {agent['agent_id']}, Voice Configuration: {voice_info}, Created At: {datetime.fromtimestamp(agent['created_at_unix_secs']).strftime('%Y-%m-%d %H:%M:%S')}{result.note()}",
     )
 
 
@@ -1005,7 +1378,9 @@ def speech_to_speech(
 
     Note: Incurs API costs.
     """
-    voices = client.voices.search(search=voice_name)
+    voices = api_flights.do(
+        ("voices.search", voice_name), lambda: client.voices.search(search=voice_name)
+    )
 
     if len(voices.voices) == 0:
         make_error("No voice found with that name.")
@@ -1076,10 +1451,7 @@ def text_to_voice(
         )
         output_file_paths.append(str(output_file_name))
         generated_voice_ids.append(preview.generated_voice_id)
-        audio_bytes = base64.b64decode(preview.audio_base_64)
-
-        with open(output_path / output_file_name, "wb") as f:
-            f.write(audio_bytes)
+        write_base64(preview.audio_base_64, output_file_name)
 
     return TextContent(
         type="text",
@@ -1087,6 +1459,43 @@ def text_to_voice(
     )
 
 
+@mcp.tool(
+    description="Creates voice previews for many descriptions. Returns: JSON manifest of preview IDs and files. Use when: exploring many voice designs at once."
+)
+async def text_to_voice_batch(
+    voice_descriptions: list[str],
+    text: str | None = None,
+    output_directory: str | None = None,
+    max_concurrency: int = 4,
+) -> TextContent:
+    """
+    Generates previews for each voice description concurrently.
+
+    Args:
+        voice_descriptions: Descriptions of desired voices
+        text: Sample text for every preview (auto-generated if not provided)
+        output_directory: Save location (Desktop default)
+        max_concurrency: Parallel preview requests (4 default)
+
+    Note: Incurs API costs. Creates 3 variations per description.
+    The manifest is also saved as JSON next to the audio files.
+    """
+    descriptions = [description for description in voice_descriptions if description]
+    if not descriptions:
+        make_error("At least one voice description is required.", code="INVALID_PARAMETERS")
+    output_path = make_output_path(output_directory, base_path)
+
+    manifest = await in_tool_thread(
+        design_voices,
+        client,
+        descriptions,
+        output_path,
+        text=text,
+        max_concurrency=max_concurrency,
+    )
+    return TextContent(type="text", text=json.dumps(manifest, indent=2))
+
+
 @mcp.tool(
     description="Saves generated voice to library. Returns: permanent voice ID. Use when: keeping voice from text_to_voice previews."
 )
@@ -1100,6 +1509,7 @@ def create_voice_from_preview(
         voice_description=voice_description,
         generated_voice_id=generated_voice_id,
     )
+    voice_catalog.refresh_in_background()
 
     return TextContent(
         type="text",
@@ -1138,65 +1548,160 @@ Status: Success"""
 
 
 @mcp.tool(
-    description="Searches global voice library. Returns: shared voices list. Use when: finding voices across entire ElevenLabs platform."
+    description="Runs outbound call campaign. Returns: JSON campaign progress by call status. Use when: dialing many numbers with an agent under concurrency and rate limits."
+)
+async def run_call_campaign(
+    agent_id: str,
+    agent_phone_number_id: str,
+    calls: list[dict | str],
+    journal_file_path: str | None = None,
+    max_concurrent_calls: int = 5,
+    calls_per_second: float = 1.0,
+    poll_interval_secs: float = 10.0,
+    max_runtime_secs: float = 1800.0,
+    max_dial_attempts: int = 3,
+) -> TextContent:
+    """
+    Dials many numbers through one agent and tracks each call to completion.
+
+    Args:
+        agent_id: Agent that handles the calls
+        agent_phone_number_id: Phone number ID to call from
+        calls: Numbers, or {"to_number", "dynamic_variables"} objects
+        journal_file_path: Campaign journal (default per agent and number in the data dir)
+        max_concurrent_calls: Calls live at once, capped by the agent's concurrency limit (5 default)
+        calls_per_second: Maximum new calls started per second (1 default)
+        poll_interval_secs: Seconds between completion checks (10 default)
+        max_runtime_secs: Return after this long; re-run to resume (1800 default)
+        max_dial_attempts: Failed dials of a number, over all runs, before giving up on it (3 default)
+
+    Note: Incurs API costs. Re-running with the same journal skips finished
+    calls, resumes tracking live ones and retries failed dials, except those
+    that may have placed the call (listed in dial_unknown_numbers).
+    """
+    if not calls:
+        make_error("At least one call is required", code="INVALID_PARAMETERS")
+    if journal_file_path:
+        journal_path = Path(journal_file_path)
+        if not journal_path.is_absolute() and base_path and path_root() is None:
+            journal_path = Path(os.path.expanduser(base_path)) / journal_path
+        journal_path = confined(journal_path)
+    else:
+        journal_path = (path_root() or get_data_dir()) / "campaigns" / f"{agent_id}_{agent_phone_number_id}.jsonl"
+
+    summary = await in_tool_thread(
+        run_campaign,
+        client,
+        custom_client,
+        current_api_key(),
+        agent_id,
+        agent_phone_number_id,
+        calls,
+        journal_path,
+        max_concurrent_calls=max_concurrent_calls,
+        calls_per_second=calls_per_second,
+        poll_interval_secs=poll_interval_secs,
+        max_runtime_secs=max_runtime_secs,
+        max_dial_attempts=max_dial_attempts,
+    )
+    return TextContent(type="text", text=json.dumps(summary, indent=2))
+
+
+@mcp.tool(
+    description="Searches global voice library. Returns: JSON with filtered shared voices. Use when: finding voices across entire ElevenLabs platform by gender, accent, language or use case."
 )
 def search_voice_library(
     page: int = 0,
     page_size: int = 10,
     search: str | None = None,
+    gender: str | None = None,
+    age: str | None = None,
+    accent: str | None = None,
+    language: str | None = None,
+    use_case: str | None = None,
+    category: str | None = None,
+    sort: Literal["relevance", "most_cloned", "newest"] = "relevance",
+    return_format: Literal["json", "text"] = "json",
 ) -> TextContent:
-    response = client.voices.get_shared(
-        page=page,
-        page_size=page_size,
-        search=search,
-    )
-
-    if not response.voices:
-        return TextContent(
-            type="text", text="No shared voices found with the specified criteria."
-        )
-
-    voice_list = []
-    for voice in response.voices:
-        language_info = "N/A"
-        if hasattr(voice, "verified_languages") and voice.verified_languages:
-            languages = []
-            for lang in voice.verified_languages:
-                accent_info = (
-                    f" ({lang.accent})"
-                    if hasattr(lang, "accent") and lang.accent
-                    else ""
-                )
-                languages.append(f"{lang.language}{accent_info}")
-            language_info = ", ".join(languages)
-
-        details = [
-            f"Name: {voice.name}",
-            f"ID: {voice.voice_id}",
-            f"Category: {getattr(voice, 'category', 'N/A')}",
-        ]
-        # TODO: Make cleaner
-        if hasattr(voice, "gender") and voice.gender:
-            details.append(f"Gender: {voice.gender}")
-        if hasattr(voice, "age") and voice.age:
-            details.append(f"Age: {voice.age}")
-        if hasattr(voice, "accent") and voice.accent:
-            details.append(f"Accent: {voice.accent}")
-        if hasattr(voice, "description") and voice.description:
-            details.append(f"Description: {voice.description}")
-        if hasattr(voice, "use_case") and voice.use_case:
-            details.append(f"Use Case: {voice.use_case}")
+    """
+    Searches the shared voice library with local filtering and paging.
 
-        details.append(f"Languages: {language_info}")
+    Args:
+        page: Page of filtered results, from 0 (0 default)
+        page_size: Results per page (10 default)
+        search: Library search term (optional)
+        gender: e.g. 'male', 'female', 'neutral' (optional)
+        age: e.g. 'young', 'middle_aged', 'old' (optional)
+        accent: e.g. 'american', 'british' (optional)
+        language: Language code, e.g. 'en', 'es' (optional)
+        use_case: e.g. 'narrative_story', 'conversational' (optional)
+        category: e.g. 'professional', 'high_quality' (optional)
+        sort: 'relevance', 'most_cloned' or 'newest' (relevance default)
+        return_format: 'json' or 'text' (json default)
 
-        if hasattr(voice, "preview_url") and voice.preview_url:
-            details.append(f"Preview URL: {voice.preview_url}")
+    Results for a search term are cached for an hour and prefetched in the
+    background; `cache_complete` is false while more pages are still loading
+    (`cache_loading`) or when more voices match than are cached.
+    """
+    from elevenlabs_mcp.shared_voice_library import filter_voices, voice_rows
 
-        voice_info = "\n".join(details)
-        voice_list.append(voice_info)
+    table, stale = get_shared_voice_library().table(
+        search, gender=gender, age=age, accent=accent, language=language, use_case=use_case, category=category
+    )
+    columns = table.columns()
+    indices = filter_voices(
+        columns,
+        gender=gender,
+        age=age,
+        accent=accent,
+        language=language,
+        use_case=use_case,
+        category=category,
+        sort=sort,
+    )
+    start = page * page_size
+    voices = voice_rows(columns, indices[start:start + page_size])
 
-    formatted_info = "\n\n".join(voice_list)
-    return TextContent(type="text", text=f"Shared Voices:\n\n{formatted_info}")
+    if return_format == "text":
+        if not voices:
+            return TextContent(
+                type="text", text="No shared voices found with the specified criteria."
+            )
+        lines = []
+        for voice in voices:
+            languages = ", ".join(
+                f"{lang['language']} ({lang['accent']})" if lang.get("accent") else lang["language"]
+                for lang in voice.get("verified_languages", [])
+            )
+            lines.append(
+                "\n".join(
+                    [f"Name: {voice['name']}", f"ID: {voice['voice_id']}"]
+                    + [
+                        f"{field.replace('_', ' ').title()}: {voice[field]}"
+                        for field in ("category", "gender", "age", "accent", "description", "use_case")
+                        if field in voice
+                    ]
+                    + [f"Languages: {languages or 'N/A'}"]
+                    + ([f"Preview URL: {voice['preview_url']}"] if "preview_url" in voice else [])
+                )
+            )
+        return TextContent(type="text", text="Shared Voices:\n\n" + "\n\n".join(lines))
+
+    result = {
+        "search_term": search,
+        "total_matches": int(indices.size),
+        "page": page,
+        "page_size": page_size,
+        "has_more": start + page_size < indices.size,
+        "cache_complete": table.complete,
+        "cache_loading": table.loading,
+        "cache_stale": stale,
+        "cached_voices": len(table),
+        "voices": voices,
+    }
+    if table.error:
+        result["cache_error"] = table.error
+    return TextContent(type="text", text=json.dumps(result, indent=2))
 
 
 @mcp.tool(description="Lists account phone numbers. Returns: phone number list. Use when: viewing available numbers for outbound calls.")
@@ -1206,31 +1711,45 @@ def list_phone_numbers() -> TextContent:
     Returns:
         TextContent containing formatted information about the phone numbers
     """
-    response = client.conversational_ai.phone_numbers.list()
+    result = api_cache.fetch(
+        "phone_numbers",
+        lambda: [
+            {
+                "phone_number": phone.phone_number,
+                "phone_number_id": phone.phone_number_id,
+                "provider": phone.provider,
+                "label": phone.label,
+                "assigned_agent": (
+                    f"{phone.assigned_agent.agent_name} (ID: {phone.assigned_agent.agent_id})"
+                    if phone.assigned_agent
+                    else "None"
+                ),
+            }
+            for phone in client.conversational_ai.phone_numbers.list()
+        ],
+    )
 
-    if not response:
-        return TextContent(type="text", text="No phone numbers found.")
+    if not result.value:
+        return TextContent(type="text", text="No phone numbers found." + result.note())
 
     phone_info = []
-    for phone in response:
-        assigned_agent = "None"
-        if phone.assigned_agent:
-            assigned_agent = f"{phone.assigned_agent.agent_name} (ID: {phone.assigned_agent.agent_id})"
-
+    for phone in result.value:
         phone_info.append(
-            f"Phone Number: {phone.phone_number}\n"
-            f"ID: {phone.phone_number_id}\n"
-            f"Provider: {phone.provider}\n"
-            f"Label: {phone.label}\n"
-            f"Assigned Agent: {assigned_agent}"
+            f"Phone Number: {phone['phone_number']}\n"
+            f"ID: {phone['phone_number_id']}\n"
+            f"Provider: {phone['provider']}\n"
+            f"Label: {phone['label']}\n"
+            f"Assigned Agent: {phone['assigned_agent']}"
         )
 
     formatted_info = "\n\n".join(phone_info)
-    return TextContent(type="text", text=f"Phone Numbers:\n\n{formatted_info}")
+    return TextContent(type="text", text=f"Phone Numbers:\n\n{formatted_info}{result.note()}")
 
 
 @mcp.tool(description="Plays audio file locally. Returns: playback confirmation. Use when: previewing generated audio without downloading.")
 def play_audio(input_file_path: str) -> TextContent:
+    from elevenlabs import play
+
     file_path = handle_input_file(input_file_path)
     play(open(file_path, "rb").read(), use_ffmpeg=False)
     return TextContent(type="text", text=f"Successfully played audio file: {file_path}")
@@ -1250,9 +1769,11 @@ async def get_conversation(
     
     while attempt < max_attempts:
         try:
-            response = custom_client.get(
-                f"https://api.elevenlabs.io/v1/convai/conversations/{conversation_id}",
-                headers={"xi-api-key": api_key}
+            # Off the event loop: the governor and retries may wait before the request is sent
+            response = await in_tool_thread(
+                custom_client.get,
+                api_url(f"/v1/convai/conversations/{conversation_id}"),
+                headers={"xi-api-key": current_api_key()},
             )
             
             if response.status_code == 404:
@@ -1263,6 +1784,11 @@ async def get_conversation(
                 make_error(f"API error: {response.status_code} - {response.text}")
             
             data = response.json()
+
+            # Finished transcripts feed the local search index for free
+            if data.get("status") in ["done", "failed"]:
+                data.setdefault("conversation_id", conversation_id)
+                await in_tool_thread(get_transcript_store(current_scope()).ingest, data)
             
             # If waiting for completion and not done yet
             if wait_for_completion and data.get("status") not in ["done", "failed"]:
@@ -1328,6 +1854,79 @@ Transcript:
     )
 
 
+def _cursor_caller(ctx: Context | None) -> str:
+    """A value identifying the caller across requests, even in stateless HTTP mode."""
+    if ctx is None:
+        return "default"
+    if ctx.client_id:
+        return ctx.client_id
+    request = ctx.request_context.request
+    session_id = request.headers.get("mcp-session-id") if request is not None else None
+    # Stateless HTTP sessions last one request, so their IDs would start a new cursor every call
+    return session_id or "default"
+
+
+@mcp.tool(
+    description="Gets new transcript turns of a live conversation. Returns: only turns added since your last call. Use when: monitoring an in-progress call without re-reading the whole transcript."
+)
+async def get_conversation_updates(
+    conversation_id: str,
+    follow: bool = False,
+    poll_interval_secs: float = 3.0,
+    max_wait_secs: int = 300,
+    reset_cursor: bool = False,
+    cursor_token: str | None = None,
+    ctx: Context = None,
+) -> TextContent:
+    """
+    Returns transcript turns added since this caller last asked.
+
+    Args:
+        conversation_id: Conversation to monitor
+        follow: Keep polling and stream new turns as progress/log notifications
+            until the call ends or max_wait_secs passes (false default)
+        poll_interval_secs: Seconds between polls when following (3 default)
+        max_wait_secs: Maximum time to follow (300 default)
+        reset_cursor: Start again from the first turn (false default)
+        cursor_token: Any name for your cursor; pass the same one on every call
+            to keep separate cursors for several monitors (optional)
+
+    The first call returns the transcript so far; later calls return only
+    new turns. A turn that was still growing is re-sent marked (updated).
+    Without a cursor token the cursor follows the client ID or MCP session.
+    """
+    caller = f"{current_scope() or 'default'}/{cursor_token or _cursor_caller(ctx)}"
+    if reset_cursor:
+        transcript_cursors.reset(caller, conversation_id)
+
+    poll_interval_secs = max(1.0, poll_interval_secs)
+    deadline = time.monotonic() + max(0, max_wait_secs)
+    new_turns: list[dict] = []
+    while True:
+        data = await in_tool_thread(fetch_conversation, custom_client, current_api_key(), conversation_id)
+        status = data.get("status", "unknown")
+        transcript = data.get("transcript") or []
+        turns = transcript_cursors.advance(caller, conversation_id, transcript)
+        new_turns.extend(turns)
+        if follow and turns and ctx is not None:
+            await ctx.info("\n".join(format_turn(turn) for turn in turns))
+            await ctx.report_progress(len(transcript))
+        if not follow or status in ["done", "failed"] or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(poll_interval_secs)
+
+    if status in ["done", "failed"]:
+        data.setdefault("conversation_id", conversation_id)
+        await in_tool_thread(get_transcript_store(current_scope()).ingest, data)
+
+    lines = [format_turn(turn) for turn in new_turns] or ["No new turns."]
+    return TextContent(
+        type="text",
+        text=f"Conversation {conversation_id} | Status: {status} | Turns: {len(transcript)} | New: {len(new_turns)}\n\n"
+        + "\n".join(lines),
+    )
+
+
 @mcp.tool(
     description="Lists agent conversations. Returns: conversation list with metadata. Use when: browsing conversation history."
 )
@@ -1353,13 +1952,13 @@ def list_conversations(
     
     try:
         response = custom_client.get(
-            "https://api.elevenlabs.io/v1/convai/conversations",
-            headers={"xi-api-key": api_key},
+            api_url("/v1/convai/conversations"),
+            headers={"xi-api-key": current_api_key()},
             params=params
         )
         
         if response.status_code != 200:
-            make_error(f"API error: {response.status_code} - {response.text}")
+            make_status_error("Failed to list conversations", response.status_code, response.text)
         
         data = response.json()
         conversations = data.get("conversations", [])
@@ -1390,8 +1989,305 @@ Started: {conv_started}"""
             text=f"Conversations (showing {len(conversations)} of {total}):\n\n{formatted_list}"
         )
         
+    except ElevenLabsMcpError:
+        raise
     except Exception as e:
-        make_error(f"Failed to list conversations: {str(e)}")
+        make_api_error("Failed to list conversations", e)
+
+
+@mcp.tool(
+    description="Syncs local conversation index. Returns: sync summary. Use when: refreshing local conversation metadata before querying it."
+)
+def sync_conversation_index(
+    agent_id: str | None = None,
+    max_pages: int = 50,
+) -> TextContent:
+    """
+    Incrementally syncs conversation metadata into the local SQLite index.
+
+    Args:
+        agent_id: Only sync this agent's conversations (all agents default)
+        max_pages: Maximum pages of 100 to fetch this run (50 default)
+
+    Only new conversations and ones still in progress are fetched.
+    Large backfills resume where the previous run stopped.
+    """
+    summary = get_conversation_index(current_scope()).sync(
+        custom_client, current_api_key(), agent_id=agent_id, max_pages=max_pages
+    )
+    return TextContent(type="text", text=json.dumps(summary, indent=2))
+
+
+@mcp.tool(
+    description="Queries local conversation index. Returns: JSON with matching conversations. Use when: filtering conversation history by agent, status, time or duration."
+)
+def query_conversations(
+    agent_id: str | None = None,
+    status: str | None = None,
+    started_after: str | None = None,
+    started_before: str | None = None,
+    min_duration_secs: int | None = None,
+    max_duration_secs: int | None = None,
+    sort_by: Literal["start_time", "duration", "message_count"] = "start_time",
+    sort_direction: Literal["asc", "desc"] = "desc",
+    limit: int = 50,
+    offset: int = 0,
+    sync: bool = False,
+) -> TextContent:
+    """
+    Filters and sorts conversations from the local index.
+
+    Args:
+        agent_id: Filter by agent (optional)
+        status: Filter by status: done, failed, in-progress, processing (optional)
+        started_after: ISO 8601 date/time or unix seconds, inclusive (optional)
+        started_before: ISO 8601 date/time or unix seconds, exclusive (optional)
+        min_duration_secs: Minimum call duration (optional)
+        max_duration_secs: Maximum call duration (optional)
+        sort_by: 'start_time', 'duration' or 'message_count' (start_time default)
+        sort_direction: 'asc' or 'desc' (desc default)
+        limit: Maximum rows to return, up to 1000 (50 default)
+        offset: Rows to skip for pagination (0 default)
+        sync: Wait for an incremental sync before querying (false default)
+
+    Queries run locally and return at once; an index last synced over a
+    minute ago is refreshed in the background for the next query.
+    """
+    index = get_conversation_index(current_scope())
+    sync_summary = None
+    refreshing = False
+    if sync:
+        sync_summary = index.sync(custom_client, current_api_key(), agent_id=agent_id)
+    else:
+        tenant = key_pool.current()
+        # The thread outlives this call, so it gets the tenant's own client rather than the proxy
+        refreshing = index.sync_in_background(tenant.http, tenant.api_key, agent_id=agent_id)
+    synced_secs_ago = index.synced_secs_ago(agent_id)
+
+    rows, total = index.query(
+        agent_id=agent_id,
+        status=status,
+        started_after=parse_timestamp(started_after),
+        started_before=parse_timestamp(started_before),
+        min_duration_secs=min_duration_secs,
+        max_duration_secs=max_duration_secs,
+        sort_by=sort_by,
+        sort_direction=sort_direction,
+        limit=max(1, min(limit, 1000)),
+        offset=max(0, offset),
+    )
+    for row in rows:
+        row["started_at"] = format_timestamp(row["start_time_unix_secs"])
+
+    result = {
+        "total_matching": total,
+        "returned": len(rows),
+        "offset": offset,
+        "index_synced_secs_ago": None if synced_secs_ago is None else int(synced_secs_ago),
+        "index_refreshing": refreshing,
+        "conversations": rows,
+    }
+    if synced_secs_ago is None:
+        result["note"] = "Index is being built in the background; query again shortly, or pass sync=true to wait."
+    elif sync_summary and not sync_summary["caught_up"]:
+        result["note"] = "Index is still backfilling; run sync_conversation_index() for older history."
+    return TextContent(type="text", text=json.dumps(result, indent=2))
+
+
+@mcp.tool(
+    description="Exports full conversations to JSONL or Parquet. Returns: export summary with file paths. Use when: bulk-downloading conversations with transcripts for QA or analysis."
+)
+async def export_conversations(
+    agent_id: str | None = None,
+    status: str | None = None,
+    started_after: str | None = None,
+    started_before: str | None = None,
+    min_duration_secs: int | None = None,
+    max_duration_secs: int | None = None,
+    format: Literal["jsonl", "parquet"] = "jsonl",
+    output_file_path: str | None = None,
+    output_directory: str | None = None,
+    cursor_file_path: str | None = None,
+    max_concurrency: int = 8,
+    requests_per_second: float = 10.0,
+) -> TextContent:
+    """
+    Exports full conversation details matching the filters.
+
+    Args:
+        agent_id: Filter by agent (optional)
+        status: Filter by status (optional)
+        started_after: ISO 8601 date/time or unix seconds, inclusive (optional)
+        started_before: ISO 8601 date/time or unix seconds, exclusive (optional)
+        min_duration_secs: Minimum call duration (optional)
+        max_duration_secs: Maximum call duration (optional)
+        format: 'jsonl' or 'parquet' (parquet needs pyarrow) (jsonl default)
+        output_file_path: Export file; reuse it to resume an export (optional)
+        output_directory: Save location when no file is given (Desktop default)
+        cursor_file_path: Resume cursor (defaults to output file + '.cursor')
+        max_concurrency: Parallel detail requests (8 default)
+        requests_per_second: Request rate cap (10 default)
+
+    Conversations are selected from the local index, which is synced first;
+    `index_caught_up` is false when the sync stopped at its page budget, and
+    running the export again picks up the rest. Records are streamed to disk
+    as they arrive; Parquet is written as one part file per 500 records.
+    """
+    if output_file_path:
+        output_path = make_output_path(os.path.dirname(output_file_path) or output_directory, base_path)
+        output_file = confined(output_path / os.path.basename(output_file_path))
+    else:
+        output_path = make_output_path(output_directory, base_path)
+        output_file = make_output_file(
+            "conversations", "export", output_path, "parquet" if format == "parquet" else "jsonl", full_id=True
+        )
+    cursor_file = (
+        confined(Path(cursor_file_path)) if cursor_file_path else output_file.with_name(output_file.name + ".cursor")
+    )
+
+    def run_export() -> dict:
+        index = get_conversation_index(current_scope())
+        sync_summary = index.sync(custom_client, current_api_key(), agent_id=agent_id)
+        conversation_ids = index.conversation_ids(
+            agent_id=agent_id,
+            status=status,
+            started_after=parse_timestamp(started_after),
+            started_before=parse_timestamp(started_before),
+            min_duration_secs=min_duration_secs,
+            max_duration_secs=max_duration_secs,
+        )
+        summary = export_conversation_records(
+            custom_client,
+            current_api_key(),
+            conversation_ids,
+            output_path=output_file,
+            cursor_path=cursor_file,
+            format=format,
+            max_concurrency=max_concurrency,
+            requests_per_second=requests_per_second,
+        )
+        summary["matching_conversations"] = len(conversation_ids)
+        summary["index_caught_up"] = sync_summary["caught_up"]
+        if not sync_summary["caught_up"]:
+            summary["note"] = "Index is still backfilling; run export_conversations() again with the same file to add older conversations."
+        return summary
+
+    summary = await in_tool_thread(run_export)
+    return TextContent(type="text", text=json.dumps(summary, indent=2))
+
+
+@mcp.tool(
+    description="Searches conversation transcripts by keyword. Returns: JSON with matching turns and snippets. Use when: finding conversations where someone said something specific."
+)
+async def search_transcripts(
+    query: str,
+    agent_id: str | None = None,
+    role: Literal["user", "agent"] | None = None,
+    started_after: str | None = None,
+    started_before: str | None = None,
+    limit: int = 20,
+    ingest: bool = True,
+    max_ingest: int = 500,
+) -> TextContent:
+    """
+    Full-text search over locally indexed conversation transcripts.
+
+    Args:
+        query: Words or FTS5 query, e.g. cancel, "cancel my subscription", refund OR chargeback
+        agent_id: Only search this agent's conversations (optional)
+        role: Only match 'user' or 'agent' turns (optional)
+        started_after: ISO 8601 date/time or unix seconds, inclusive (optional)
+        started_before: ISO 8601 date/time or unix seconds, exclusive (optional)
+        limit: Maximum matching turns, up to 200 (20 default)
+        ingest: Sync the index and ingest new transcripts first (true default)
+        max_ingest: Maximum new transcripts to fetch this call (500 default)
+
+    Only transcripts not yet ingested are fetched; searching is local.
+    """
+    if not query.strip():
+        make_error("Search query is required.", code="INVALID_QUERY")
+
+    def run_search() -> dict:
+        store = get_transcript_store(current_scope())
+        ingest_summary = None
+        if ingest:
+            get_conversation_index(current_scope()).sync(custom_client, current_api_key(), agent_id=agent_id)
+            ingest_summary = store.ingest_pending(
+                custom_client, current_api_key(), agent_id=agent_id, max_conversations=max_ingest
+            )
+        matches = store.search(
+            query,
+            agent_id=agent_id,
+            role=role,
+            started_after=parse_timestamp(started_after),
+            started_before=parse_timestamp(started_before),
+            limit=max(1, min(limit, 200)),
+        )
+        for match in matches:
+            match["conversation_started_at"] = format_timestamp(match.pop("start_time_unix_secs"))
+        result = {"query": query, "match_count": len(matches), "matches": matches, **store.stats()}
+        if ingest_summary and ingest_summary["more_pending"]:
+            result["note"] = "More transcripts are waiting to be ingested; search again to include them."
+        return result
+
+    result = await in_tool_thread(run_search)
+    return TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))
+
+
+@mcp.tool(
+    description="Computes aggregate conversation metrics. Returns: JSON report with percentiles and breakdowns. Use when: analyzing call volume, duration, talk time or outcomes across many conversations."
+)
+async def conversation_stats(
+    agent_id: str | None = None,
+    status: str | None = None,
+    started_after: str | None = None,
+    started_before: str | None = None,
+    min_duration_secs: int | None = None,
+    max_duration_secs: int | None = None,
+    sync: bool = True,
+    max_ingest: int = 500,
+) -> TextContent:
+    """
+    Aggregates metrics over conversations in the local index.
+
+    Args:
+        agent_id: Filter by agent (optional)
+        status: Filter by status (optional)
+        started_after: ISO 8601 date/time or unix seconds, inclusive (optional)
+        started_before: ISO 8601 date/time or unix seconds, exclusive (optional)
+        min_duration_secs: Minimum call duration (optional)
+        max_duration_secs: Maximum call duration (optional)
+        sync: Sync the index and ingest new transcripts first (true default)
+        max_ingest: Maximum new transcripts to fetch this call (500 default)
+
+    Reports duration and turn-count percentiles, agent/user talk time,
+    time to first response, and status and termination breakdowns by
+    agent and day. Talk-time metrics cover conversations whose transcripts
+    have been ingested.
+    """
+    filters = dict(
+        agent_id=agent_id,
+        status=status,
+        started_after=parse_timestamp(started_after),
+        started_before=parse_timestamp(started_before),
+        min_duration_secs=min_duration_secs,
+        max_duration_secs=max_duration_secs,
+    )
+
+    def run_stats() -> dict:
+        index = get_conversation_index(current_scope())
+        if sync:
+            index.sync(custom_client, current_api_key(), agent_id=agent_id)
+            if max_ingest > 0:
+                get_transcript_store(current_scope()).ingest_pending(
+                    custom_client, current_api_key(), agent_id=agent_id, max_conversations=max_ingest
+                )
+        from elevenlabs_mcp.conversation_stats import compute_stats
+
+        return compute_stats(index, **filters)
+
+    result = await in_tool_thread(run_stats)
+    return TextContent(type="text", text=json.dumps(result, indent=2))
 
 
 @mcp.tool(
@@ -1416,9 +2312,10 @@ async def get_conversation_transcript(
     Returns chunk metadata showing current/total chunks.
     """
     try:
-        response = custom_client.get(
-            f"https://api.elevenlabs.io/v1/convai/conversations/{conversation_id}",
-            headers={"xi-api-key": api_key}
+        response = await in_tool_thread(
+            custom_client.get,
+            api_url(f"/v1/convai/conversations/{conversation_id}"),
+            headers={"xi-api-key": current_api_key()},
         )
         
         if response.status_code == 404:
@@ -1428,11 +2325,7 @@ async def get_conversation_transcript(
                 suggestion="Check the conversation ID or use list_conversations() to see available conversations"
             )
         elif response.status_code != 200:
-            make_error(
-                f"API error: {response.status_code} - {response.text}",
-                code="API_ERROR",
-                suggestion="Check your API key and network connection"
-            )
+            make_status_error("Failed to fetch transcript", response.status_code, response.text)
         
         data = response.json()
         transcript_data = data.get("transcript", [])
@@ -1487,8 +2380,10 @@ async def get_conversation_transcript(
                 lines.append(f"{speaker}: {text}")
             return TextContent(type="text", text="\n".join(lines))
             
+    except ElevenLabsMcpError:
+        raise
     except Exception as e:
-        make_error(f"Failed to fetch transcript: {str(e)}")
+        make_api_error("Failed to fetch transcript", e)
 
 
 def count_dialogue_chars(inputs):
@@ -1501,6 +2396,33 @@ def count_dialogue_chars(inputs):
     return total
 
 
+def ensure_v3_proxy():
+    """Start the local v3 proxy unless a process running v3_proxy.py already exists."""
+    import subprocess
+    import psutil
+    import sys
+
+    with span("v3_proxy.check") as proxy_span:
+        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            try:
+                cmdline = proc.info.get('cmdline')
+                if cmdline and 'v3_proxy.py' in ' '.join(cmdline):
+                    proxy_span.set(running=True)
+                    return
+            except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
+                continue
+
+        proxy_span.set(running=False)
+        # Start proxy in background
+        proxy_path = os.path.join(os.path.dirname(__file__), 'v3_proxy.py')
+        subprocess.Popen([sys.executable, proxy_path],
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL)
+        # Give it a moment to start
+        time.sleep(2)
+        event("v3_proxy.started", path=proxy_path)
+
+
 def split_dialogue_chunks(inputs, max_chars=2800):  # Leave buffer for safety
     """Split dialogue into chunks that fit the 3000 char limit"""
     chunks = []
@@ -1543,7 +2465,7 @@ def text_to_dialogue(
                 stability = 0.5
             else:
                 stability = 1.0
-            print(f"Auto-adjusted stability from {original_stability} to {stability}")
+            event("stability.adjusted", requested=original_stability, used=stability)
         
         # Validate inputs
         if not inputs or not isinstance(inputs, list):
@@ -1557,28 +2479,31 @@ def text_to_dialogue(
                 # Validate and warn about invalid tags
                 invalid_tags = validate_and_warn_tags(input_item['text'])
                 if invalid_tags:
-                    print(f"Warning: Invalid tags found: {invalid_tags}")
+                    event("tags.invalid", tags=", ".join(invalid_tags))
         
         # Process inputs to get voice IDs
-        processed_inputs = []
-        for i, input_item in enumerate(inputs):
-            if not isinstance(input_item, dict):
-                make_error(f"Input {i} must be a dict with 'text' and 'voice_name'/'voice_id'")
-            
-            if "text" not in input_item:
-                make_error(f"Input {i} missing required 'text' field")
-            
-            if "voice_name" in input_item and "voice_id" not in input_item:
-                # Look up voice by name
-                voices = client.voices.get_all()
-                voice = next((v for v in voices.voices if v.name == input_item["voice_name"]), None)
-                if not voice:
-                    # Get list of available voice names for better error message
-                    available_voices = [v.name for v in voices.voices]
-                    v3_voices = ["James", "Jane", "Juniper", "Mark", "Arabella", "Hope"]
-                    available_v3 = [v for v in v3_voices if v in available_voices]
-                    
-                    make_error(f"""Voice '{input_item['voice_name']}' not found for dialogue!
+        with span("voice.resolve", turns=len(inputs)):
+            processed_inputs = []
+            voices = None
+            for i, input_item in enumerate(inputs):
+                if not isinstance(input_item, dict):
+                    make_error(f"Input {i} must be a dict with 'text' and 'voice_name'/'voice_id'")
+
+                if "text" not in input_item:
+                    make_error(f"Input {i} missing required 'text' field")
+
+                if "voice_name" in input_item and "voice_id" not in input_item:
+                    # Look up voice by name, listing voices at most once per dialogue
+                    if voices is None:
+                        voices = api_flights.do("voices.get_all", client.voices.get_all)
+                    voice = next((v for v in voices.voices if v.name == input_item["voice_name"]), None)
+                    if not voice:
+                        # Get list of available voice names for better error message
+                        available_voices = [v.name for v in voices.voices]
+                        v3_voices = ["James", "Jane", "Juniper", "Mark", "Arabella", "Hope"]
+                        available_v3 = [v for v in v3_voices if v in available_voices]
+
+                        make_error(f"""Voice '{input_item['voice_name']}' not found for dialogue!
                     
 🎯 QUICK FIX - Use these v3-optimized voices:
 {chr(10).join(f'- "{v}"' for v in available_v3[:6])}
@@ -1590,111 +2515,88 @@ inputs = [
 ]
 
 💡 PRO TIP: Call search_voices("v3") to see all v3-optimized voices!""")
-                voice_id = voice.voice_id
-            else:
-                voice_id = input_item.get("voice_id")
-                if not voice_id:
-                    make_error(f"Input {i} must have either voice_id or voice_name")
-            
-            processed_inputs.append({
-                "text": input_item["text"],
-                "voice_id": voice_id
-            })
+                    voice_id = voice.voice_id
+                else:
+                    voice_id = input_item.get("voice_id")
+                    if not voice_id:
+                        make_error(f"Input {i} must have either voice_id or voice_name")
+
+                processed_inputs.append({
+                    "text": input_item["text"],
+                    "voice_id": voice_id
+                })
         
         # Check character count and split if needed
         total_chars = count_dialogue_chars(processed_inputs)
         
-        if total_chars > 3000:
-            print(f"Dialogue exceeds 3000 char limit ({total_chars} chars). Auto-splitting into chunks...")
-            chunks = split_dialogue_chunks(processed_inputs)
-            print(f"Split into {len(chunks)} chunks")
-        else:
-            chunks = [processed_inputs]
+        with span("dialogue.split", characters=total_chars) as split_span:
+            if total_chars > 3000:
+                chunks = split_dialogue_chunks(processed_inputs)
+            else:
+                chunks = [processed_inputs]
+            split_span.set(chunks=len(chunks))
         
         # Process each chunk
         output_files = []
         
         for chunk_idx, chunk in enumerate(chunks):
-            # Check if v3 proxy is enabled
-            if v3_proxy_enabled:
-                # Ensure proxy is running
-                import subprocess
-                import psutil
-                import sys
-                
-                # Check if proxy is already running
-                proxy_running = False
-                for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            with span("dialogue.chunk", index=chunk_idx, characters=count_dialogue_chars(chunk)):
+                # Check if v3 proxy is enabled
+                if v3_proxy_enabled:
+                    ensure_v3_proxy()
+                    # Use proxy endpoint
+                    endpoint = f"{v3_proxy_url}/v1/text-to-dialogue/stream"
+                else:
+                    # Use direct API endpoint (requires v3 access)
+                    endpoint = api_url("/v1/text-to-dialogue/stream")
+
+                # Make API call to text-to-dialogue endpoint
+                response = custom_client.post(
+                endpoint,
+                json={
+                    "inputs": chunk,
+                    "model_id": "eleven_v3",
+                    "settings": {
+                        "quality": None,
+                        "similarity_boost": similarity_boost,
+                        "stability": stability
+                    }
+                },
+                headers={
+                    "xi-api-key": current_api_key(),
+                    "Content-Type": "application/json",
+                    "Accept": "audio/mpeg"
+                } if not v3_proxy_enabled else {
+                    "Content-Type": "application/json",
+                    "Accept": "audio/mpeg"
+                },
+                timeout=calculate_dialogue_timeout(chunk)
+                )
+
+                if response.status_code == 403:
+                    make_error("v3 access denied. You need special access from ElevenLabs sales")
+                elif response.status_code == 422:
                     try:
-                        cmdline = proc.info.get('cmdline')
-                        if cmdline and 'v3_proxy.py' in ' '.join(cmdline):
-                            proxy_running = True
-                            break
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, AttributeError):
-                        continue
-                
-                if not proxy_running:
-                    # Start proxy in background
-                    proxy_path = os.path.join(os.path.dirname(__file__), 'v3_proxy.py')
-                    subprocess.Popen([sys.executable, proxy_path], 
-                                   stdout=subprocess.DEVNULL, 
-                                   stderr=subprocess.DEVNULL)
-                    # Give it a moment to start
-                    import time
-                    time.sleep(2)
-                
-                # Use proxy endpoint
-                endpoint = f"{v3_proxy_url}/v1/text-to-dialogue/stream"
-            else:
-                # Use direct API endpoint (requires v3 access)
-                endpoint = "https://api.elevenlabs.io/v1/text-to-dialogue/stream"
-            
-            # Make API call to text-to-dialogue endpoint
-            response = httpx.post(
-            endpoint,
-            json={
-                "inputs": chunk,
-                "model_id": "eleven_v3",
-                "settings": {
-                    "quality": None,
-                    "similarity_boost": similarity_boost,
-                    "stability": stability
-                }
-            },
-            headers={
-                "xi-api-key": api_key,
-                "Content-Type": "application/json",
-                "Accept": "audio/mpeg"
-            } if not v3_proxy_enabled else {
-                "Content-Type": "application/json",
-                "Accept": "audio/mpeg"
-            },
-            timeout=calculate_dialogue_timeout(chunk)
-            )
-            
-            if response.status_code == 403:
-                make_error("v3 access denied. You need special access from ElevenLabs sales")
-            elif response.status_code == 422:
-                try:
-                    error_detail = response.json()
-                    make_error(f"Parameter validation error: {error_detail}")
-                except:
-                    make_error(f"API error: {response.status_code} - {response.text}")
-            elif response.status_code != 200:
-                make_error(f"API error: {response.status_code} - {response.text}")
-            
-            # Save audio file
-            output_path = make_output_path(output_directory, base_path)
-            if len(chunks) > 1:
-                output_file_name = make_output_file("dialogue", f"v3_dialogue_part{chunk_idx+1}", output_path, "mp3")
-            else:
-                output_file_name = make_output_file("dialogue", "v3_dialogue", output_path, "mp3")
-            
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path / output_file_name, "wb") as f:
-                f.write(response.content)
-            
-            output_files.append(output_path / output_file_name)
+                        error_detail = response.json()
+                        make_error(f"Parameter validation error: {error_detail}")
+                    except:
+                        make_status_error("Failed to generate dialogue", response.status_code, response.text)
+                elif response.status_code != 200:
+                    make_status_error("Failed to generate dialogue", response.status_code, response.text)
+
+                # Save audio file
+                output_path = make_output_path(output_directory, base_path)
+                if len(chunks) > 1:
+                    output_file_name = make_output_file("dialogue", f"v3_dialogue_part{chunk_idx+1}", output_path, "mp3")
+                else:
+                    output_file_name = make_output_file("dialogue", "v3_dialogue", output_path, "mp3")
+
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with span("file.write", bytes=len(response.content)):
+                    with open(output_path / output_file_name, "wb") as f:
+                        f.write(response.content)
+
+                output_files.append(output_path / output_file_name)
         
         # Return success message
         if len(output_files) == 1:
@@ -1709,8 +2611,10 @@ inputs = [
                 text=f"Success. Dialogue split into {len(output_files)} parts:\n{files_list}"
             )
         
+    except ElevenLabsMcpError:
+        raise
     except Exception as e:
-        make_error(f"Failed to generate dialogue: {str(e)}")
+        make_api_error("Failed to generate dialogue", e)
 
 
 @mcp.tool(
@@ -1721,20 +2625,20 @@ def enhance_dialogue(
 ) -> TextContent:
     try:
         # Make API call to enhance-dialogue endpoint
-        response = httpx.post(
-            "https://api.elevenlabs.io/v1/enhance-dialogue",
+        response = custom_client.post(
+            api_url("/v1/enhance-dialogue"),
             json={
                 "dialogue_blocks": dialogue_blocks
             },
             headers={
-                "xi-api-key": api_key,
+                "xi-api-key": current_api_key(),
                 "Content-Type": "application/json"
             },
             timeout=30.0
         )
         
         if response.status_code != 200:
-            make_error(f"API error: {response.status_code} - {response.text}")
+            make_status_error("Failed to enhance dialogue", response.status_code, response.text)
         
         result = response.json()
         
@@ -1750,8 +2654,10 @@ def enhance_dialogue(
             text=f"Enhanced dialogue:\n\n{enhanced_text}\n\nYou can now use this enhanced text with the text_to_dialogue or text_to_speech tools."
         )
         
+    except ElevenLabsMcpError:
+        raise
     except Exception as e:
-        make_error(f"Failed to enhance dialogue: {str(e)}")
+        make_api_error("Failed to enhance dialogue", e)
 
 
 @mcp.tool(
@@ -1896,9 +2802,121 @@ Remember: The key to great v3 audio is experimentation. Try different combinatio
     )
 
 
-def main():
-    """Run the MCP server"""
-    mcp.run()
+# Background warm-up waits this long so it does not compete with the client's initialize handshake
+WARM_UP_DELAY_SECS = 1.0
+
+
+def warm_up():
+    """Size the governor and fill the voice caches of the server's own key in the background."""
+    tenant = key_pool.default
+    tenant.governor.size_in_background(lambda: subscription_tier(tenant))
+    tenant.voice_catalog.start()
+    get_shared_voice_library().prefetch()
+
+
+TRANSPORTS = ("stdio", "http", "sse")
+
+
+def start_background_work():
+    """Start the metrics exporters and, shortly after, the warm-up."""
+    server_metrics.start_exporters(workers=int(os.getenv("ELEVENLABS_MCP_WORKERS", "1")))
+    warm_up_timer = threading.Timer(WARM_UP_DELAY_SECS, warm_up)
+    warm_up_timer.daemon = True
+    warm_up_timer.start()
+
+
+def http_app():
+    """
+    ASGI app of the HTTP transport in ELEVENLABS_MCP_TRANSPORT, for `uvicorn --factory`.
+
+    Streamable HTTP is served at /mcp, SSE at /sse. Every worker process
+    builds its own; with more than one worker, requests of one client can
+    reach any of them, so sessions are stateless. Refuses to build an app
+    that would be reachable beyond loopback without a bearer token.
+    """
+    host = os.getenv("ELEVENLABS_MCP_HOST", "127.0.0.1")
+    allowed_hosts = parse_hosts(os.getenv("ELEVENLABS_MCP_ALLOWED_HOSTS"))
+    token = auth_token()
+    check_bind(host, token, allowed_hosts)
+    mcp.settings.host = host
+    mcp.settings.port = int(os.getenv("ELEVENLABS_MCP_PORT", "8000"))
+    mcp.settings.stateless_http = int(os.getenv("ELEVENLABS_MCP_WORKERS", "1")) > 1
+    mcp.settings.transport_security = transport_security(host, allowed_hosts)
+    start_background_work()
+    if os.getenv("ELEVENLABS_MCP_TRANSPORT", "http") == "sse":
+        app = mcp.sse_app()
+    else:
+        app = mcp.streamable_http_app()
+    return AccessMiddleware(app, token, client_keys=client_keys_enabled())
+
+
+def main(argv: list[str] | None = None):
+    """Run the MCP server over stdio, or as a long-lived HTTP service"""
+    parser = argparse.ArgumentParser(prog="elevenlabs-mcp", description="ElevenLabs MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.getenv("ELEVENLABS_MCP_TRANSPORT", "stdio"),
+        help="stdio for one client (default), http for streamable HTTP at /mcp, sse for the legacy SSE transport",
+    )
+    parser.add_argument(
+        "--host", default=os.getenv("ELEVENLABS_MCP_HOST", "127.0.0.1"), help="Bind address (127.0.0.1 default)"
+    )
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("ELEVENLABS_MCP_PORT", "8000")), help="Port (8000 default)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("ELEVENLABS_MCP_WORKERS", "1")),
+        help="Worker processes for --transport http (1 default)",
+    )
+    parser.add_argument(
+        "--allowed-hosts",
+        default=os.getenv("ELEVENLABS_MCP_ALLOWED_HOSTS", ""),
+        help="Comma-separated host names clients may reach the server by, besides loopback and --host",
+    )
+    parser.add_argument(
+        "--client-keys",
+        action="store_true",
+        default=client_keys_enabled(),
+        help="Let clients send their own API key in the xi-api-key header (see key_pool.py)",
+    )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.transport == "stdio":
+        start_background_work()
+        mcp.run()
+        return
+    if args.transport == "sse" and args.workers > 1:
+        parser.error("--workers needs --transport http; SSE sessions live in one process")
+    try:
+        check_bind(args.host, auth_token(), parse_hosts(args.allowed_hosts))
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Read by http_app in every worker process
+    os.environ["ELEVENLABS_MCP_TRANSPORT"] = args.transport
+    os.environ["ELEVENLABS_MCP_HOST"] = args.host
+    os.environ["ELEVENLABS_MCP_PORT"] = str(args.port)
+    os.environ["ELEVENLABS_MCP_WORKERS"] = str(args.workers)
+    os.environ["ELEVENLABS_MCP_ALLOWED_HOSTS"] = args.allowed_hosts
+    os.environ[CLIENT_KEYS_ENV] = "1" if args.client_keys else ""
+    if args.workers > 1:
+        # Workers share cached API reads; the voice catalog is shared through its snapshot file
+        os.environ.setdefault("ELEVENLABS_MCP_CACHE_BACKEND", "sqlite")
+    import uvicorn
+
+    uvicorn.run(
+        "elevenlabs_mcp.server:http_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        log_level=mcp.settings.log_level.lower(),
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,291 @@
+"""
+Cached, locally filterable view of the shared voice library.
+
+Each library search term maps to a cache entry holding the matching voices as
+NumPy columns. The first page is fetched on demand and the rest are prefetched
+concurrently in the background, so filtering by gender, accent, language or
+use case and paging through results are array operations instead of one
+`voices.get_shared` call per page. Entries expire after a TTL; an expired
+entry keeps answering while its replacement is fetched.
+
+At most MAX_PAGES pages are cached per entry. When a search matches more
+voices than that, its entry is truncated and filtering it locally would miss
+voices, so filtered searches get entries of their own, fetched with the
+filters applied upstream.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from elevenlabs_mcp.concurrency import map_concurrent
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+PAGE_SIZE = 100
+MAX_PAGES = 50
+MAX_ENTRIES = 32
+TTL_SECS = 3600
+TEXT_COLUMNS = (
+    "voice_id",
+    "public_owner_id",
+    "name",
+    "category",
+    "gender",
+    "age",
+    "accent",
+    "language",
+    "use_case",
+    "descriptive",
+    "description",
+    "preview_url",
+)
+NUMBER_COLUMNS = ("cloned_by_count", "date_unix")
+FILTER_COLUMNS = ("gender", "age", "accent", "use_case", "category")
+# Filters `voices.get_shared` applies itself, by its parameter names
+UPSTREAM_FILTERS = {
+    "gender": "gender",
+    "age": "age",
+    "accent": "accent",
+    "language": "language",
+    "use_case": "use_cases",
+    "category": "category",
+}
+SORT_COLUMNS = {"most_cloned": "cloned_by_count", "newest": "date_unix"}
+
+
+class SharedVoiceTable:
+    """Voices for one search term and upstream filters, appended page by page and read as columns."""
+
+    def __init__(self, search: str | None, filters: dict[str, str] | None = None):
+        self.search = search
+        self.filters = filters or {}
+        self.created_at = time.time()
+        # Pages are still being fetched
+        self.loading = True
+        # Every matching voice was fetched; false while loading, after an error or when truncated
+        self.complete = False
+        # More voices match than MAX_PAGES pages hold
+        self.truncated = False
+        self.error: str | None = None
+        self._rows: dict[str, tuple[int, dict]] = {}
+        self._columns: dict[str, np.ndarray] | None = None
+        self._lock = threading.Lock()
+
+    def add_page(self, page: int, voices: list) -> None:
+        with self._lock:
+            for position, voice in enumerate(voices):
+                rank = page * PAGE_SIZE + position
+                if voice.voice_id in self._rows and self._rows[voice.voice_id][0] <= rank:
+                    continue
+                languages = {voice.language or ""}
+                languages.update(lang.language or "" for lang in voice.verified_languages or [])
+                row = {column: getattr(voice, column, None) or "" for column in TEXT_COLUMNS}
+                row.update({column: getattr(voice, column, None) or 0 for column in NUMBER_COLUMNS})
+                row["languages"] = "|" + "|".join(sorted(languages - {""})).lower() + "|"
+                row["verified_languages"] = [
+                    {"language": lang.language, "accent": lang.accent, "locale": lang.locale}
+                    for lang in voice.verified_languages or []
+                ]
+                self._rows[voice.voice_id] = (rank, row)
+            self._columns = None
+
+    def columns(self) -> dict[str, np.ndarray]:
+        with self._lock:
+            if self._columns is None:
+                rows = [row for _, row in sorted(self._rows.values(), key=lambda item: item[0])]
+                columns = {
+                    column: np.array([row[column] for row in rows], dtype=str)
+                    for column in (*TEXT_COLUMNS, "languages")
+                }
+                for column in NUMBER_COLUMNS:
+                    columns[column] = np.array([row[column] for row in rows], dtype=np.int64)
+                for column in FILTER_COLUMNS:
+                    columns[f"{column}_lower"] = np.char.lower(columns[column])
+                # Filled element-wise so NumPy keeps one list per row instead of a 2-D array
+                verified = np.empty(len(rows), dtype=object)
+                verified[:] = [row["verified_languages"] for row in rows]
+                columns["verified_languages"] = verified
+                self._columns = columns
+            return self._columns
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def filter_voices(
+    columns: dict[str, np.ndarray],
+    gender: str | None = None,
+    age: str | None = None,
+    accent: str | None = None,
+    language: str | None = None,
+    use_case: str | None = None,
+    category: str | None = None,
+    sort: str = "relevance",
+) -> np.ndarray:
+    """Row indices matching every given filter, in the requested order."""
+    mask = np.ones(columns["voice_id"].size, dtype=bool)
+    for column, value in (
+        ("gender", gender),
+        ("age", age),
+        ("accent", accent),
+        ("use_case", use_case),
+        ("category", category),
+    ):
+        if value:
+            mask &= columns[f"{column}_lower"] == value.lower()
+    if language:
+        mask &= np.char.find(columns["languages"], f"|{language.lower()}|") >= 0
+    indices = np.flatnonzero(mask)
+    if sort in SORT_COLUMNS:
+        values = columns[SORT_COLUMNS[sort]][indices]
+        indices = indices[np.argsort(-values, kind="stable")]
+    return indices
+
+
+def voice_rows(columns: dict[str, np.ndarray], indices: np.ndarray) -> list[dict]:
+    rows = []
+    for i in indices:
+        row = {column: str(columns[column][i]) for column in TEXT_COLUMNS if columns[column][i]}
+        row.update({column: int(columns[column][i]) for column in NUMBER_COLUMNS})
+        if columns["verified_languages"][i]:
+            row["verified_languages"] = columns["verified_languages"][i]
+        rows.append(row)
+    return rows
+
+
+class SharedVoiceLibrary:
+    def __init__(
+        self,
+        client: ElevenLabs,
+        ttl_secs: float = TTL_SECS,
+        max_pages: int = MAX_PAGES,
+        max_concurrency: int = 8,
+    ):
+        self.client = client
+        self.ttl_secs = ttl_secs
+        self.max_pages = max_pages
+        self.max_concurrency = max_concurrency
+        self._entries: OrderedDict[tuple, SharedVoiceTable] = OrderedDict()
+        self._refreshing: set[tuple] = set()
+        self._lock = threading.Lock()
+
+    def _fetch_page(self, table: SharedVoiceTable, page: int):
+        upstream = {UPSTREAM_FILTERS[name]: value for name, value in table.filters.items()}
+        return self.client.voices.get_shared(page=page, page_size=PAGE_SIZE, search=table.search, **upstream)
+
+    def _fill(self, table: SharedVoiceTable, first_page=None) -> None:
+        """Fetch the pages for `table`, up to `max_pages`, `max_concurrency` at a time."""
+        try:
+            if first_page is None:
+                first_page = self._fetch_page(table, 0)
+                table.add_page(0, first_page.voices)
+            exhausted = not first_page.has_more or not first_page.voices
+            if first_page.total_count:
+                pages = -(-first_page.total_count // PAGE_SIZE)
+                table.truncated = pages > self.max_pages
+                last_page = min(pages, self.max_pages)
+            else:
+                last_page = self.max_pages
+            next_page = 1
+            while not exhausted and next_page < last_page:
+                window = range(next_page, min(next_page + self.max_concurrency, last_page))
+                for page, response, error in map_concurrent(
+                    lambda page: self._fetch_page(table, page),
+                    window,
+                    max_workers=self.max_concurrency,
+                ):
+                    if error is not None:
+                        raise error
+                    table.add_page(page, response.voices)
+                    exhausted = exhausted or not response.has_more or not response.voices
+                next_page = window.stop
+            # Paging stopped at max_pages with voices left upstream
+            table.truncated = table.truncated or not exhausted and last_page >= self.max_pages
+            table.complete = not table.truncated
+        except Exception as e:
+            table.error = str(e)
+        finally:
+            table.loading = False
+
+    def _store(self, key: tuple, table: SharedVoiceTable) -> None:
+        with self._lock:
+            self._entries[key] = table
+            self._entries.move_to_end(key)
+            self._refreshing.discard(key)
+            while len(self._entries) > MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: tuple, search: str | None, filters: dict[str, str]) -> None:
+        table = SharedVoiceTable(search, filters)
+        self._fill(table)
+        if table.error is None or key not in self._entries:
+            self._store(key, table)
+        else:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def prefetch(self, search: str | None = None, **filters: str | None) -> None:
+        """Fill the cache for `search` and the upstream `filters` on a background thread."""
+        filters = upstream_filters(filters)
+        key = cache_key(search, filters)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, search, filters), daemon=True).start()
+
+    def _cached(self, key: tuple, search: str | None, filters: dict[str, str]) -> tuple[SharedVoiceTable, bool] | None:
+        with self._lock:
+            table = self._entries.get(key)
+            if table is None:
+                return None
+            self._entries.move_to_end(key)
+        expired = time.time() - table.created_at > self.ttl_secs
+        if expired:
+            self.prefetch(search, **filters)
+        return table, expired
+
+    def table(self, search: str | None = None, **filters: str | None) -> tuple[SharedVoiceTable, bool]:
+        """
+        Cache entry to filter locally for `search` and `filters`, and whether it is past its TTL.
+
+        `filters` are any of UPSTREAM_FILTERS. The entry for `search` alone
+        serves them unless it is truncated; otherwise, and on a miss, the
+        entry for `search` and `filters` is used, created from its first
+        page with the remaining pages prefetched in the background. An
+        expired entry is returned as is while a replacement is fetched.
+        """
+        filters = upstream_filters(filters)
+        if filters:
+            cached = self._cached(cache_key(search, {}), search, {})
+            if cached is not None and not cached[0].truncated:
+                return cached
+        key = cache_key(search, filters)
+        cached = self._cached(key, search, filters)
+        if cached is not None:
+            return cached
+
+        table = SharedVoiceTable(search, filters)
+        first_page = self._fetch_page(table, 0)
+        table.add_page(0, first_page.voices)
+        self._store(key, table)
+        threading.Thread(target=self._fill, args=(table, first_page), daemon=True).start()
+        return table, False
+
+
+def upstream_filters(filters: dict[str, str | None]) -> dict[str, str]:
+    unknown = filters.keys() - UPSTREAM_FILTERS.keys()
+    if unknown:
+        raise TypeError(f"Unknown shared voice filters: {', '.join(sorted(unknown))}")
+    return {name: value.strip().lower() for name, value in filters.items() if value and value.strip()}
+
+
+def cache_key(search: str | None, filters: dict[str, str]) -> tuple:
+    return ((search or "").strip().lower(), *sorted(filters.items()))
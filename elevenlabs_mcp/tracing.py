@@ -0,0 +1,431 @@
+"""
+Lightweight span tracing for tool calls.
+
+A span is opened per tool call and around the steps worth seeing inside it
+(voice resolution, chunk splitting, proxy checks, file writes), and one per
+upstream HTTP request, from sending it to closing its response body. The
+current span lives in a context variable, so nesting follows the call stack
+and carries into worker threads started by the tool executor or
+`map_concurrent`. Diagnostics are recorded as span events and logged at
+debug level, never printed: on the stdio transport stdout carries the
+protocol.
+
+Finished spans are exported when configured:
+
+- ELEVENLABS_MCP_TRACE_FILE: append one JSON object per span to this file
+  (ELEVENLABS_MCP_TRACING=1 uses traces.jsonl in the data directory)
+- OTEL_EXPORTER_OTLP_TRACES_ENDPOINT or OTEL_EXPORTER_OTLP_ENDPOINT: send
+  batches to an OpenTelemetry collector over OTLP/HTTP (JSON encoding)
+
+`python -m elevenlabs_mcp.tracing traces.jsonl` prints the span tree of the
+latest trace with its critical path marked.
+"""
+
+import argparse
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import httpx
+
+from elevenlabs_mcp.utils import ElevenLabsMcpError, get_data_dir
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "elevenlabs-mcp"
+OTLP_BATCH_SIZE = 256
+OTLP_FLUSH_SECS = 5.0
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start_ns: int
+    end_ns: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    events: list[dict] = field(default_factory=list)
+    error: str | None = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def event(self, name: str, **attributes) -> None:
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+    def as_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            "attributes": self.attributes,
+            "events": self.events,
+            "error": self.error,
+        }
+
+
+class JsonlExporter:
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.as_dict(), default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict) -> list[dict]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class OtlpExporter:
+    """Batches spans to an OTLP/HTTP collector from a background thread."""
+
+    def __init__(self, endpoint: str):
+        endpoint = endpoint.rstrip("/")
+        self.url = endpoint if endpoint.endswith("/v1/traces") else f"{endpoint}/v1/traces"
+        # Not the API client: trace export must not be metered, throttled or traced itself
+        self._client = httpx.Client(timeout=10.0)
+        self._queue: queue.Queue[Span] = queue.Queue(maxsize=OTLP_BATCH_SIZE * 16)
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def export(self, span: Span) -> None:
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            logger.debug("Dropping span %s: OTLP queue full", span.name)
+
+    def _encode(self, spans: list[Span]) -> dict:
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "elevenlabs_mcp"},
+                            "spans": [
+                                {
+                                    "traceId": span.trace_id,
+                                    "spanId": span.span_id,
+                                    **({"parentSpanId": span.parent_id} if span.parent_id else {}),
+                                    "name": span.name,
+                                    "kind": 3 if span.name.startswith("http ") else 1,
+                                    "startTimeUnixNano": str(span.start_ns),
+                                    "endTimeUnixNano": str(span.end_ns),
+                                    "attributes": _otlp_attributes(span.attributes),
+                                    "events": [
+                                        {
+                                            "timeUnixNano": str(event["time_ns"]),
+                                            "name": event["name"],
+                                            "attributes": _otlp_attributes(event["attributes"]),
+                                        }
+                                        for event in span.events
+                                    ],
+                                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                                }
+                                for span in spans
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + OTLP_FLUSH_SECS
+            while len(batch) < OTLP_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                response = self._client.post(self.url, json=self._encode(batch))
+                if response.status_code >= 400:
+                    logger.warning("OTLP export returned %d: %s", response.status_code, response.text[:200])
+            except httpx.HTTPError as e:
+                logger.warning("OTLP export to %s failed: %s", self.url, e)
+
+
+class Tracer:
+    def __init__(self, exporters: list | None = None):
+        self.exporters = exporters if exporters is not None else exporters_from_env()
+        self._current: contextvars.ContextVar[Span | None] = contextvars.ContextVar(
+            "elevenlabs_mcp_span", default=None
+        )
+
+    def current(self) -> Span | None:
+        return self._current.get()
+
+    def attach(self, span: Span) -> contextvars.Token:
+        """Make `span` current until detach() is called with the returned token."""
+        return self._current.set(span)
+
+    def detach(self, token: contextvars.Token) -> None:
+        self._current.reset(token)
+
+    def start(self, name: str, **attributes) -> Span:
+        """Open a span as a child of the current one, without making it current."""
+        parent = self._current.get()
+        return Span(
+            name=name,
+            trace_id=parent.trace_id if parent else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id if parent else None,
+            start_ns=time.time_ns(),
+            attributes=attributes,
+        )
+
+    def finish(self, span: Span, error: BaseException | None = None) -> None:
+        if span.end_ns is not None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = error.message if isinstance(error, ElevenLabsMcpError) else f"{type(error).__name__}: {error}"
+            if isinstance(error, ElevenLabsMcpError) and error.code:
+                span.attributes["error.code"] = error.code
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning("Span export failed: %s", e)
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Run the block inside a new child span."""
+        span = self.start(name, **attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.finish(span, e)
+            raise
+        finally:
+            self._current.reset(token)
+            self.finish(span)
+
+    def event(self, name: str, **attributes) -> None:
+        """Record a diagnostic on the current span and log it."""
+        span = self._current.get()
+        if span is not None:
+            span.event(name, **attributes)
+        logger.debug("%s %s", name, attributes)
+
+    def instrument(self, fn: Callable) -> Callable:
+        """Wrap a tool function so each call is a root span; keeps the signature FastMCP inspects."""
+        name = f"tool {fn.__name__}"
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+def exporters_from_env() -> list:
+    exporters = []
+    path = os.environ.get("ELEVENLABS_MCP_TRACE_FILE")
+    if not path and os.environ.get("ELEVENLABS_MCP_TRACING", "").lower() in ("1", "true", "yes"):
+        path = str(get_data_dir() / "traces.jsonl")
+    if path:
+        exporters.append(JsonlExporter(Path(os.path.expanduser(path))))
+    endpoint = os.environ.get("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT") or os.environ.get(
+        "OTEL_EXPORTER_OTLP_ENDPOINT"
+    )
+    if endpoint:
+        exporters.append(OtlpExporter(endpoint))
+    return exporters
+
+
+class _TracedStream(httpx.SyncByteStream):
+    """Response body that ends the request's span once it is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, tracer: Tracer, span: Span):
+        self._stream = stream
+        self._tracer = tracer
+        self._span = span
+        self._bytes = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._bytes += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._span.set(**{"http.response_bytes": self._bytes})
+            self._tracer.finish(self._span)
+
+
+class TracedTransport(httpx.BaseTransport):
+    """httpx transport opening a span per request; layers below add events to it."""
+
+    def __init__(self, transport: httpx.BaseTransport, tracer: Tracer):
+        self.transport = transport
+        self.tracer = tracer
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        span = self.tracer.start(
+            f"http {request.method} {request.url.path}",
+            **{"http.method": request.method, "http.url": str(request.url.copy_with(query=None))},
+        )
+        token = self.tracer.attach(span)
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException as e:
+            self.tracer.finish(span, e)
+            raise
+        finally:
+            self.tracer.detach(token)
+        span.set(**{"http.status_code": response.status_code})
+        if response.status_code >= 400:
+            span.error = f"HTTP {response.status_code}"
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TracedStream(response.stream, self.tracer, span),
+            extensions=response.extensions,
+        )
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+tracer = Tracer([])
+
+
+def configure_from_env() -> Tracer:
+    """Attach the exporters configured in the environment to the module tracer."""
+    tracer.exporters = exporters_from_env()
+    return tracer
+
+
+def span(name: str, **attributes):
+    """Context manager for a child span of the module tracer."""
+    return tracer.span(name, **attributes)
+
+
+def event(name: str, **attributes) -> None:
+    tracer.event(name, **attributes)
+
+
+def critical_path(spans: list[dict], root: dict) -> list[dict]:
+    """
+    Spans on the critical path under `root`: walking back from its end, the
+    child that finished last, then recursively the one that finished last
+    before that child started, and so on.
+    """
+    children: dict[str, list[dict]] = {}
+    for item in spans:
+        children.setdefault(item["parent_id"], []).append(item)
+
+    def walk(node: dict) -> list[dict]:
+        path = [node]
+        cursor = node["end_ns"]
+        for child in sorted(children.get(node["span_id"], []), key=lambda s: s["end_ns"], reverse=True):
+            if child["end_ns"] <= cursor:
+                path.extend(walk(child))
+                cursor = child["start_ns"]
+        return path
+
+    return sorted(walk(root), key=lambda s: s["start_ns"])
+
+
+def format_trace(spans: list[dict]) -> str:
+    """Indented span tree with offsets and durations; critical-path spans are starred."""
+    root = min(spans, key=lambda item: (item["parent_id"] is not None, item["start_ns"]))
+    on_path = {item["span_id"] for item in critical_path(spans, root)}
+    children: dict[str, list[dict]] = {}
+    for item in spans:
+        children.setdefault(item["parent_id"], []).append(item)
+
+    lines = []
+
+    def render(node: dict, depth: int) -> None:
+        offset = (node["start_ns"] - root["start_ns"]) / 1e6
+        marker = "*" if node["span_id"] in on_path else " "
+        error = f"  ERROR {node['error']}" if node.get("error") else ""
+        lines.append(f"{marker} {offset:9.1f} ms {node['duration_ms']:9.1f} ms  {'  ' * depth}{node['name']}{error}")
+        for item in node.get("events", []):
+            event_offset = (item["time_ns"] - root["start_ns"]) / 1e6
+            lines.append(f"  {event_offset:9.1f} ms {'':12}  {'  ' * (depth + 1)}- {item['name']} {item['attributes']}")
+        for child in sorted(children.get(node["span_id"], []), key=lambda s: s["start_ns"]):
+            render(child, depth + 1)
+
+    render(root, 0)
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Show a trace from a JSONL span file with its critical path.")
+    parser.add_argument("file", type=Path, help="JSONL file written by ELEVENLABS_MCP_TRACE_FILE")
+    parser.add_argument("--trace", help="Trace ID (latest trace default)")
+    parser.add_argument("--tool", help="Latest trace of this tool, e.g. text_to_dialogue")
+    args = parser.parse_args(argv)
+
+    spans = []
+    with open(args.file, encoding="utf-8") as file:
+        for line in file:
+            try:
+                spans.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    roots = [item for item in spans if item["parent_id"] is None]
+    if args.tool:
+        roots = [item for item in roots if item["name"] == f"tool {args.tool}"]
+    if args.trace:
+        roots = [item for item in roots if item["trace_id"] == args.trace]
+    if not roots:
+        print("No matching trace found.", file=sys.stderr)
+        return 1
+    trace_id = max(roots, key=lambda item: item["start_ns"])["trace_id"]
+    print(format_trace([item for item in spans if item["trace_id"] == trace_id]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Full-text search over conversation transcripts.
+
+Transcript turns live next to the conversation index in the same SQLite
+database, with an FTS5 table over the message text. Ingestion is incremental:
+only finished conversations that have not been ingested yet are fetched.
+"""
+
+import sqlite3
+import threading
+import time
+
+import httpx
+
+from elevenlabs_mcp.concurrency import RateLimiter, map_concurrent
+from elevenlabs_mcp.conversation_export import fetch_conversation
+from elevenlabs_mcp.conversation_index import (
+    TERMINAL_STATUSES,
+    ConversationIndex,
+    get_conversation_index,
+)
+from elevenlabs_mcp.utils import make_error
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_turns (
+    id INTEGER PRIMARY KEY,
+    conversation_id TEXT NOT NULL,
+    turn_index INTEGER NOT NULL,
+    role TEXT,
+    time_in_call_secs REAL,
+    message TEXT,
+    UNIQUE (conversation_id, turn_index)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS transcript_fts USING fts5(
+    message,
+    content='transcript_turns',
+    content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS transcript_turns_ai AFTER INSERT ON transcript_turns BEGIN
+    INSERT INTO transcript_fts (rowid, message) VALUES (new.id, new.message);
+END;
+CREATE TRIGGER IF NOT EXISTS transcript_turns_ad AFTER DELETE ON transcript_turns BEGIN
+    INSERT INTO transcript_fts (transcript_fts, rowid, message) VALUES ('delete', old.id, old.message);
+END;
+CREATE TABLE IF NOT EXISTS transcripts_ingested (
+    conversation_id TEXT PRIMARY KEY,
+    turn_count INTEGER NOT NULL,
+    ingested_at INTEGER NOT NULL
+);
+"""
+
+
+class TranscriptStore:
+    def __init__(self, index: ConversationIndex):
+        self.index = index
+        with index.lock:
+            index.conn.executescript(SCHEMA)
+            index.conn.commit()
+
+    def ingest(self, conversation: dict) -> int:
+        """
+        Store (or replace) one conversation's transcript. Returns the number of turns.
+
+        Also records the termination reason on its index row, which only
+        the conversation details carry, not the list endpoint.
+        """
+        conversation_id = conversation.get("conversation_id")
+        if not conversation_id:
+            return 0
+        termination_reason = (conversation.get("metadata") or {}).get("termination_reason")
+        rows = [
+            (
+                conversation_id,
+                turn_index,
+                turn.get("role"),
+                turn.get("time_in_call_secs"),
+                turn.get("message"),
+            )
+            for turn_index, turn in enumerate(conversation.get("transcript") or [])
+            if turn.get("message")
+        ]
+        conn = self.index.conn
+        with self.index.lock:
+            conn.execute(
+                "DELETE FROM transcript_turns WHERE conversation_id = ?", (conversation_id,)
+            )
+            conn.executemany(
+                """INSERT INTO transcript_turns
+                       (conversation_id, turn_index, role, time_in_call_secs, message)
+                   VALUES (?, ?, ?, ?, ?)""",
+                rows,
+            )
+            conn.execute(
+                """INSERT OR REPLACE INTO transcripts_ingested
+                       (conversation_id, turn_count, ingested_at) VALUES (?, ?, ?)""",
+                (conversation_id, len(rows), int(time.time())),
+            )
+            if termination_reason:
+                conn.execute(
+                    "UPDATE conversations SET termination_reason = ? WHERE conversation_id = ?",
+                    (termination_reason, conversation_id),
+                )
+            conn.commit()
+        return len(rows)
+
+    def pending_ids(self, agent_id: str | None = None, limit: int = 500) -> list[str]:
+        """Finished conversations in the index whose transcripts are not ingested yet, newest first."""
+        placeholders = ",".join("?" for _ in TERMINAL_STATUSES)
+        sql = f"""SELECT c.conversation_id FROM conversations c
+                  LEFT JOIN transcripts_ingested t ON t.conversation_id = c.conversation_id
+                  WHERE t.conversation_id IS NULL AND c.status IN ({placeholders})"""
+        params: list = list(TERMINAL_STATUSES)
+        if agent_id:
+            sql += " AND c.agent_id = ?"
+            params.append(agent_id)
+        sql += " ORDER BY c.start_time_unix_secs DESC LIMIT ?"
+        params.append(limit)
+        with self.index.lock:
+            return [row[0] for row in self.index.conn.execute(sql, params).fetchall()]
+
+    def ingest_pending(
+        self,
+        http_client: httpx.Client,
+        api_key: str,
+        agent_id: str | None = None,
+        max_conversations: int = 500,
+        max_concurrency: int = 8,
+        requests_per_second: float | None = 10.0,
+    ) -> dict:
+        """Fetch and ingest transcripts for indexed conversations not yet ingested."""
+        pending = self.pending_ids(agent_id=agent_id, limit=max_conversations)
+        ingested = 0
+        failed = 0
+        for conversation_id, conversation, error in map_concurrent(
+            lambda cid: fetch_conversation(http_client, api_key, cid),
+            pending,
+            max_workers=max_concurrency,
+            rate_limiter=RateLimiter(requests_per_second, burst=max_concurrency),
+        ):
+            if error is not None:
+                failed += 1
+                continue
+            conversation.setdefault("conversation_id", conversation_id)
+            self.ingest(conversation)
+            ingested += 1
+        remaining = len(self.pending_ids(agent_id=agent_id, limit=1))
+        return {"ingested": ingested, "failed": failed, "more_pending": bool(remaining)}
+
+    def search(
+        self,
+        query: str,
+        agent_id: str | None = None,
+        role: str | None = None,
+        started_after: int | None = None,
+        started_before: int | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        """Rank matching turns by BM25 and return them with a highlighted snippet."""
+        clauses = ["transcript_fts MATCH ?"]
+        filter_params: list = []
+        if agent_id:
+            clauses.append("c.agent_id = ?")
+            filter_params.append(agent_id)
+        if role:
+            clauses.append("t.role = ?")
+            filter_params.append(role)
+        if started_after is not None:
+            clauses.append("c.start_time_unix_secs >= ?")
+            filter_params.append(started_after)
+        if started_before is not None:
+            clauses.append("c.start_time_unix_secs < ?")
+            filter_params.append(started_before)
+        sql = f"""SELECT t.conversation_id, c.agent_id, c.start_time_unix_secs, t.turn_index,
+                         t.role, t.time_in_call_secs,
+                         snippet(transcript_fts, 0, '[', ']', '…', 16) AS snippet
+                  FROM transcript_fts
+                  JOIN transcript_turns t ON t.id = transcript_fts.rowid
+                  LEFT JOIN conversations c ON c.conversation_id = t.conversation_id
+                  WHERE {' AND '.join(clauses)}
+                  ORDER BY bm25(transcript_fts)
+                  LIMIT ?"""
+
+        def run(match: str) -> list[sqlite3.Row]:
+            with self.index.lock:
+                return self.index.conn.execute(sql, [match, *filter_params, limit]).fetchall()
+
+        try:
+            rows = run(query)
+        except sqlite3.OperationalError:
+            # Not valid FTS5 syntax (stray quotes, operators): search the words literally
+            words = [w for w in query.replace('"', " ").split()]
+            if not words:
+                make_error("Search query is empty", code="INVALID_QUERY")
+            rows = run(" ".join(f'"{w}"' for w in words))
+        return [dict(row) for row in rows]
+
+    def stats(self) -> dict:
+        with self.index.lock:
+            conversations, turns = self.index.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(turn_count), 0) FROM transcripts_ingested"
+            ).fetchone()
+        return {"conversations_ingested": conversations, "turns_indexed": turns}
+
+
+_stores: dict[str | None, TranscriptStore] = {}
+_store_lock = threading.Lock()
+
+
+def get_transcript_store(scope: str | None = None) -> TranscriptStore:
+    """The store beside get_conversation_index(scope)."""
+    with _store_lock:
+        if scope not in _stores:
+            _stores[scope] = TranscriptStore(get_conversation_index(scope))
+        return _stores[scope]
@@ -1,7 +1,12 @@
+import contextvars
+import hashlib
 import os
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from fuzzywuzzy import fuzz
+from datetime import datetime, timezone
+import httpx
+
+DEFAULT_API_BASE_URL = "https://api.elevenlabs.io"
 
 
 class ElevenLabsMcpError(Exception):
@@ -24,6 +29,57 @@ def make_error(error_text: str, code: str = None, suggestion: str = None):
     raise ElevenLabsMcpError(error_text, code, suggestion)
 
 
+def make_status_error(action: str, status_code: int, detail: object = ""):
+    """Raise for an API error response, coded by whether retrying can help."""
+    detail = f" - {detail}" if detail else ""
+    if status_code == 429:
+        make_error(
+            f"{action}: rate limited by the API ({status_code}{detail})",
+            code="RATE_LIMITED",
+            suggestion="Retrying is useful: wait a minute, or make fewer requests at once",
+        )
+    if status_code >= 500:
+        make_error(
+            f"{action}: the API failed ({status_code}{detail})",
+            code="UPSTREAM_ERROR",
+            suggestion="Retrying later is useful: the error is on the API side",
+        )
+    if status_code in (401, 403):
+        make_error(
+            f"{action}: access denied ({status_code}{detail})",
+            code="ACCESS_DENIED",
+            suggestion="Retrying will not help: check the API key and its permissions",
+        )
+    make_error(
+        f"{action}: the API rejected the request ({status_code}{detail})",
+        code="INVALID_PARAMETERS",
+        suggestion="Retrying will not help: fix the parameters named in the error",
+    )
+
+
+def make_api_error(action: str, error: Exception):
+    """Raise for an API call that failed after retries, coded by the kind of failure."""
+    if isinstance(error, httpx.HTTPStatusError):
+        make_status_error(action, error.response.status_code, error.response.text)
+    # The SDK's ApiError, without importing the SDK here
+    status_code = getattr(error, "status_code", None)
+    if isinstance(status_code, int):
+        make_status_error(action, status_code, getattr(error, "body", ""))
+    if isinstance(error, httpx.TimeoutException):
+        make_error(
+            f"{action}: the API did not respond in time",
+            code="API_TIMEOUT",
+            suggestion="Try again, or split the input into smaller parts",
+        )
+    if isinstance(error, httpx.TransportError):
+        make_error(
+            f"{action}: could not reach the API ({error})",
+            code="NETWORK_ERROR",
+            suggestion="Check your network connection and try again",
+        )
+    make_error(f"{action}: {error}")
+
+
 def is_file_writeable(path: Path) -> bool:
     if path.exists():
         return os.access(path, os.W_OK)
@@ -31,6 +87,45 @@ def is_file_writeable(path: Path) -> bool:
     return os.access(parent_dir, os.W_OK)
 
 
+# Directory every file a tool call reads or writes must be inside; None places no limit
+_path_root: contextvars.ContextVar[Path | None] = contextvars.ContextVar(
+    "elevenlabs_mcp_path_root", default=None
+)
+
+
+def path_root() -> Path | None:
+    return _path_root.get()
+
+
+@contextmanager
+def confine_paths(root: Path | None):
+    """Within the block, resolve relative paths against `root` and reject any path outside it."""
+    if root is not None:
+        root.mkdir(parents=True, exist_ok=True)
+        root = root.resolve()
+    token = _path_root.set(root)
+    try:
+        yield root
+    finally:
+        _path_root.reset(token)
+
+
+def confined(path: Path) -> Path:
+    """`path` as is, or resolved inside the current root (see confine_paths)."""
+    root = _path_root.get()
+    if root is None:
+        return path
+    # Resolving first, so neither .. nor a symlink can lead out of the root
+    resolved = (root / os.path.expanduser(path)).resolve()
+    if not resolved.is_relative_to(root):
+        make_error(
+            f"Path ({path}) is outside the files directory of this API key",
+            code="PATH_NOT_ALLOWED",
+            suggestion="Use a path relative to the files directory, or one inside it",
+        )
+    return resolved
+
+
 def make_output_file(
     tool: str, text: str, output_path: Path, extension: str, full_id: bool = False
 ) -> Path:
@@ -44,7 +139,9 @@ def make_output_path(
     output_directory: str | None, base_path: str | None = None
 ) -> Path:
     output_path = None
-    if output_directory is None:
+    if path_root() is not None:
+        output_path = confined(Path(output_directory or "."))
+    elif output_directory is None:
         output_path = Path.home() / "Desktop"
     elif not os.path.isabs(output_directory) and base_path:
         output_path = Path(os.path.expanduser(base_path)) / Path(output_directory)
@@ -60,6 +157,68 @@ def make_output_path(
     return output_path
 
 
+_env_loaded = False
+
+
+def load_env() -> None:
+    """Load variables from a .env file into the environment, once per process."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _env_loaded = True
+
+
+def api_url(path: str) -> str:
+    """URL of an API path, on ELEVENLABS_API_BASE_URL if set (e.g. a local mock) or the public API."""
+    base_url = os.environ.get("ELEVENLABS_API_BASE_URL") or DEFAULT_API_BASE_URL
+    return base_url.rstrip("/") + path
+
+
+def get_data_dir() -> Path:
+    """Directory for local state (indexes, caches), ELEVENLABS_MCP_DATA_DIR or ~/.elevenlabs-mcp."""
+    data_dir = os.environ.get("ELEVENLABS_MCP_DATA_DIR")
+    if data_dir:
+        path = Path(os.path.expanduser(data_dir))
+    else:
+        path = Path.home() / ".elevenlabs-mcp"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def key_fingerprint(api_key: str | None) -> str:
+    """Short, non-reversible identifier for an API key, safe to store and log."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:16]
+
+
+def parse_timestamp(value: str | int | float | None) -> int | None:
+    """Convert an ISO 8601 date/datetime or unix seconds to unix seconds (naive values are UTC)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if value.strip().lstrip("-").isdigit():
+        return int(value)
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        make_error(
+            f"Invalid timestamp '{value}'",
+            code="INVALID_TIMESTAMP",
+            suggestion="Use an ISO 8601 date like 2024-05-01 or 2024-05-01T13:00:00Z, or unix seconds"
+        )
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def format_timestamp(unix_secs: int | float | None) -> str | None:
+    if unix_secs is None:
+        return None
+    return datetime.fromtimestamp(unix_secs, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
 def find_similar_filenames(
     target_file: str, directory: Path, threshold: int = 70
 ) -> list[tuple[str, int]]:
@@ -74,6 +233,9 @@ def find_similar_filenames(
     Returns:
         list: List of similar filenames with their similarity scores
     """
+    # Only needed when a file is missing, so kept out of server startup
+    from fuzzywuzzy import fuzz
+
     target_filename = os.path.basename(target_file)
     similar_files = []
     for root, _, files in os.walk(directory):
@@ -127,7 +289,9 @@ def check_audio_file(path: Path) -> bool:
 
 
 def handle_input_file(file_path: str, audio_content_check: bool = True) -> Path:
-    if not os.path.isabs(file_path) and not os.environ.get("ELEVENLABS_MCP_BASE_PATH"):
+    if path_root() is not None:
+        file_path = str(confined(Path(file_path)))
+    elif not os.path.isabs(file_path) and not os.environ.get("ELEVENLABS_MCP_BASE_PATH"):
         make_error(
             "File path must be an absolute path if ELEVENLABS_MCP_BASE_PATH is not set",
             code="RELATIVE_PATH_ERROR",
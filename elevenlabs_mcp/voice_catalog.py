@@ -0,0 +1,259 @@
+"""
+Local snapshot of the account's voices.
+
+The catalog is persisted as JSON in the data directory, loaded when the
+server starts and refreshed in the background, so voice search, sorting and
+filtering run in memory and keep working while the API is unreachable.
+
+Refreshes are incremental: voices are paged newest first by
+`created_at_unix` and paging stops at the first voice already known. A full
+refresh, which also picks up deletions and edits, runs every few hours.
+
+Several processes can share one snapshot file, like the workers of an HTTP
+server: each reloads the file when another one has rewritten it, and skips
+its own periodic refresh when that happened since its last one.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 100
+REFRESH_INTERVAL_SECS = 300
+FULL_REFRESH_INTERVAL_SECS = 6 * 3600
+V3_CONFIG_PATH = Path(__file__).parent / "v3_voices_config.json"
+V3_QUERY_PATTERN = re.compile(r"\b(v3|model\s*3)\b", re.IGNORECASE)
+
+
+def load_v3_voices() -> tuple[set[str], set[str]]:
+    """v3-optimized (voice IDs, voice names) from v3_voices_config.json."""
+    try:
+        with open(V3_CONFIG_PATH, encoding="utf-8") as file:
+            config = json.load(file)
+    except (OSError, ValueError):
+        return set(), set()
+    return set(config.get("v3_optimized_voices", {})), set(config.get("v3_optimized_voice_names", []))
+
+
+def voice_record(voice) -> dict:
+    return {
+        "voice_id": voice.voice_id,
+        "name": voice.name,
+        "category": voice.category,
+        "labels": dict(voice.labels or {}),
+        "description": voice.description,
+        "created_at_unix": voice.created_at_unix,
+        "preview_url": voice.preview_url,
+    }
+
+
+class VoiceCatalog:
+    def __init__(self, client: ElevenLabs, path: Path):
+        self.client = client
+        self.path = path
+        self.synced_at: float | None = None
+        self.full_synced_at: float | None = None
+        self.last_error: str | None = None
+        self._voices: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._background: threading.Thread | None = None
+        # Modification time of the snapshot file as last loaded or written here
+        self._file_mtime: int | None = None
+        self.v3_voice_ids, self.v3_voice_names = load_v3_voices()
+        self._load()
+
+    def _mtime(self) -> int | None:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self) -> None:
+        mtime = self._mtime()
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except (OSError, ValueError):
+            return
+        self._voices = {voice["voice_id"]: voice for voice in snapshot.get("voices", [])}
+        self.synced_at = snapshot.get("synced_at")
+        self.full_synced_at = snapshot.get("full_synced_at")
+        self._file_mtime = mtime
+
+    def reload_if_changed(self) -> bool:
+        """Load the snapshot file if another process rewrote it. Returns whether it did."""
+        mtime = self._mtime()
+        if mtime is None or mtime == self._file_mtime:
+            return False
+        with self._lock:
+            self._load()
+        return True
+
+    def _save(self) -> None:
+        snapshot = {
+            "synced_at": self.synced_at,
+            "full_synced_at": self.full_synced_at,
+            "voices": list(self._voices.values()),
+        }
+        # Per process, so workers saving at the same time never write into one file
+        temporary = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(snapshot, file, ensure_ascii=False)
+        os.replace(temporary, self.path)
+        self._file_mtime = self._mtime()
+
+    def refresh(self, full: bool = False) -> dict:
+        """Fetch new voices (or all of them) and persist the snapshot. Returns counts."""
+        with self._refresh_lock:
+            now = time.time()
+            full = (
+                full
+                or self.full_synced_at is None
+                or now - self.full_synced_at > FULL_REFRESH_INTERVAL_SECS
+            )
+            with self._lock:
+                known = set(self._voices)
+                newest = max(
+                    (v["created_at_unix"] or 0 for v in self._voices.values()), default=0
+                )
+
+            fetched: dict[str, dict] = {}
+            token = None
+            while True:
+                page = self.client.voices.search(
+                    page_size=PAGE_SIZE,
+                    sort="created_at_unix",
+                    sort_direction="desc",
+                    next_page_token=token,
+                )
+                reached_known = False
+                for voice in page.voices:
+                    if not full and voice.voice_id in known and (voice.created_at_unix or 0) <= newest:
+                        reached_known = True
+                        break
+                    fetched[voice.voice_id] = voice_record(voice)
+                if reached_known or not page.has_more or not page.next_page_token:
+                    break
+                token = page.next_page_token
+
+            with self._lock:
+                if full:
+                    self._voices = fetched
+                else:
+                    self._voices.update(fetched)
+                self.synced_at = now
+                if full:
+                    self.full_synced_at = now
+                self.last_error = None
+                self._save()
+                return {"full": full, "fetched": len(fetched), "total": len(self._voices)}
+
+    def _refresh_quietly(self, full: bool = False) -> None:
+        try:
+            self.refresh(full=full)
+        except Exception as e:
+            # Keep serving the last snapshot; the next refresh will retry
+            self.last_error = str(e)
+            logger.warning("Voice catalog refresh failed: %s", e)
+
+    def refresh_in_background(self, full: bool = False) -> None:
+        if self._refresh_lock.locked():
+            return
+        threading.Thread(target=self._refresh_quietly, args=(full,), daemon=True).start()
+
+    def start(self, interval_secs: float = REFRESH_INTERVAL_SECS) -> None:
+        """Refresh now and then every `interval_secs` on a daemon thread."""
+        if self._background is not None:
+            return
+
+        def loop() -> None:
+            while True:
+                # Another process sharing the file refreshed it since the last round
+                if not self.reload_if_changed():
+                    self._refresh_quietly()
+                time.sleep(interval_secs)
+
+        self._background = threading.Thread(target=loop, name="voice-catalog", daemon=True)
+        self._background.start()
+
+    def voices(self) -> list[dict]:
+        """Current snapshot. Blocks for the first sync only; later staleness refreshes in the background."""
+        self.reload_if_changed()
+        if self.synced_at is None:
+            self.refresh()
+        elif time.time() - self.synced_at > REFRESH_INTERVAL_SECS:
+            self.refresh_in_background()
+        with self._lock:
+            voices = list(self._voices.values())
+        return [{**voice, "is_v3_optimized": self.is_v3_optimized(voice)} for voice in voices]
+
+    def is_v3_optimized(self, voice: dict) -> bool:
+        return voice["voice_id"] in self.v3_voice_ids or voice["name"] in self.v3_voice_names
+
+    def search(
+        self,
+        search: str | None = None,
+        category: str | None = None,
+        labels: dict[str, str] | None = None,
+        v3_optimized: bool | None = None,
+        sort: str = "name",
+        sort_direction: str = "desc",
+    ) -> list[dict]:
+        """
+        Filter and sort the snapshot.
+
+        Every word of `search` must appear in the voice's name, category,
+        description or label values. Mentioning "v3" or "model 3" lists
+        v3-optimized voices first rather than filtering on the words.
+        """
+        prefer_v3 = bool(search and V3_QUERY_PATTERN.search(search))
+        words = V3_QUERY_PATTERN.sub(" ", search or "").lower().split()
+        results = []
+        for voice in self.voices():
+            if category and (voice["category"] or "").lower() != category.lower():
+                continue
+            if v3_optimized is not None and voice["is_v3_optimized"] != v3_optimized:
+                continue
+            if labels and any(
+                str(voice["labels"].get(key, "")).lower() != str(value).lower()
+                for key, value in labels.items()
+            ):
+                continue
+            if words:
+                haystack = " ".join(
+                    [
+                        voice["name"] or "",
+                        voice["category"] or "",
+                        voice["description"] or "",
+                        *map(str, voice["labels"].values()),
+                    ]
+                ).lower()
+                if not all(word in haystack for word in words):
+                    continue
+            results.append(voice)
+
+        if sort == "created_at_unix":
+            results.sort(key=lambda v: v["created_at_unix"] or 0, reverse=sort_direction == "desc")
+        else:
+            results.sort(key=lambda v: (v["name"] or "").lower(), reverse=sort_direction == "desc")
+        if prefer_v3:
+            # Stable sort keeps the requested order within each group
+            results.sort(key=lambda v: not v["is_v3_optimized"])
+        return results
+
+    def find_by_name(self, name: str) -> dict | None:
+        name = name.lower()
+        return next((v for v in self.voices() if (v["name"] or "").lower() == name), None)
@@ -0,0 +1,111 @@
+"""
+Batch voice design.
+
+Many voice descriptions are sent to `text_to_voice.create_previews`
+concurrently under a limit. As each response arrives its previews are handed
+to a worker pool that decodes the base64 audio in chunks straight into the
+output files, so decoding and disk writes overlap with the requests still in
+flight and no decoded preview is held in memory as a whole.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+
+from elevenlabs_mcp.concurrency import RateLimiter, map_concurrent
+from elevenlabs_mcp.utils import ElevenLabsMcpError, make_output_file
+
+if TYPE_CHECKING:
+    from elevenlabs.client import ElevenLabs
+
+# A multiple of 4, so every chunk decodes on its own
+BASE64_CHUNK_CHARS = 64 * 1024
+MEDIA_TYPE_EXTENSIONS = {"audio/mpeg": "mp3", "audio/mp3": "mp3", "audio/wav": "wav", "audio/pcm": "pcm"}
+
+
+def write_base64(encoded: str, path: Path) -> int:
+    """Decode base64 text into `path` chunk by chunk. Returns bytes written."""
+    written = 0
+    with open(path, "wb") as file:
+        for start in range(0, len(encoded), BASE64_CHUNK_CHARS):
+            written += file.write(base64.b64decode(encoded[start:start + BASE64_CHUNK_CHARS]))
+    return written
+
+
+def design_voices(
+    client: ElevenLabs,
+    voice_descriptions: list[str],
+    output_path: Path,
+    text: str | None = None,
+    max_concurrency: int = 4,
+    requests_per_second: float | None = None,
+    decode_workers: int = 4,
+) -> dict:
+    """
+    Create previews for every description and save them under `output_path`.
+
+    Returns the manifest, which is also written next to the audio files:
+    one entry per description with its previews' generated voice IDs and
+    files, or the error if the request failed.
+    """
+    entries = [{"voice_description": description} for description in voice_descriptions]
+    decoding = []
+    with ThreadPoolExecutor(max_workers=max(1, decode_workers)) as decoder:
+        for position, response, error in map_concurrent(
+            lambda position: client.text_to_voice.create_previews(
+                voice_description=voice_descriptions[position],
+                text=text,
+                auto_generate_text=text is None,
+            ),
+            range(len(voice_descriptions)),
+            max_workers=max_concurrency,
+            rate_limiter=RateLimiter(requests_per_second, burst=max_concurrency),
+        ):
+            entry = entries[position]
+            if error is not None:
+                entry["error"] = error.message if isinstance(error, ElevenLabsMcpError) else str(error)
+                continue
+            entry["text"] = response.text
+            entry["previews"] = []
+            for preview in response.previews:
+                extension = MEDIA_TYPE_EXTENSIONS.get(preview.media_type, "mp3")
+                file_path = make_output_file(
+                    "voice_design", preview.generated_voice_id, output_path, extension, full_id=True
+                )
+                entry["previews"].append(
+                    {
+                        "generated_voice_id": preview.generated_voice_id,
+                        "file": str(file_path),
+                        "duration_secs": preview.duration_secs,
+                        "language": preview.language,
+                    }
+                )
+                decoding.append(
+                    (entry, len(entry["previews"]) - 1, decoder.submit(write_base64, preview.audio_base_64, file_path))
+                )
+
+    for entry, index, future in decoding:
+        error = future.exception()
+        if error is not None:
+            entry["previews"][index]["error"] = str(error)
+            entry["previews"][index]["file"] = None
+        else:
+            entry["previews"][index]["bytes"] = future.result()
+
+    manifest_path = output_path / f"voice_design_manifest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    manifest = {
+        "manifest_file": str(manifest_path),
+        "descriptions": len(entries),
+        "failed": sum(1 for entry in entries if "error" in entry),
+        "previews": sum(len(entry.get("previews", [])) for entry in entries),
+        "results": entries,
+    }
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    return manifest
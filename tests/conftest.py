@@ -0,0 +1,26 @@
+import importlib
+import os
+
+import pytest
+
+from benchmarks.mock_api import MockConfig, MockServer
+
+
+@pytest.fixture
+def mock_config() -> MockConfig:
+    """Config of the `mock_api` server; tests may change it while the server runs."""
+    return MockConfig(latency_ms=0, jitter_ms=0, retry_after_secs=0)
+
+
+@pytest.fixture
+def mock_api(mock_config):
+    with MockServer(mock_config) as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def server(tmp_path_factory):
+    """The server module, with a test key and its local state in a temporary directory."""
+    os.environ.setdefault("ELEVENLABS_API_KEY", "test")
+    os.environ["ELEVENLABS_MCP_DATA_DIR"] = str(tmp_path_factory.mktemp("data"))
+    return importlib.import_module("elevenlabs_mcp.server")
@@ -0,0 +1,117 @@
+import threading
+import time
+
+import httpx
+
+from elevenlabs_mcp.cache import SQLiteBackend, TTLCache
+
+
+def models_loader(mock_api):
+    return lambda: httpx.get(f"{mock_api.url}/v1/models").json()
+
+
+def upstream_calls(mock_api) -> int:
+    return httpx.get(f"{mock_api.url}/_mock/stats").json().get("GET /v1/models", 0)
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_hit_within_ttl(mock_api):
+    cache = TTLCache(ttls={"models": 60.0})
+    load = models_loader(mock_api)
+
+    first = cache.fetch("models", load)
+    second = cache.fetch("models", load)
+
+    assert not first.cached
+    assert second.cached and not second.stale
+    assert second.value == first.value
+    assert upstream_calls(mock_api) == 1
+    assert cache.stats == {"hits": 1, "stale_hits": 0, "misses": 1}
+
+
+def test_stale_value_served_while_refreshing(mock_api):
+    cache = TTLCache(ttls={"models": 0.1}, stale_secs=60.0)
+    load = models_loader(mock_api)
+    cache.fetch("models", load)
+    time.sleep(0.15)
+
+    stale = cache.fetch("models", load)
+
+    assert stale.cached and stale.stale
+    wait_for(lambda: upstream_calls(mock_api) == 2 and not cache._refreshing)
+    fresh = cache.fetch("models", load)
+    assert fresh.cached and not fresh.stale
+
+
+def test_miss_past_stale_window(mock_api):
+    cache = TTLCache(ttls={"models": 0.05}, stale_secs=0.05)
+    load = models_loader(mock_api)
+    cache.fetch("models", load)
+    time.sleep(0.15)
+
+    assert not cache.fetch("models", load).cached
+    assert upstream_calls(mock_api) == 2
+
+
+def test_invalidate(mock_api):
+    cache = TTLCache(ttls={"agent": 60.0})
+    load = models_loader(mock_api)
+    cache.fetch("agent", load, "a")
+    cache.fetch("agent", load, "b")
+
+    cache.invalidate("agent", "a")
+    assert not cache.fetch("agent", load, "a").cached
+    assert cache.fetch("agent", load, "b").cached
+
+    cache.invalidate("agent")
+    assert not cache.fetch("agent", load, "a").cached
+    assert not cache.fetch("agent", load, "b").cached
+
+
+def test_fetch_racing_invalidate_is_not_stored(mock_api):
+    cache = TTLCache(ttls={"agents": 60.0})
+    load = models_loader(mock_api)
+
+    def load_then_invalidate():
+        value = load()
+        # A write landed while this read was in flight
+        cache.invalidate("agents")
+        return value
+
+    cache.fetch("agents", load_then_invalidate)
+
+    assert not cache.fetch("agents", load).cached
+
+
+def test_concurrent_misses_share_one_call(mock_api, mock_config):
+    mock_config.latency_ms = 100
+    cache = TTLCache(ttls={"models": 60.0})
+    load = models_loader(mock_api)
+    threads = [threading.Thread(target=cache.fetch, args=("models", load)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert upstream_calls(mock_api) == 1
+
+
+def test_sqlite_backend_shared_between_caches(mock_api, tmp_path):
+    path = tmp_path / "cache.sqlite"
+    writer = TTLCache(SQLiteBackend(path), ttls={"models": 60.0}, namespace="key1:")
+    reader = TTLCache(SQLiteBackend(path), ttls={"models": 60.0}, namespace="key1:")
+    other_key = TTLCache(SQLiteBackend(path), ttls={"models": 60.0}, namespace="key2:")
+    load = models_loader(mock_api)
+
+    writer.fetch("models", load)
+
+    assert reader.fetch("models", load).cached
+    assert not other_key.fetch("models", load).cached
+    writer.invalidate("models")
+    assert not reader.fetch("models", load).cached
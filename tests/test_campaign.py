@@ -0,0 +1,71 @@
+import httpx
+import pytest
+from elevenlabs.client import ElevenLabs
+from elevenlabs.core import ApiError
+
+from elevenlabs_mcp.campaign import dial_not_placed, run_campaign
+
+DIAL_PATH = "/v1/convai/twilio/outbound-call"
+
+
+@pytest.fixture
+def campaign(mock_api, tmp_path):
+    client = ElevenLabs(api_key="test", base_url=mock_api.url)
+    journal = tmp_path / "campaign.jsonl"
+
+    def run(calls: list) -> dict:
+        with httpx.Client() as http_client:
+            return run_campaign(
+                client, http_client, "test", "agent_0001", "phone_1", calls, journal,
+                calls_per_second=100.0, poll_interval_secs=0.01, max_runtime_secs=5,
+            )
+
+    return run
+
+
+def fail_dial(mock_config, status: int) -> None:
+    mock_config.fail_path = DIAL_PATH
+    mock_config.error_statuses = (status,)
+    mock_config.fail_next = 1
+
+
+def test_rejected_dial_redialed_next_run(campaign, mock_config, monkeypatch, mock_api):
+    monkeypatch.setenv("ELEVENLABS_API_BASE_URL", mock_api.url)
+    fail_dial(mock_config, 422)
+
+    first = campaign(["+15550001"])
+    second = campaign(["+15550001"])
+
+    assert first["status_counts"] == {"dial_failed": 1}
+    assert not first["finished"]
+    assert second["dialed_this_run"] == 1
+    assert second["status_counts"] == {"done": 1}
+
+
+def test_dial_with_unknown_outcome_never_redialed(campaign, mock_config, monkeypatch, mock_api):
+    monkeypatch.setenv("ELEVENLABS_API_BASE_URL", mock_api.url)
+    fail_dial(mock_config, 500)
+
+    first = campaign(["+15550001", "+15550002"])
+    second = campaign(["+15550001", "+15550002"])
+
+    assert first["dial_unknown_numbers"] in (["+15550001"], ["+15550002"])
+    assert first["status_counts"] == {"dial_unknown": 1, "done": 1}
+    assert first["finished"]
+    assert second["dialed_this_run"] == 0
+    assert second["dial_unknown_numbers"] == first["dial_unknown_numbers"]
+
+
+@pytest.mark.parametrize(
+    "error, not_placed",
+    [
+        (httpx.ConnectError("refused"), True),
+        (ApiError(status_code=422, body={}), True),
+        (ApiError(status_code=503, body={}), True),
+        (httpx.ReadTimeout("no answer"), False),
+        (ApiError(status_code=500, body={}), False),
+        (RuntimeError("unexpected"), False),
+    ],
+)
+def test_dial_errors_classified(error, not_placed):
+    assert dial_not_placed(error) is not_placed
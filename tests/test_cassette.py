@@ -0,0 +1,35 @@
+import json
+
+import httpx
+import pytest
+
+from elevenlabs_mcp.cassette import CassetteTransport, cassette_from_env
+
+
+def upstream(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json={"path": request.url.path})
+
+
+def test_replaying_a_missing_cassette_fails_at_startup(tmp_path, monkeypatch):
+    monkeypatch.setenv("ELEVENLABS_MCP_CASSETTE", str(tmp_path / "missing.jsonl"))
+    monkeypatch.delenv("ELEVENLABS_MCP_CASSETTE_MODE", raising=False)
+
+    with pytest.raises(FileNotFoundError, match="ELEVENLABS_MCP_CASSETTE_MODE=record"):
+        cassette_from_env()
+
+
+def test_body_read_to_the_end_is_recorded_without_close(tmp_path):
+    path = tmp_path / "cassette.jsonl"
+    cassette = CassetteTransport(path, "record", transport=httpx.MockTransport(upstream))
+
+    response = cassette.handle_request(httpx.Request("GET", "https://api.test/v1/models"))
+    body = b"".join(response.stream)
+
+    [entry] = [json.loads(line) for line in path.read_text().splitlines()]
+    assert entry["path"] == "/v1/models"
+    response.close()
+    assert len(path.read_text().splitlines()) == 1
+
+    replay = CassetteTransport(path, "replay", time_scale=0)
+    replayed = replay.handle_request(httpx.Request("GET", "https://api.test/v1/models"))
+    assert replayed.read() == body
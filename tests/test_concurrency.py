@@ -0,0 +1,33 @@
+import threading
+import time
+
+from elevenlabs_mcp.concurrency import FairExecutor
+
+
+def test_key_behind_a_burst_gets_a_thread():
+    executor = FairExecutor(max_workers=4)
+    release = threading.Event()
+    burst = [executor.submit("a", release.wait, 5) for _ in range(8)]
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    other = executor.submit("b", time.monotonic)
+
+    assert other.result(timeout=1) - started < 0.5
+    assert executor.running()["a"] <= 3
+    release.set()
+    assert all(future.result(timeout=5) for future in burst)
+
+
+def test_keys_take_turns():
+    executor = FairExecutor(max_workers=1)
+    order = []
+    gate = threading.Event()
+    executor.submit("a", gate.wait, 5)
+    futures = [executor.submit(key, order.append, f"{key}{n}") for n in range(2) for key in ("a", "b")]
+    futures += [executor.submit("a", order.append, "a2")]
+    gate.set()
+    for future in futures:
+        future.result(timeout=5)
+
+    assert order == ["b0", "a0", "b1", "a1", "a2"]
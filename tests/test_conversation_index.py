@@ -0,0 +1,73 @@
+import httpx
+import pytest
+
+from elevenlabs_mcp.conversation_index import ConversationIndex
+
+LISTING = "GET /v1/convai/conversations"
+
+
+@pytest.fixture
+def index(mock_api, monkeypatch, tmp_path):
+    monkeypatch.setenv("ELEVENLABS_API_BASE_URL", mock_api.url)
+    return ConversationIndex(tmp_path / "conversations.db")
+
+
+def listing_calls(mock_api) -> int:
+    return httpx.get(f"{mock_api.url}/_mock/stats").json().get(LISTING, 0)
+
+
+def test_full_sync(index, mock_api, mock_config):
+    mock_config.conversations = 250
+    with httpx.Client() as client:
+        summary = index.sync(client, "test")
+
+    assert summary["caught_up"]
+    assert summary["pages_fetched"] == 3
+    assert index.count() == 250
+    rows, total = index.query(agent_id="agent_0003", limit=5)
+    assert total == 25
+    assert rows[0]["conversation_id"] == "conv_000243"
+
+
+def test_sync_resumes_where_page_budget_ran_out(index, mock_api, mock_config):
+    mock_config.conversations = 250
+    with httpx.Client() as client:
+        first = index.sync(client, "test", max_pages=1)
+        assert not first["caught_up"]
+        assert index.count() == 100
+
+        second = index.sync(client, "test")
+
+    assert second["caught_up"]
+    assert second["pages_fetched"] == 2
+    assert index.count() == 250
+    # No page was fetched twice
+    assert listing_calls(mock_api) == 3
+
+
+def test_incremental_sync_reads_only_new_conversations(index, mock_api, mock_config):
+    mock_config.conversations = 250
+    with httpx.Client() as client:
+        index.sync(client, "test")
+        mock_config.conversations = 260
+
+        summary = index.sync(client, "test")
+
+    assert summary["caught_up"]
+    assert summary["pages_fetched"] == 1
+    # The new ten plus the overlap window before the previous newest
+    assert summary["conversations_upserted"] < 100
+    assert index.count() == 260
+
+
+def test_failed_sync_raises_and_keeps_index(index, mock_api, mock_config):
+    mock_config.conversations = 50
+    with httpx.Client() as client:
+        index.sync(client, "test")
+        mock_config.fail_next = 1
+        mock_config.error_statuses = (500,)
+
+        with pytest.raises(Exception, match="500"):
+            index.sync(client, "test")
+
+    assert index.count() == 50
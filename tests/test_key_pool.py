@@ -0,0 +1,80 @@
+import httpx
+import pytest
+
+from elevenlabs_mcp.cache import TTLCache
+from elevenlabs_mcp.governor import Governor, GovernedTransport
+from elevenlabs_mcp.key_pool import KeyPool, Tenant
+from elevenlabs_mcp.retry import RetryingTransport
+from elevenlabs_mcp.singleflight import SingleFlight
+from elevenlabs_mcp.voice_catalog import VoiceCatalog
+
+
+@pytest.fixture
+def pool(mock_api, tmp_path):
+    def build(key: str) -> Tenant:
+        governor = Governor(rates={})
+        transport = RetryingTransport(GovernedTransport(governor))
+        http = httpx.Client(transport=transport, base_url=mock_api.url, headers={"xi-api-key": key})
+        return Tenant(
+            api_key=key,
+            fingerprint=key,
+            governor=governor,
+            transport=transport,
+            http=http,
+            client=None,
+            flights=SingleFlight(),
+            cache=TTLCache(namespace=f"{key}:"),
+            voice_catalog=VoiceCatalog(None, tmp_path / f"voices_{key}.json"),
+        )
+
+    pool = KeyPool(build, build("default"), max_keys=2)
+    yield pool
+    pool.default.close()
+
+
+def test_least_recently_used_key_evicted(pool):
+    a = pool.get("a")
+    b = pool.get("b")
+    pool.get("a")
+    pool.get("c")
+
+    assert pool.get("a") is a
+    assert b.retired and not a.retired
+    assert pool.status() == {"keys": 3, "max_keys": 2, "built": 3, "evicted": 1}
+    # Coming back builds a fresh tenant
+    assert pool.get("b") is not b
+    assert pool.get("b").http.get("/v1/models").status_code == 200
+
+
+def test_evicted_tenant_closed(pool):
+    a = pool.get("a")
+    assert a.http.get("/v1/models").status_code == 200
+
+    pool.get("b")
+    pool.get("c")
+
+    assert a.retired
+    with pytest.raises(RuntimeError):
+        a.http.get("/v1/models")
+
+
+def test_tenant_in_use_closed_after_its_call(pool):
+    with pool.use("a") as a:
+        pool.get("b")
+        pool.get("c")
+        assert a.retired
+        # Still usable by the call that holds it
+        assert a.http.get("/v1/models").status_code == 200
+        assert pool.current() is a
+    assert pool.current() is pool.default
+    with pytest.raises(RuntimeError):
+        a.http.get("/v1/models")
+
+
+def test_default_key_never_evicted(pool):
+    for key in ("default", "", None, "a", "b", "c"):
+        pool.get(key)
+
+    assert pool.get(None) is pool.get("default") is pool.default
+    assert not pool.default.retired
+    assert pool.default.http.get("/v1/models").status_code == 200
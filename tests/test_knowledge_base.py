@@ -0,0 +1,59 @@
+import threading
+from types import SimpleNamespace
+
+from elevenlabs_mcp.knowledge_base import DocumentHashIndex, upload_documents
+
+
+class FakeDocuments:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.created = []
+
+    def create_from_file(self, name, file):
+        with self.lock:
+            self.created.append(name)
+            return SimpleNamespace(id=f"doc_{len(self.created)}")
+
+    def create_from_url(self, name, url):
+        return self.create_from_file(name, None)
+
+
+def fake_client(documents: FakeDocuments):
+    knowledge_base = SimpleNamespace(documents=documents)
+    return SimpleNamespace(conversational_ai=SimpleNamespace(knowledge_base=knowledge_base))
+
+
+def test_identical_documents_in_one_batch_upload_once(tmp_path):
+    documents = FakeDocuments()
+    batch = [
+        {"name": "Policy A", "text": "Refunds within 30 days."},
+        {"name": "Site", "url": "https://example.com/faq/"},
+        {"name": "Policy B", "text": "Refunds within 30 days."},
+        {"name": "Site again", "url": "https://EXAMPLE.com/faq"},
+    ]
+
+    locators, failures = upload_documents(
+        fake_client(documents), batch, dedup=DocumentHashIndex(tmp_path / "kb.db"), scope="k"
+    )
+
+    assert failures == []
+    assert sorted(documents.created) == ["Policy A", "Site"]
+    assert [locator["name"] for locator in locators] == ["Policy A", "Site", "Policy B", "Site again"]
+    assert locators[2]["id"] == locators[0]["id"] and locators[2]["reused"]
+    assert locators[3]["id"] == locators[1]["id"] and locators[3]["reused"]
+    assert not locators[0]["reused"] and not locators[1]["reused"]
+
+
+def test_unreadable_file_fails_alone(tmp_path):
+    documents = FakeDocuments()
+    batch = [
+        {"name": "Missing", "file_path": str(tmp_path / "missing.pdf")},
+        {"name": "Text", "text": "hello"},
+    ]
+
+    locators, failures = upload_documents(
+        fake_client(documents), batch, dedup=DocumentHashIndex(tmp_path / "kb.db")
+    )
+
+    assert [locator["name"] for locator in locators] == ["Text"]
+    assert [failure["name"] for failure in failures] == ["Missing"]
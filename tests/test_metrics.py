@@ -0,0 +1,54 @@
+import httpx
+import pytest
+
+from elevenlabs_mcp.governor import Governor, GovernedTransport
+from elevenlabs_mcp.metrics import Metrics, MeteredTransport
+from elevenlabs_mcp.retry import RetryingTransport, RetryPolicy
+
+
+@pytest.fixture
+def metered(mock_api):
+    """A client with the server's transport order; the governor allows a burst of two TTS requests, then one a second."""
+    metrics = Metrics()
+    governor = Governor(rates={"tts": 1.0}, concurrency=4)
+    transport = RetryingTransport(
+        MeteredTransport(GovernedTransport(governor, httpx.HTTPTransport()), metrics),
+        RetryPolicy(max_retries=2, base_delay_secs=0.01),
+    )
+    with httpx.Client(transport=transport, base_url=mock_api.url) as client:
+        yield client, metrics
+
+
+def test_governor_queue_is_not_upstream_time(metered, mock_config):
+    client, metrics = metered
+    mock_config.latency_ms = 50
+
+    @metrics.instrument
+    def tool():
+        # A burst of two, then the third waits about a second for a token
+        for _ in range(3):
+            client.post("/v1/text-to-speech/voice", json={"text": "hi"}).read()
+
+    tool()
+
+    stats = metrics.snapshot()["tools"]["tool"]
+    assert stats["queue"]["max_secs"] > 0.7
+    assert stats["upstream"]["max_secs"] < 0.5
+    assert "elevenlabs_mcp_tool_queue_seconds_sum" in metrics.prometheus()
+
+
+def test_retries_counted_and_backoff_not_upstream(metered, mock_config):
+    client, metrics = metered
+    mock_config.retry_after_secs = 0.5
+    mock_config.error_statuses = (503,)
+    mock_config.fail_next = 1
+
+    @metrics.instrument
+    def tool():
+        return client.get("/v1/models").status_code
+
+    assert tool() == 200
+    stats = metrics.snapshot()["tools"]["tool"]
+    assert (stats["requests"], stats["retries"]) == (2, 1)
+    assert stats["upstream"]["max_secs"] < 0.3
+    assert stats["local"]["max_secs"] >= 0.5
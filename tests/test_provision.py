@@ -0,0 +1,53 @@
+from elevenlabs.client import ElevenLabs
+
+from elevenlabs_mcp.provision import differences, normalize, provision
+
+SPEC = {
+    "defaults": {"llm": "gpt-4o-mini", "temperature": 0.3},
+    "agents": [
+        {"name": "Support", "system_prompt": "Help customers.", "first_message": "Hi!"},
+        {"name": "Sales", "system_prompt": "Sell things."},
+    ],
+}
+
+
+def counts(summary: dict) -> dict:
+    return {action: summary[action] for action in ("create", "update", "unchanged", "error")}
+
+
+def test_second_apply_is_unchanged(mock_api):
+    client = ElevenLabs(api_key="test", base_url=mock_api.url)
+
+    first = provision(client, SPEC, requests_per_second=None)
+    second = provision(client, SPEC, requests_per_second=None)
+
+    assert counts(first) == {"create": 2, "update": 0, "unchanged": 0, "error": 0}
+    assert counts(second) == {"create": 0, "update": 0, "unchanged": 2, "error": 0}
+
+
+def test_drift_updates_only_the_changed_field(mock_api):
+    client = ElevenLabs(api_key="test", base_url=mock_api.url)
+    provision(client, SPEC, requests_per_second=None)
+    spec = {**SPEC, "agents": [{**SPEC["agents"][0], "temperature": 0.7}, SPEC["agents"][1]]}
+
+    summary = provision(client, spec, requests_per_second=None)
+
+    assert counts(summary) == {"create": 0, "update": 1, "unchanged": 1, "error": 0}
+    updated = next(result for result in summary["results"] if result["action"] == "update")
+    assert updated["changed"] == ["conversation_config.agent.prompt.temperature"]
+    assert counts(provision(client, spec, requests_per_second=None))["unchanged"] == 2
+
+
+def test_dry_run_changes_nothing(mock_api):
+    client = ElevenLabs(api_key="test", base_url=mock_api.url)
+
+    assert counts(provision(client, SPEC, dry_run=True, requests_per_second=None))["create"] == 2
+    assert counts(provision(client, SPEC, requests_per_second=None))["create"] == 2
+
+
+def test_unset_values_compare_equal():
+    assert normalize("") is None
+    assert normalize(-1) is None
+    assert differences({"a": {"b": ""}}, {"a": {}}, ["a.b"]) == []
+    assert differences({"a": {"b": 0.3}}, {"a": {"b": 0.30000001}}, ["a.b"]) == []
+    assert differences({"a": {"b": 1}}, {"a": {"b": 2}, "c": 3}, ["a.b"]) == ["a.b"]
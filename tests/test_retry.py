@@ -0,0 +1,120 @@
+import threading
+import time
+
+import httpx
+import pytest
+from elevenlabs.client import ElevenLabs
+from elevenlabs.core import ApiError
+
+from elevenlabs_mcp.governor import Governor, GovernedTransport
+from elevenlabs_mcp.retry import RetryingTransport, RetryPolicy, disable_sdk_retries
+
+
+@pytest.fixture
+def stack(mock_api):
+    """Client with the server's retry and governor layers, without rate limits or backoff waits."""
+    governor = Governor(rates={}, concurrency=2)
+    transport = RetryingTransport(
+        GovernedTransport(governor, httpx.HTTPTransport()),
+        RetryPolicy(max_retries=2, base_delay_secs=0.01),
+    )
+    with httpx.Client(transport=transport, base_url=mock_api.url) as client:
+        yield client, transport, governor
+
+
+def upstream_calls(mock_api, route: str) -> int:
+    return httpx.get(f"{mock_api.url}/_mock/stats").json().get(route, 0)
+
+
+def fail_next(mock_config, count: int, status: int) -> None:
+    mock_config.fail_next = count
+    mock_config.error_statuses = (status,)
+
+
+def test_429_waited_out_by_governor(stack, mock_api, mock_config):
+    client, transport, governor = stack
+    fail_next(mock_config, 2, 429)
+
+    response = client.get("/v1/models")
+
+    assert response.status_code == 200
+    assert upstream_calls(mock_api, "GET /v1/models") == 3
+    assert governor.status()["families"]["default"]["throttled_429"] == 2
+    # Handled below the retry layer, so it spends none of its retries
+    assert transport.stats["retries"] == 0
+
+
+def test_503_retried_for_post(stack, mock_api, mock_config):
+    client, transport, _ = stack
+    fail_next(mock_config, 1, 503)
+
+    response = client.post("/v1/text-to-speech/voice", json={"text": "hi"})
+
+    assert response.status_code == 200
+    assert upstream_calls(mock_api, "POST /v1/text-to-speech/voice") == 2
+    assert transport.stats["retried_statuses"] == 1
+
+
+def test_500_not_retried_for_post(stack, mock_api, mock_config):
+    client, transport, _ = stack
+    fail_next(mock_config, 1, 500)
+
+    response = client.post("/v1/text-to-speech/voice", json={"text": "hi"})
+
+    assert response.status_code == 500
+    assert upstream_calls(mock_api, "POST /v1/text-to-speech/voice") == 1
+    assert transport.stats["retries"] == 0
+
+
+def test_500_retried_for_get(stack, mock_api, mock_config):
+    client, transport, _ = stack
+    fail_next(mock_config, 2, 500)
+
+    assert client.get("/v1/models").status_code == 200
+    assert transport.stats["retries"] == 2
+
+
+def test_gives_up_after_max_retries(stack, mock_api, mock_config):
+    client, transport, _ = stack
+    fail_next(mock_config, 10, 502)
+
+    response = client.get("/v1/models")
+
+    assert response.status_code == 502
+    assert upstream_calls(mock_api, "GET /v1/models") == 3
+    assert transport.stats["gave_up"] == 1
+
+
+def test_generation_concurrency_limited(stack, mock_api, mock_config):
+    client, _, governor = stack
+    mock_config.latency_ms = 100
+    responses = []
+
+    def generate():
+        responses.append(client.post("/v1/text-to-speech/voice", json={"text": "hi"}))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=generate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Two slots for four requests: two rounds of latency
+    assert time.monotonic() - started >= 0.2
+    assert [response.status_code for response in responses] == [200] * 4
+    status = governor.status()
+    assert status["families"]["tts"]["max_queue_depth"] >= 2
+    assert status["concurrency_in_flight"] == 0
+
+
+def test_sdk_does_not_resend_post_after_500(stack, mock_api, mock_config):
+    client, _, _ = stack
+    sdk = ElevenLabs(api_key="test", base_url=mock_api.url, httpx_client=client)
+    disable_sdk_retries(sdk)
+    fail_next(mock_config, 1, 500)
+
+    with pytest.raises(ApiError):
+        sdk.conversational_ai.agents.create(name="Support", conversation_config={})
+
+    assert upstream_calls(mock_api, "POST /v1/convai/agents/create") == 1
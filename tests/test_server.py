@@ -0,0 +1,49 @@
+import asyncio
+import threading
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "status, other_call",
+    [
+        # A 429 pauses the whole endpoint family, so the other call must not need it
+        (429, ("get_server_metrics", {})),
+        (503, ("get_conversation_transcript", {"conversation_id": "conv_000002"})),
+    ],
+)
+def test_waiting_read_does_not_block_other_calls(server, mock_api, mock_config, monkeypatch, status, other_call):
+    monkeypatch.setenv("ELEVENLABS_API_BASE_URL", mock_api.url)
+    mock_config.retry_after_secs = 0.5
+    mock_config.error_statuses = (status,)
+    finished = []
+
+    async def call(name: str, arguments: dict) -> None:
+        await server.mcp.call_tool(name, arguments)
+        finished.append(name)
+
+    async def main() -> None:
+        mock_config.fail_next = 1
+        # Throttled or retried after Retry-After: waits half a second before its second attempt
+        waiting = asyncio.create_task(call("get_conversation", {"conversation_id": "conv_000001"}))
+        await asyncio.sleep(0.1)
+        await call(*other_call)
+        await waiting
+
+    asyncio.run(main())
+
+    assert finished == [other_call[0], "get_conversation"]
+
+
+def test_blocking_work_of_async_tools_queued_under_the_key(server):
+    def where() -> tuple[str, str]:
+        return threading.current_thread().name, server.key_pool.current().api_key
+
+    async def main() -> tuple[str, str]:
+        with server.key_pool.use("client-key"):
+            return await server.in_tool_thread(where)
+
+    thread_name, api_key = asyncio.run(main())
+
+    assert thread_name.startswith("tool-")
+    assert api_key == "client-key"
@@ -0,0 +1,31 @@
+import httpx
+import pytest
+from elevenlabs.core import ApiError
+
+from elevenlabs_mcp.utils import ElevenLabsMcpError, make_api_error
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://api.elevenlabs.io/v1/text-to-dialogue")
+    return httpx.HTTPStatusError("failed", request=request, response=httpx.Response(status, request=request))
+
+
+@pytest.mark.parametrize(
+    "error, code",
+    [
+        (status_error(429), "RATE_LIMITED"),
+        (status_error(503), "UPSTREAM_ERROR"),
+        (status_error(422), "INVALID_PARAMETERS"),
+        (status_error(401), "ACCESS_DENIED"),
+        (ApiError(status_code=500, body={"detail": "boom"}), "UPSTREAM_ERROR"),
+        (ApiError(status_code=400, body={"detail": "bad voice"}), "INVALID_PARAMETERS"),
+        (httpx.ReadTimeout("slow"), "API_TIMEOUT"),
+        (httpx.ConnectError("refused"), "NETWORK_ERROR"),
+    ],
+)
+def test_api_errors_coded_by_status(error, code):
+    with pytest.raises(ElevenLabsMcpError) as raised:
+        make_api_error("Failed to generate dialogue", error)
+
+    assert raised.value.code == code
+    assert "Retrying" in (raised.value.suggestion or "") or code in ("API_TIMEOUT", "NETWORK_ERROR")